@@ -0,0 +1,426 @@
+"""
+Benchmarks of engine hot paths.
+
+Every benchmark is a setup function returning a zero-argument callable; the callable
+is timed and reported as operations per second (higher is better).
+
+Usage (from repository root):
+
+    python -m benchmarks.bench run [-o results.json] [-k FILTER]
+    python -m benchmarks.bench compare baseline.json new.json [--threshold 0.1]
+
+`compare` exits with status 1 if any metric present in both files got slower by more
+than `threshold` (fraction of baseline).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import timeit
+from datetime import datetime
+from pathlib import Path
+from typing import Callable
+
+from blackjack.compiler import CompiledStrategy
+from blackjack.engine import (
+    CONFIG,
+    Card,
+    CSMShoe,
+    Dealer,
+    GameStrategy,
+    Hand,
+    HandPlay,
+    HandPlayPool,
+    InfiniteShoe,
+    LazyShoe,
+    PlayDecision,
+    Round,
+    Shoe,
+    TablePlay,
+    YesNoDecision,
+)
+from blackjack.simulation import Seat, make_game
+from blackjack.strategies import StayOnEleven
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+type Setup = Callable[[], Callable[[], object]]
+
+BENCHMARKS: dict[str, Setup] = {}
+
+
+def benchmark(name: str | None = None) -> Callable[[Setup], Setup]:
+    def decorator(setup: Setup) -> Setup:
+        BENCHMARKS[name or setup.__name__] = setup
+        return setup
+
+    return decorator
+
+
+def sample_hand(n: int) -> Hand:
+    # mix of aces and low cards so that soft/hard branches are exercised
+    ranks = ["A", "2", "3", "A", "2", "3", "A", "2"]
+    return Hand(*[Card(rank, "S") for rank in ranks[:n]])
+
+
+@benchmark()
+def card_construction():
+    return lambda: Card("K", "H")
+
+
+for n in range(2, 9):
+
+    @benchmark(f"hand_value_{n}_cards")
+    def hand_value(n=n):
+        hand = sample_hand(n)
+        return lambda: hand.value
+
+    @benchmark(f"hand_soft_value_{n}_cards")
+    def hand_soft_value(n=n):
+        hand = sample_hand(n)
+        return lambda: hand.soft_value
+
+
+def hand_comparison(cached: bool) -> Callable[[], object]:
+    hand = Hand(Card("10", "S"), Card("8", "H"))
+    other = Hand(Card("A", "S"), Card("7", "H"))
+
+    def compare():
+        if not cached:
+            # same cards, but scores are computed again
+            hand.restore(2)
+            other.restore(2)
+        hand > other
+        hand == other
+        hand < other
+
+    return compare
+
+
+@benchmark()
+def hand_comparison_scored():
+    return hand_comparison(False)
+
+
+@benchmark()
+def hand_comparison_cached():
+    return hand_comparison(True)
+
+
+@benchmark()
+def shoe_shuffle():
+    shoe = Shoe(6)
+    return shoe.shuffle
+
+
+@benchmark()
+def shoe_deal_52():
+    shoe = Shoe(6)
+
+    def deal():
+        cards = [shoe.deal() for _ in range(52)]
+        shoe.extend(cards)
+
+    return deal
+
+
+def shoe_cycle(shoe: Shoe) -> Callable[[], object]:
+    # deal cards up to the cut card and reshuffle
+    def cycle():
+        while not shoe.will_shuffle:
+            shoe.deal()
+        shoe.shuffle()
+
+    return cycle
+
+
+@benchmark()
+def shoe_cycle_standard():
+    return shoe_cycle(Shoe(6))
+
+
+@benchmark()
+def shoe_cycle_lazy():
+    return shoe_cycle(LazyShoe(6))
+
+
+def shoe_round(shoe: Shoe) -> Callable[[], object]:
+    # cards of a typical 2-seat round dealt and then returned to the shoe;
+    # `Shoe` has to be rebuilt and reshuffled to emulate continuous shuffling
+    def round_():
+        for _ in range(8):
+            shoe.deal()
+        shoe.shuffle()
+
+    return round_
+
+
+@benchmark()
+def shoe_round_rebuild():
+    return shoe_round(Shoe(6))
+
+
+@benchmark()
+def shoe_round_csm():
+    return shoe_round(CSMShoe(6))
+
+
+@benchmark()
+def shoe_deal_infinite():
+    return InfiniteShoe(6).deal
+
+
+@benchmark()
+def game_play_csm():
+    random.seed(0)
+    return make_game((Seat(),), shoe="csm").play
+
+
+@benchmark()
+def game_play_infinite():
+    random.seed(0)
+    return make_game((Seat(),), shoe="infinite").play
+
+
+def handplay_allowed_choices(cached: bool) -> Callable[[], object]:
+    game = make_game((Seat(),))
+    hand_play = HandPlay(game.players[0], 10)
+    hand_play += Card("8", "S")
+    hand_play += Card("8", "H")
+    hand = hand_play.hand
+
+    def allowed_choices():
+        if not cached:
+            # same cards, but choices are computed again
+            hand.restore(2)
+        return hand_play.allowed_choices
+
+    return allowed_choices
+
+
+@benchmark()
+def handplay_allowed_choices_computed():
+    return handplay_allowed_choices(False)
+
+
+@benchmark()
+def handplay_allowed_choices_cached():
+    return handplay_allowed_choices(True)
+
+
+@benchmark()
+def strategy_compile():
+    return lambda: CompiledStrategy(StayOnEleven())
+
+
+# hard totals part of basic strategy chart, upcards 2-9, 10 and ace; "Dh" is double
+# if allowed, otherwise hit, "Rh" surrender if allowed, otherwise hit
+CHART_UPCARDS = "23456789TA"
+CHART = """
+9:  H  Dh Dh Dh Dh H  H  H  H  H
+10: Dh Dh Dh Dh Dh Dh Dh Dh H  H
+11: Dh Dh Dh Dh Dh Dh Dh Dh Dh H
+12: H  H  S  S  S  H  H  H  H  H
+13: S  S  S  S  S  H  H  H  H  H
+14: S  S  S  S  S  H  H  H  H  H
+15: S  S  S  S  S  H  H  H  Rh H
+16: S  S  S  S  S  H  H  Rh Rh Rh
+"""
+
+
+class ChartStrategy(GameStrategy):
+    """
+    Strategy looking up a text chart, more work per decision than the strategies in
+    `blackjack.strategies` and the kind of strategy compiling is meant for.
+    """
+
+    def __init__(self) -> None:
+        self.chart: dict[tuple[int, str], str] = {}
+        for line in CHART.strip().splitlines():
+            total, actions = line.split(":")
+            for upcard, action in zip(CHART_UPCARDS, actions.split()):
+                self.chart[int(total), upcard] = action
+
+    def play(
+        self, dealer_hand: Hand, player_hand: Hand, choices: PlayDecision
+    ) -> PlayDecision:
+        up = dealer_hand[0]
+        upcard = "A" if up.is_ace else "T" if up.value == 10 else str(up.value)
+        total = player_hand.value
+        action = self.chart.get((total, upcard), "H" if total < 9 else "S")
+        if action[0] == "D" and PlayDecision.DOUBLE in choices:
+            return PlayDecision.DOUBLE
+        elif action[0] == "R" and PlayDecision.SURRENDER in choices:
+            return PlayDecision.SURRENDER
+        return PlayDecision.STAND if action == "S" else PlayDecision.HIT
+
+    def insurance(self, dealer_hand: Hand, player_hand: Hand) -> YesNoDecision:
+        return YesNoDecision.NO
+
+
+def strategy_play(
+    compiled: bool, strategy_type: type[GameStrategy] = StayOnEleven
+) -> Callable[[], object]:
+    strategy = strategy_type()
+    if compiled:
+        strategy = CompiledStrategy(strategy)
+    dealer_hand = Hand(Card("9", "S"))
+    player_hand = Hand(Card("10", "S"), Card("6", "H"))
+    choices = PlayDecision.HIT | PlayDecision.STAND | PlayDecision.DOUBLE
+    return lambda: strategy.play(dealer_hand, player_hand, choices)
+
+
+@benchmark()
+def strategy_play_raw():
+    return strategy_play(False)
+
+
+@benchmark()
+def strategy_play_compiled():
+    return strategy_play(True)
+
+
+@benchmark()
+def strategy_play_chart_raw():
+    return strategy_play(False, ChartStrategy)
+
+
+@benchmark()
+def strategy_play_chart_compiled():
+    return strategy_play(True, ChartStrategy)
+
+
+def round_play(seats: int) -> Callable[[], object]:
+    random.seed(0)
+    game = make_game((Seat(),) * seats)
+    dealer = Dealer(shoe=Shoe(CONFIG["number_of_decks"]))
+    players = game.players
+
+    def play():
+        Round(dealer, TablePlay([HandPlay(player, 10) for player in players])).play()
+
+    return play
+
+
+@benchmark()
+def round_play_1_seat():
+    return round_play(1)
+
+
+@benchmark()
+def round_play_7_seats():
+    return round_play(7)
+
+
+@benchmark()
+def game_play():
+    random.seed(0)
+    return make_game((Seat(),)).play
+
+
+@benchmark()
+def game_play_pool():
+    random.seed(0)
+    game = make_game((Seat(),))
+    game.pool = HandPlayPool()
+    return game.play
+
+
+def measure(setup: Setup, repeat: int = 5) -> float:
+    timer = timeit.Timer(setup())
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number))
+    return number / best
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(filter: str | None = None, output: Path | None = None) -> Path:
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if filter and filter not in name:
+            continue
+        results[name] = measure(setup)
+        print(f"{name:<30} {results[name]:>15,.0f} ops/s")
+
+    if output is None:
+        RESULTS_DIR.mkdir(exist_ok=True)
+        output = RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    with open(output, "wt") as f:
+        json.dump(
+            {
+                "meta": {
+                    "timestamp": time.time(),
+                    "revision": git_revision(),
+                    "python": sys.version,
+                    "platform": platform.platform(),
+                },
+                "results": results,
+            },
+            f,
+            indent=2,
+        )
+    print(f"Results saved to: {output}")
+    return output
+
+
+def compare(baseline: Path, new: Path, threshold: float = 0.1) -> bool:
+    """
+    Print change of every metric present in both files. Return True if no metric
+    regressed by more than `threshold`.
+    """
+    with open(baseline, "rt") as f:
+        old_results = json.load(f)["results"]
+    with open(new, "rt") as f:
+        new_results = json.load(f)["results"]
+
+    ok = True
+    for name in [name for name in old_results if name in new_results]:
+        change = new_results[name] / old_results[name] - 1
+        regressed = change < -threshold
+        ok = ok and not regressed
+        print(
+            f"{name:<30} {old_results[name]:>15,.0f} {new_results[name]:>15,.0f} "
+            f"{change:>+8.1%}{'  REGRESSION' if regressed else ''}"
+        )
+    return ok
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Engine benchmarks.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="run benchmarks")
+    run_parser.add_argument("-o", "--output", type=Path)
+    run_parser.add_argument("-k", "--filter", help="run benchmarks matching FILTER")
+
+    compare_parser = subparsers.add_parser("compare", help="compare two runs")
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("new", type=Path)
+    compare_parser.add_argument("--threshold", type=float, default=0.1)
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        run(args.filter, args.output)
+    elif not compare(args.baseline, args.new, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Cold start time of the Kivy app.
+
+The app is started `--runs` times in a new process, every run reports its startup
+phases (see `blackjack.interfaces.kivy.startup`) and exits. `first_frame` is the time
+to the first interactive frame; `process` is wall time from process launch to the
+report, including interpreter startup.
+
+Requires a display (or a virtual one, e.g. `xvfb-run`).
+
+Usage (from repository root):
+
+    python -m benchmarks.kivy_startup [--runs 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import queue
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from typing import IO
+
+from blackjack.interfaces.kivy.startup import REPORT_ENV
+
+APP = "blackjack.interfaces.kivy.main"
+
+
+def read_lines(stream: IO[str], lines: queue.Queue[str | None]) -> None:
+    for line in stream:
+        lines.put(line)
+    # end of output
+    lines.put(None)
+
+
+def start_app(timeout: float) -> dict[str, float]:
+    """
+    Run the app once, return its startup report. App is killed if it doesn't report
+    within `timeout` seconds, even if it prints nothing.
+    """
+    env = {**os.environ, REPORT_ENV: "1", "KIVY_NO_ARGS": "1"}
+    start = time.perf_counter()
+    deadline = start + timeout
+    with subprocess.Popen(
+        [sys.executable, "-m", APP],
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    ) as app:
+        assert app.stdout is not None
+        lines: queue.Queue[str | None] = queue.Queue()
+        threading.Thread(
+            target=read_lines, args=(app.stdout, lines), daemon=True
+        ).start()
+        report = None
+        while report is None:
+            try:
+                line = lines.get(timeout=max(deadline - time.perf_counter(), 0))
+            except queue.Empty:
+                break
+            if line is None:
+                break
+            if line.startswith("{"):
+                report = {
+                    **json.loads(line),
+                    "process": time.perf_counter() - start,
+                }
+        try:
+            # app exits on its own after reporting
+            app.wait(max(deadline - time.perf_counter(), 0) if report else 0)
+        except subprocess.TimeoutExpired:
+            app.kill()
+    if report is None:
+        raise RuntimeError(f"App didn't report startup phases within {timeout}s")
+    return report
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Kivy app startup benchmark.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=60)
+    args = parser.parse_args(argv)
+
+    runs = [start_app(args.timeout) for _ in range(args.runs)]
+    print(f"{'phase':<14}{'median s':>10}{'min s':>10}{'max s':>10}")
+    for phase in runs[0]:
+        times = [run[phase] for run in runs]
+        print(
+            f"{phase:<14}{statistics.median(times):>10.3f}"
+            f"{min(times):>10.3f}{max(times):>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Memory use and garbage collector pauses of a headless game.
+
+Usage (from repository root):
+
+    python -m benchmarks.memory [--rounds 10000000] [--seats 1] [--pool]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import random
+import resource
+import time
+import tracemalloc
+
+from blackjack.engine import Game, HandPlayPool
+from blackjack.simulation import Seat, make_game
+
+
+class GCMonitor:
+    """
+    Record number and duration of garbage collector runs via `gc.callbacks`.
+    """
+
+    def __init__(self) -> None:
+        self.collections = [0, 0, 0]
+        self.pause = 0.0
+        self.max_pause = 0.0
+        self._start = 0.0
+
+    def __call__(self, phase: str, info: dict) -> None:
+        if phase == "start":
+            self._start = time.perf_counter()
+        else:
+            pause = time.perf_counter() - self._start
+            self.pause += pause
+            self.max_pause = max(self.max_pause, pause)
+            self.collections[info["generation"]] += 1
+
+    def __enter__(self) -> GCMonitor:
+        gc.callbacks.append(self)
+        return self
+
+    def __exit__(self, *args) -> None:
+        gc.callbacks.remove(self)
+
+
+def make(seats: int, pool: bool) -> Game:
+    game = make_game((Seat(),) * seats)
+    if pool:
+        game.pool = HandPlayPool()
+    return game
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Memory and GC benchmark.")
+    parser.add_argument("--rounds", type=int, default=10_000_000)
+    parser.add_argument("--seats", type=int, default=1)
+    parser.add_argument("--pool", action="store_true", help="use HandPlayPool")
+    parser.add_argument(
+        "--tracemalloc", action="store_true", help="track peak allocations (slow)"
+    )
+    args = parser.parse_args(argv)
+
+    random.seed(0)
+    game = make(args.seats, args.pool)
+    if args.tracemalloc:
+        tracemalloc.start()
+    with GCMonitor() as monitor:
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            game.play()
+        elapsed = time.perf_counter() - start
+
+    print(f"rounds:          {args.rounds:,}")
+    print(f"rounds/s:        {args.rounds / elapsed:,.0f}")
+    print(f"gc collections:  {monitor.collections}")
+    print(f"gc pause total:  {monitor.pause * 1e3:,.1f} ms")
+    print(f"gc pause max:    {monitor.max_pause * 1e3:,.3f} ms")
+    print(
+        "max rss:         "
+        f"{resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:,.1f} MB"
+    )
+    if args.tracemalloc:
+        _, peak = tracemalloc.get_traced_memory()
+        print(f"traced peak:     {peak / 1024:,.1f} kB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,354 @@
+"""
+Save a `Game` to a compact binary checkpoint and resume it later.
+
+A checkpoint holds everything that decides how the game continues: rules (`CONFIG`),
+state of the `random` module, shoe (cards in dealing order, dealt cards, cut card,
+count), dealer's hand, every player's cash, number of hands and strategies, and the
+round last played or still in progress. A game loaded from a checkpoint plays exactly
+the same rounds as the game it was saved from.
+
+File format (little-endian):
+
+    header:  magic b"BJCP", version (u16)
+    rules:   JSON (blob)
+    random:  internal state (625 x u32), has gauss_next (u8), gauss_next (f64)
+    shoe:    class `module:qualname` (blob), card indexes into `DECK` (blob), dealt
+             card indexes (blob, lazy shoes only)
+    objects: pickle of shoe's other attributes, dealer's strategy and players'
+             strategies (blob)
+    players: count (u16), then cash (f64), number of hands (u16) for each,
+             game has a `HandPlayPool` (u8)
+    round:   stage waiting for a decision or "" (blob), dealer's hand (blob), hand
+             plays still to play and done (count (u16) + hand plays each)
+
+where blob is length (u32) + bytes and hand play is `HAND_PLAY` + hand's cards
+(blob).
+
+Strategies are pickled, so they must be picklable. Objects that can't or shouldn't be
+pickled (e.g. a `ShoePool` or an interface's strategy) are passed as `external` on
+save and the same names passed again on load. A strategy referring to the game's shoe
+(e.g. `RolloutStrategy`) gets the loaded shoe.
+
+If the round was waiting for a decision, the loaded game's round is waiting for it
+too; call `game.round.resume()` (after the interface subscribed to decision events)
+to have it requested again. Snapshots of the shoe (`Shoe.snapshot`) aren't saved.
+
+A checkpoint of a 6 deck game is about 3.5 kB and takes well under a millisecond to
+write, so it can be written every few rounds; `save` replaces the file atomically.
+"""
+
+from __future__ import annotations
+
+import importlib
+import io
+import json
+import os
+import pickle
+import random
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import IO, Any, Mapping
+
+from .engine import (
+    CONFIG,
+    DECK,
+    Card,
+    Dealer,
+    Game,
+    Hand,
+    HandPlay,
+    HandPlayPool,
+    LazyShoe,
+    Player,
+    Round,
+    TablePlay,
+)
+
+MAGIC = b"BJCP"
+VERSION = 1
+HEADER = struct.Struct("<4sH")
+BLOB = struct.Struct("<I")
+COUNT = struct.Struct("<H")
+FLAG = struct.Struct("<?")
+RANDOM_STATE = 625
+GAUSS = struct.Struct("<?d")
+PLAYER = struct.Struct("<dH")
+# player index, betsize, insurance, splits, flags (`FLAGS`), winnings, losses,
+# insurance result
+HAND_PLAY = struct.Struct("<HddHBddb")
+FLAGS = ("doubled", "surrendered", "active", "_is_done", "_is_cashed")
+# flag of the hand play's hand, after `FLAGS`
+NO_BLACKJACK = 1 << len(FLAGS)
+
+CARD_INDEX = {(card.rank, card.suit): i for i, card in enumerate(DECK)}
+# shoes deal `DECK` instances, so cards are looked up by identity first
+DECK_INDEX = {id(card): i for i, card in enumerate(DECK)}
+
+# name under which the game's shoe is pickled
+SHOE = "shoe"
+
+
+def cards_to_bytes(cards: list[Card]) -> bytes:
+    try:
+        return bytes(map(DECK_INDEX.__getitem__, map(id, cards)))
+    except KeyError:
+        return bytes(CARD_INDEX[card.rank, card.suit] for card in cards)
+
+
+def cards_from_bytes(data: bytes) -> list[Card]:
+    return list(map(DECK.__getitem__, data))
+
+
+def class_path(cls: type) -> str:
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def resolve_class(path: str) -> type:
+    module_name, _, qualname = path.partition(":")
+    obj: Any = importlib.import_module(module_name)
+    for name in qualname.split("."):
+        obj = getattr(obj, name)
+    return obj
+
+
+class _Pickler(pickle.Pickler):
+    def __init__(self, file: IO[bytes], external: dict[int, str]) -> None:
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.external = external
+
+    def persistent_id(self, obj: Any) -> str | None:
+        return self.external.get(id(obj))
+
+
+class _Unpickler(pickle.Unpickler):
+    def __init__(self, file: IO[bytes], external: Mapping[str, Any]) -> None:
+        super().__init__(file)
+        self.external = external
+
+    def persistent_load(self, pid: str) -> Any:
+        try:
+            return self.external[pid]
+        except KeyError:
+            raise ValueError(f"Checkpoint requires external object: {pid}") from None
+
+
+class _Writer:
+    def __init__(self) -> None:
+        self.buffer = io.BytesIO()
+
+    def pack(self, fmt: struct.Struct, *values: Any) -> None:
+        self.buffer.write(fmt.pack(*values))
+
+    def blob(self, data: bytes) -> None:
+        self.buffer.write(BLOB.pack(len(data)))
+        self.buffer.write(data)
+
+
+class _Reader:
+    def __init__(self, data: bytes) -> None:
+        self.data = memoryview(data)
+        self.offset = 0
+
+    def unpack(self, fmt: struct.Struct) -> tuple[Any, ...]:
+        try:
+            values = fmt.unpack_from(self.data, self.offset)
+        except struct.error as e:
+            raise ValueError("Truncated checkpoint") from e
+        self.offset += fmt.size
+        return values
+
+    def read(self, size: int) -> bytes:
+        if self.offset + size > len(self.data):
+            raise ValueError("Truncated checkpoint")
+        data = bytes(self.data[self.offset : self.offset + size])
+        self.offset += size
+        return data
+
+    def blob(self) -> bytes:
+        (size,) = self.unpack(BLOB)
+        return self.read(size)
+
+
+def _little_endian(values: array) -> array:
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def _write_hand_play(
+    writer: _Writer, hand_play: HandPlay, players: list[Player]
+) -> None:
+    flags = sum(1 << i for i, flag in enumerate(FLAGS) if getattr(hand_play, flag))
+    if hand_play.hand._no_blackjack:
+        flags |= NO_BLACKJACK
+    writer.pack(
+        HAND_PLAY,
+        players.index(hand_play.player),
+        hand_play.betsize,
+        hand_play.insurance,
+        hand_play.splits,
+        flags,
+        hand_play._winnings,
+        hand_play._losses,
+        hand_play.insurance_result,
+    )
+    writer.blob(cards_to_bytes(hand_play.hand))
+
+
+def _read_hand_play(
+    reader: _Reader, players: list[Player], pool: HandPlayPool | None
+) -> HandPlay:
+    index, betsize, insurance, splits, flags, winnings, losses, insurance_result = (
+        reader.unpack(HAND_PLAY)
+    )
+    hand = Hand(*cards_from_bytes(reader.blob()))
+    hand._no_blackjack = bool(flags & NO_BLACKJACK)
+    hand_play = HandPlay(
+        players[index],
+        betsize,
+        hand,
+        insurance=insurance,
+        splits=splits,
+        insurance_result=insurance_result,
+        pool=pool,
+    )
+    for i, flag in enumerate(FLAGS):
+        setattr(hand_play, flag, bool(flags & (1 << i)))
+    hand_play._winnings = winnings
+    hand_play._losses = losses
+    return hand_play
+
+
+def dumps(game: Game, external: Mapping[str, Any] | None = None) -> bytes:
+    """
+    Checkpoint of `game` (and of current rules and state of `random`).
+    """
+    shoe = game.dealer.shoe
+    round_ = game.round
+    table = round_.table
+    writer = _Writer()
+    writer.pack(HEADER, MAGIC, VERSION)
+    writer.blob(json.dumps(CONFIG).encode())
+
+    _version, internal, gauss_next = random.getstate()
+    writer.buffer.write(_little_endian(array("I", internal)).tobytes())
+    writer.pack(GAUSS, gauss_next is not None, gauss_next or 0.0)
+
+    writer.blob(class_path(type(shoe)).encode())
+    writer.blob(cards_to_bytes(shoe))
+    writer.blob(cards_to_bytes(shoe._dealt if isinstance(shoe, LazyShoe) else []))
+
+    attributes = {
+        key: value
+        for key, value in vars(shoe).items()
+        if key not in ("_dealt", "_undo", "_restores")
+    }
+    objects = io.BytesIO()
+    _Pickler(
+        objects,
+        {id(shoe): SHOE, **{id(obj): name for name, obj in (external or {}).items()}},
+    ).dump(
+        (
+            attributes,
+            game.dealer.strategy,
+            [(player.strategy, player.betting_strategy) for player in game.players],
+        )
+    )
+    writer.blob(objects.getvalue())
+
+    writer.pack(COUNT, len(game.players))
+    for player in game.players:
+        writer.pack(PLAYER, player.cash, player.number_of_hands)
+    writer.pack(FLAG, game.pool is not None)
+
+    if round_.waiting:
+        # hand in progress is played again on resume
+        assert table._in_progress is not None
+        to_play = [*table._hands, table._in_progress]
+        writer.blob(round_._stage.encode())
+    else:
+        to_play = table._hands
+        writer.blob(b"")
+    writer.blob(cards_to_bytes(round_.dealer.hand))
+    for hand_plays in (to_play, table._done):
+        writer.pack(COUNT, len(hand_plays))
+        for hand_play in hand_plays:
+            _write_hand_play(writer, hand_play, game.players)
+    return writer.buffer.getvalue()
+
+
+def loads(data: bytes, external: Mapping[str, Any] | None = None) -> Game:
+    """
+    Game saved by `dumps`. Saved rules are written to `CONFIG` and state of `random`
+    is restored.
+    """
+    reader = _Reader(data)
+    magic, version = reader.unpack(HEADER)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a valid game checkpoint")
+    rules = json.loads(reader.blob())
+    internal = _little_endian(array("I", reader.read(RANDOM_STATE * 4)))
+    has_gauss, gauss_next = reader.unpack(GAUSS)
+
+    shoe_class = resolve_class(reader.blob().decode())
+    shoe = shoe_class.__new__(shoe_class)
+    shoe.extend(cards_from_bytes(reader.blob()))
+    dealt = cards_from_bytes(reader.blob())
+    attributes, dealer_strategy, strategies = _Unpickler(
+        io.BytesIO(reader.blob()), {**(external or {}), SHOE: shoe}
+    ).load()
+    vars(shoe).update(attributes)
+    shoe._undo = None
+    shoe._restores = []
+    if isinstance(shoe, LazyShoe):
+        shoe._dealt = dealt
+
+    (count,) = reader.unpack(COUNT)
+    if count != len(strategies):
+        raise ValueError("Not a valid game checkpoint")
+    players = []
+    for strategy, betting_strategy in strategies:
+        cash, number_of_hands = reader.unpack(PLAYER)
+        players.append(Player(strategy, betting_strategy, cash, number_of_hands))
+    (has_pool,) = reader.unpack(FLAG)
+    pool = HandPlayPool() if has_pool else None
+
+    stage = reader.blob().decode()
+    dealer = Dealer(shoe, Hand(*cards_from_bytes(reader.blob())), dealer_strategy)
+    hand_plays = []
+    for _ in range(2):
+        (n,) = reader.unpack(COUNT)
+        hand_plays.append([_read_hand_play(reader, players, pool) for _ in range(n)])
+
+    # nothing is changed before the whole checkpoint is read
+    CONFIG.update(
+        {
+            key: tuple(value) if isinstance(value, list) else value
+            for key, value in rules.items()
+        }
+    )
+    random.setstate((3, tuple(internal), gauss_next if has_gauss else None))
+    game = Game(players, dealer, pool=pool)
+    game.round = Round(dealer, TablePlay(*hand_plays))
+    game.round._stage = stage
+    return game
+
+
+def save(game: Game, path: Path, external: Mapping[str, Any] | None = None) -> None:
+    """
+    Write checkpoint of `game` to `path`, the file is replaced only once the new
+    checkpoint is completely written.
+    """
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(dumps(game, external))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def load(path: Path, external: Mapping[str, Any] | None = None) -> Game:
+    return loads(Path(path).read_bytes(), external)
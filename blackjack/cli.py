@@ -0,0 +1,187 @@
+"""
+Headless simulation from the command line, installed as `blackjack-sim`.
+
+Config file is JSON, or TOML if its name ends with `.toml`:
+
+    {
+        "rules": {"number_of_decks": 6, "blackjack_payout": "6/5"},
+        "players": [
+            {"strategy": "MimickDealer", "bet": 10},
+            {"strategy": "StayOnEleven", "hands": 2}
+        ],
+        "shoe": "standard"
+    }
+
+`rules` override `CONFIG` keys, every player is described by `simulation.Seat`
+fields (strategy names as in `blackjack.strategies` or `package.module:ClassName`).
+EV is measured for the first player, others only share the table. All keys are
+optional.
+
+Usage:
+
+    blackjack-sim config.toml --rounds 1000000 --workers 8 --seed 1 -o report.json
+    blackjack-sim config.json --time-budget 60
+
+Progress (rounds per second, running EV and SE) is streamed to stderr, final report
+is written as JSON to stdout or `--output`.
+
+Nothing in here imports interface code, so it starts fast on machines without kivy.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import random
+import sys
+import tomllib
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, TextIO
+
+from .engine import CONFIG, BettingStrategy
+from .simulation import SHOES, Seat, SimulationResult, simulate, strategy_class
+from .sweep import parse_value
+
+CONFIG_KEYS = {"rules", "players", "shoe"}
+
+# minimum seconds between progress lines
+PROGRESS_INTERVAL = 1.0
+
+
+@dataclass(frozen=True)
+class SimConfig:
+    """
+    Contents of a config file.
+    """
+
+    rules: dict[str, Any] = field(default_factory=dict)
+    seats: tuple[Seat, ...] = (Seat(),)
+    shoe: str = "standard"
+
+
+def load_config(path: Path) -> SimConfig:
+    with open(path, "rb") as f:
+        data = tomllib.load(f) if path.suffix == ".toml" else json.load(f)
+    if unknown := set(data) - CONFIG_KEYS:
+        raise ValueError(f"Unknown config keys: {sorted(unknown)}")
+    rules = {
+        key: parse_value(key, value) for key, value in data.get("rules", {}).items()
+    }
+    try:
+        seats = tuple(Seat(**player) for player in data.get("players", [{}]))
+    except TypeError as e:
+        raise ValueError(f"Invalid player: {e}") from e
+    if not seats:
+        raise ValueError("At least one player required")
+    # checked here, otherwise they'd only fail in a worker process
+    low, high = rules.get("table_limits", CONFIG["table_limits"])
+    for seat in seats:
+        try:
+            strategy_class(seat.strategy)
+            strategy_class(seat.betting, BettingStrategy)
+        except ImportError as e:
+            raise ValueError(f"Invalid player: {e}") from e
+        if not low <= seat.bet <= high:
+            raise ValueError(f"Bet {seat.bet} outside of table limits {low}-{high}")
+    shoe = data.get("shoe", SimConfig.shoe)
+    if shoe not in SHOES:
+        raise ValueError(f"Unknown shoe: {shoe}, available: {sorted(SHOES)}")
+    return SimConfig(rules, seats, shoe)
+
+
+def progress_printer(stream: TextIO) -> Callable[[SimulationResult], None]:
+    """
+    Progress callback for `simulate` writing at most one line per
+    `PROGRESS_INTERVAL` (and one for the last chunk) to `stream`.
+    """
+    last = -PROGRESS_INTERVAL
+
+    def progress(result: SimulationResult) -> None:
+        nonlocal last
+        if result.elapsed - last < PROGRESS_INTERVAL and result.stopped_by is None:
+            return
+        last = result.elapsed
+        stats = result.stats
+        print(
+            f"rounds: {stats.n:>12,}  rounds/s: {stats.n / result.elapsed:>10,.0f}"
+            f"  ev: {stats.mean:>8.4f}  se: {stats.se:.4f}",
+            file=stream,
+            flush=True,
+        )
+
+    return progress
+
+
+def finite(value: float) -> float | None:
+    # JSON has no infinity (sd and se of less than two rounds)
+    return value if math.isfinite(value) else None
+
+
+def report(
+    result: SimulationResult, config: SimConfig, seed: int, workers: int
+) -> dict[str, Any]:
+    stats = result.stats
+    ci_low, ci_high = result.ci()
+    return {
+        "rounds": stats.n,
+        "ev": stats.mean,
+        "sd": finite(stats.sd),
+        "se": finite(stats.se),
+        "ci_low": finite(ci_low),
+        "ci_high": finite(ci_high),
+        "elapsed": result.elapsed,
+        "rounds_per_second": stats.n / result.elapsed if result.elapsed else None,
+        "stopped_by": result.stopped_by,
+        "seed": seed,
+        "workers": workers,
+        "rules": config.rules,
+        "players": [asdict(seat) for seat in config.seats],
+        "shoe": config.shoe,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Headless blackjack simulation.")
+    parser.add_argument("config", type=Path, help="json or toml config file")
+    parser.add_argument("--rounds", type=int, default=None, help="maximum rounds")
+    parser.add_argument("--time-budget", type=float, default=None, help="seconds")
+    parser.add_argument("--target-se", type=float, default=None)
+    parser.add_argument("--seed", type=int, default=None, help="default: random")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--chunk", type=int, default=10_000)
+    parser.add_argument("-o", "--output", type=Path, help="default: stdout")
+    args = parser.parse_args(argv)
+    if args.rounds is None and args.time_budget is None and args.target_se is None:
+        parser.error("one of --rounds, --time-budget, --target-se is required")
+
+    try:
+        config = load_config(args.config)
+    except (OSError, ValueError, KeyError) as e:
+        parser.error(str(e))
+    # chosen here, so that it can be reported
+    seed = random.getrandbits(32) if args.seed is None else args.seed
+    result = simulate(
+        config.seats,
+        config.rules,
+        seed=seed,
+        target_se=args.target_se,
+        time_budget=args.time_budget,
+        max_rounds=args.rounds,
+        chunk=args.chunk,
+        shoe=config.shoe,
+        workers=args.workers,
+        progress=progress_printer(sys.stderr),
+    )
+    output = json.dumps(
+        report(result, config, seed, args.workers), indent=2, allow_nan=False
+    )
+    if args.output is None:
+        print(output)
+    else:
+        args.output.write_text(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""
+Compile a deterministic `GameStrategy` into lookup tables.
+
+Most strategies depend only on the class of player's hand (hard, soft or pair), its
+total, dealer's upcard and allowed choices. `CompiledStrategy` asks the wrapped
+strategy about every such state once, using several different hands for each state
+(e.g. 10+6, 2+4+10 and A+5+10 for hard 16), and stores the answer in a flat
+`bytearray`. Every later decision costs one index into that array, so compiling pays
+off for strategies doing more work per decision than computing the key, e.g. looking
+up a chart (about twice as fast compiled); the simple strategies in
+`blackjack.strategies` are faster as they are (see: `strategy_play_*` benchmarks).
+
+States where the probed answers differ (the strategy looks at more than the key, e.g.
+number of cards) or the strategy fails are not compiled; those are answered by the
+wrapped strategy and memoized by card ranks in a bounded cache.
+
+Strategies depending on anything else (count, randomness, history) must not be
+compiled. Every state is asked about twice with the same hand and a strategy giving
+two different answers is refused as not deterministic (`ValueError`), which catches
+random strategies like `RandomStrategy`, but not a strategy following the count.
+"""
+
+from __future__ import annotations
+
+import itertools
+from collections import defaultdict
+from enum import Flag
+from functools import reduce
+from operator import or_
+from typing import Callable, Iterator
+
+from .engine import (
+    PLAY_DECISIONS,
+    SUITS,
+    Card,
+    GameStrategy,
+    Hand,
+    PlayDecision,
+    YesNoDecision,
+)
+from .rollout import RolloutStrategy
+
+HARD, SOFT, PAIR = range(3)
+TOTALS = 32
+UPCARDS = 11
+MASKS = 32
+
+# choices that are ever offered: hit and stand always, others depending on hand
+OPTIONAL = (PlayDecision.SPLIT, PlayDecision.DOUBLE, PlayDecision.SURRENDER)
+CHOICES = [
+    reduce(or_, combination, PlayDecision.HIT | PlayDecision.STAND)
+    for n in range(len(OPTIONAL) + 1)
+    for combination in itertools.combinations(OPTIONAL, n)
+]
+
+# answers by their value (`Flag.value` is slow, `_value_` is used on hot paths),
+# play decisions are looked up in `engine.PLAY_DECISIONS`
+YES_NO_DECISIONS: list[YesNoDecision | None] = [None] * 4
+for answer in YesNoDecision:
+    YES_NO_DECISIONS[answer.value] = answer
+
+# ranks of probe hands, two different ranks of value 10 to get non pair 20
+PROBE_RANKS = ["A", "2", "3", "4", "5", "6", "7", "8", "9", "10", "K"]
+
+# number of different hands asked about every state
+PROBES = 3
+MAX_CARDS = 5
+
+
+def hand_key(hand: Hand) -> tuple[int, int]:
+    """
+    Class and total of a hand.
+    """
+    if len(hand) == 2:
+        first, second = hand
+        if first.rank == second.rank:
+            return PAIR, first.value
+        hard = first.value + second.value
+        ace = first.is_ace or second.is_ace
+    else:
+        hard = 0
+        ace = False
+        for card in hand:
+            hard += card.value
+            ace = ace or card.is_ace
+    if ace and hard <= 11:
+        return SOFT, hard + 10
+    return HARD, hard
+
+
+def play_index(hand_class: int, total: int, upcard: int, choices: int) -> int:
+    return ((hand_class * TOTALS + total) * UPCARDS + upcard) * MASKS + choices
+
+
+def make_hand(ranks: tuple[str, ...], variant: int) -> Hand:
+    return Hand(
+        *(Card(rank, SUITS[(i + variant) % len(SUITS)]) for i, rank in enumerate(ranks))
+    )
+
+
+def probe_hands() -> dict[tuple[int, int], list[Hand]]:
+    """
+    Up to `PROBES` different not busted hands for every (class, total): the one with
+    fewest cards, the one with most cards and one with an ace, if they differ.
+    """
+    compositions: defaultdict[tuple[int, int], list[tuple[str, ...]]] = defaultdict(
+        list
+    )
+    for n in range(2, MAX_CARDS + 1):
+        for ranks in itertools.combinations_with_replacement(PROBE_RANKS, n):
+            hand = make_hand(ranks, 0)
+            if hand.hard_value <= 21:
+                compositions[hand_key(hand)].append(ranks)
+
+    hands = {}
+    for key, candidates in compositions.items():
+        chosen = [candidates[0], candidates[-1]]
+        chosen += [ranks for ranks in candidates if "A" in ranks][:1]
+        unique = list(dict.fromkeys(chosen))[:PROBES]
+        hands[key] = [make_hand(ranks, i) for i, ranks in enumerate(unique)]
+    return hands
+
+
+def dealer_hands(upcard: int) -> Iterator[Hand]:
+    ranks = ["10", "K"] if upcard == 10 else [PROBE_RANKS[upcard - 1]]
+    for variant in itertools.count():
+        yield make_hand((ranks[variant % len(ranks)],), variant)
+
+
+class CompiledStrategy(GameStrategy):
+    """
+    Lookup table version of `strategy`, see module docstring.
+    """
+
+    def __init__(self, strategy: GameStrategy, memo_size: int = 4096) -> None:
+        if isinstance(strategy, RolloutStrategy):
+            # depends on cards left in the shoe, and probing it would take minutes
+            raise ValueError(f"{strategy!r} can't be compiled")
+        self.strategy = strategy
+        self.memo_size = memo_size
+        self._memo: dict[tuple, PlayDecision] = {}
+        self._insurance_memo: dict[tuple, YesNoDecision] = {}
+        self.play_table = bytearray(3 * TOTALS * UPCARDS * MASKS)
+        self.insurance_table = bytearray(3 * TOTALS)
+        self._compile()
+
+    def _compile(self) -> None:
+        for (hand_class, total), hands in probe_hands().items():
+            # insurance is offered before any card is drawn
+            self.insurance_table[hand_class * TOTALS + total] = self._answer(
+                self.strategy.insurance,
+                [
+                    (make_hand(("A",), i), hand)
+                    for i, hand in enumerate(hands)
+                    if len(hand) == 2
+                ],
+            )
+
+            for upcard in range(1, 11):
+                for choices in CHOICES:
+                    self.play_table[
+                        play_index(hand_class, total, upcard, choices.value)
+                    ] = self._answer(
+                        self.strategy.play,
+                        [
+                            (dealer_hand, hand, choices)
+                            for hand, dealer_hand in zip(hands, dealer_hands(upcard))
+                        ],
+                    )
+
+    def _answer(self, method: Callable[..., Flag], probes: list[tuple]) -> int:
+        """
+        Answer to all `probes` of one state, 0 if they differ. First probe is asked
+        twice to detect strategies that aren't deterministic.
+        """
+        if not probes:
+            return 0
+        answers = [self._probe(method, *args) for args in probes]
+        if self._probe(method, *probes[0]) != answers[0]:
+            raise ValueError(
+                f"{self.strategy!r} is not deterministic and can't be compiled"
+            )
+        return answers[0] if len(set(answers)) == 1 else 0
+
+    @staticmethod
+    def _probe(method: Callable[..., Flag], *args: Hand | PlayDecision) -> int:
+        # 0 means not compiled
+        try:
+            return method(*args).value
+        except Exception:
+            return 0
+
+    @property
+    def compiled_states(self) -> int:
+        return sum(map(bool, self.play_table))
+
+    def play(
+        self, dealer_hand: Hand, player_hand: Hand, choices: PlayDecision
+    ) -> PlayDecision:
+        hand_class, total = hand_key(player_hand)
+        # play_index inlined
+        if decision := self.play_table[
+            ((hand_class * TOTALS + total) * UPCARDS + dealer_hand[0].value) * MASKS
+            + choices._value_
+        ]:
+            return PLAY_DECISIONS[decision]
+        key = (
+            tuple(card.rank for card in player_hand),
+            dealer_hand[0].rank,
+            choices.value,
+        )
+        try:
+            return self._memo[key]
+        except KeyError:
+            answer = self.strategy.play(dealer_hand, player_hand, choices)
+            self._remember(self._memo, key, answer)
+            return answer
+
+    def insurance(self, dealer_hand: Hand, player_hand: Hand) -> YesNoDecision:
+        hand_class, total = hand_key(player_hand)
+        if decision := self.insurance_table[hand_class * TOTALS + total]:
+            return YES_NO_DECISIONS[decision]  # type: ignore
+        key = tuple(card.rank for card in player_hand)
+        try:
+            return self._insurance_memo[key]
+        except KeyError:
+            answer = self.strategy.insurance(dealer_hand, player_hand)
+            self._remember(self._insurance_memo, key, answer)
+            return answer
+
+    def _remember(self, memo: dict, key: tuple, answer) -> None:
+        if len(memo) >= self.memo_size:
+            # dicts keep insertion order, drop the oldest entry
+            del memo[next(iter(memo))]
+        memo[key] = answer
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__qualname__}({self.strategy!r})"
@@ -2,11 +2,14 @@ from __future__ import annotations
 
 import random
 from abc import ABC, abstractmethod
+from bisect import bisect_right
 from dataclasses import dataclass, field
 from enum import Enum, Flag, auto
-from functools import cached_property, partial, reduce, wraps
-from operator import ior
+from functools import cached_property, lru_cache, partial, reduce, wraps
+from operator import ior, itemgetter
+from time import perf_counter
 from typing import (
+    TYPE_CHECKING,
     Any,
     Callable,
     ClassVar,
@@ -20,6 +23,9 @@ from typing import (
 
 from .helpers import PubSubDecorator
 
+if TYPE_CHECKING:
+    from .instrumentation import Profiler
+
 # ### Rules ###
 CONFIG = {
     "dealer_h17": False,
@@ -44,6 +50,12 @@ FACES = ["10", "J", "Q", "K"]
 
 suit_str_dict = {"S": "♠", "H": "♥", "D": "♦", "C": "♣"}
 
+# Score codes of hands (see: `Hand.score`, `HandPlay.score`) in order of strength,
+# hand values 1 to 21 are their own codes.
+BUST = 0
+BLACKJACK = 22
+SURRENDERED = 23
+
 
 @dataclass(frozen=True)
 class Card:
@@ -103,13 +115,46 @@ class Card:
 DECK = [Card(rank, suit) for rank in RANKS for suit in SUITS]
 
 
+@dataclass(frozen=True, slots=True)
+class ShoeSnapshot:
+    """
+    State of a shoe returned by `Shoe.snapshot`. `mark` is the length of shoe's
+    undo log `log` when snapshot was taken, `generation` counts shoe's restores up
+    to then.
+    """
+
+    log: list[Any]
+    mark: int
+    hilo_count: int
+    cut_card: int
+    generation: int
+    # `LazyShoe` only
+    ready: int = 0
+    dealt: int = 0
+
+
 class Shoe(list[Card]):
+    """
+    Cards are dealt from the end of the list.
+
+    State of the shoe can be saved with `snapshot` and rolled back with `restore`
+    any number of times, e.g. to play out alternatives of a decision. No cards are
+    copied: while any snapshot is in use, the shoe records an undo log of cards
+    dealt (and of other changes to the list) and `restore` replays it backwards.
+    Recording stops on `release`. Shuffling starts a new log, which invalidates all
+    snapshots. Restoring a snapshot invalidates snapshots taken after it.
+    """
 
     def __init__(self, decks: int):
         super().__init__()
         self.decks = decks
         self._cut_card: int = 0
         self.hilo_count = 0
+        self._undo: list[Any] | None = None
+        # number of restores so far and (generation, mark) of restores each of
+        # which restored to a lower mark than all later ones (see: `restore`)
+        self._generation = 0
+        self._restores: list[tuple[int, int]] = []
         self.shuffle()
 
     @property
@@ -124,21 +169,227 @@ class Shoe(list[Card]):
         self.hilo_count = 0
         self.extend([*DECK * self.decks])
         random.shuffle(self)
+        self._cut_card = self.cut_card_position()
+        if self._undo is not None:
+            self._undo = []
+
+    def cut_card_position(self) -> int:
         penetration_range = (
             100 - CONFIG["penetration"] - 5,
             100 - CONFIG["penetration"] + 5,
         )
-        self._cut_card = int(random.randint(*penetration_range) * len(self) / 100)
+        return int(random.randint(*penetration_range) * len(self) / 100)
 
     def deal(self) -> Card:
         card = self.pop()
         self.hilo_count += card.hilo_count
+        if self._undo is not None:
+            self._undo.append(card)
         return card
 
+    def snapshot(self) -> ShoeSnapshot:
+        if self._undo is None:
+            self._undo = []
+        return ShoeSnapshot(
+            self._undo,
+            len(self._undo),
+            self.hilo_count,
+            self._cut_card,
+            self._generation,
+        )
+
+    def restore(self, snapshot: ShoeSnapshot) -> None:
+        if snapshot.log is not self._undo:
+            raise GameError("Shoe has been shuffled or released since snapshot")
+        # lowest mark restored to since the snapshot was taken
+        i = bisect_right(self._restores, snapshot.generation, key=itemgetter(0))
+        if i < len(self._restores) and self._restores[i][1] < snapshot.mark:
+            raise GameError("Shoe has been restored to an earlier state since snapshot")
+        undo = snapshot.log
+        while len(undo) > snapshot.mark:
+            self._undo_entry(undo.pop())
+        self.hilo_count = snapshot.hilo_count
+        self._cut_card = snapshot.cut_card
+        self._generation += 1
+        while self._restores and self._restores[-1][1] >= snapshot.mark:
+            self._restores.pop()
+        self._restores.append((self._generation, snapshot.mark))
+
+    def release(self) -> None:
+        """
+        Stop recording undo log, existing snapshots can no longer be restored.
+        """
+        self._undo = None
+
+    def _undo_entry(self, card: Card) -> None:
+        self.append(card)
+
     def __str__(self) -> str:
         return "[" + ", ".join(map(str, self)) + "]"
 
 
+class LazyShoe(Shoe):
+    """
+    Shoe that is never permuted as a whole. Cards are shuffled into place in small
+    chunks (incremental Fisher-Yates) only when they are about to be dealt and
+    dealt cards are put back on `shuffle`, so shuffling cost depends only on number
+    of cards actually dealt.
+
+    Order of cards in the list is NOT the order in which they will be dealt.
+    """
+
+    # number of cards shuffled into place at a time
+    chunk: ClassVar[int] = 16
+
+    def __init__(self, decks: int):
+        self._dealt: list[Card] = []
+        # number of cards at the end of the list already in random order
+        self._ready = 0
+        super().__init__(decks)
+
+    def shuffle(self) -> None:
+        if self._dealt:
+            self.extend(self._dealt)
+            self._dealt.clear()
+        elif not self:
+            self.extend(DECK * self.decks)
+        self._ready = 0
+        self.hilo_count = 0
+        self._cut_card = self.cut_card_position()
+        if self._undo is not None:
+            self._undo = []
+
+    def _shuffle_chunk(self) -> None:
+        rand = random.random
+        end = len(self)
+        swaps = [] if self._undo is not None else None
+        for j in range(end - 1, max(end - 1 - self.chunk, 0), -1):
+            i = int(rand() * (j + 1))
+            self[i], self[j] = self[j], self[i]
+            if swaps is not None:
+                swaps.append(i)
+        self._ready = min(self.chunk, end)
+        if self._undo is not None:
+            self._undo.append((end, swaps))
+
+    def deal(self) -> Card:
+        if not self._ready:
+            self._shuffle_chunk()
+        self._ready -= 1
+        card = self.pop()
+        self._dealt.append(card)
+        self.hilo_count += card.hilo_count
+        if self._undo is not None:
+            self._undo.append(card)
+        return card
+
+    def snapshot(self) -> ShoeSnapshot:
+        if self._undo is None:
+            self._undo = []
+        return ShoeSnapshot(
+            self._undo,
+            len(self._undo),
+            self.hilo_count,
+            self._cut_card,
+            self._generation,
+            self._ready,
+            len(self._dealt),
+        )
+
+    def restore(self, snapshot: ShoeSnapshot) -> None:
+        super().restore(snapshot)
+        self._ready = snapshot.ready
+        del self._dealt[snapshot.dealt :]
+
+    def _undo_entry(self, entry: Card | tuple[int, list[int]]) -> None:
+        if isinstance(entry, tuple):
+            # swaps of a chunk shuffle, undone in reverse order
+            end, swaps = entry
+            for j, i in zip(range(end - len(swaps), end), reversed(swaps)):
+                self[i], self[j] = self[j], self[i]
+        else:
+            self.append(entry)
+
+
+class CSMShoe(LazyShoe):
+    """
+    Continuous shuffling machine. Cards dealt in a round are returned to the machine
+    before the next round (by `Dealer.shuffle`, as `will_shuffle` is true whenever
+    any card has been dealt), so there is no cut card.
+
+    Every card is drawn at random from the cards in the machine by swapping it with
+    the last card and removing it (O(1)); returning cards costs O(cards returned).
+    Count is reset when cards are returned, so it carries no information.
+    """
+
+    @property
+    def will_shuffle(self) -> bool:
+        return bool(self._dealt)
+
+    def cut_card_position(self) -> int:
+        return 0
+
+    def deal(self) -> Card:
+        last = self.pop()
+        if (i := int(random.random() * (len(self) + 1))) < len(self):
+            card, self[i] = self[i], last
+        else:
+            card = last
+        self._dealt.append(card)
+        self.hilo_count += card.hilo_count
+        if self._undo is not None:
+            self._undo.append((i, card))
+        return card
+
+    def _undo_entry(self, entry: tuple[int, Card]) -> None:  # type: ignore
+        i, card = entry
+        if i < len(self):
+            self.append(self[i])
+            self[i] = card
+        else:
+            self.append(card)
+
+
+class InfiniteShoe(Shoe):
+    """
+    Infinite number of decks: every card is drawn independently from a single deck
+    (no card removal effects). The list is a buffer of pre-drawn cards refilled in
+    chunks when empty; it never needs shuffling and the count carries no
+    information. `decks` is ignored.
+    """
+
+    # number of cards drawn into the buffer at a time
+    chunk: ClassVar[int] = 1024
+
+    @property
+    def will_shuffle(self) -> bool:
+        return False
+
+    def shuffle(self) -> None:
+        self.hilo_count = 0
+        self._cut_card = 0
+        if self._undo is not None:
+            self._undo = []
+
+    def deal(self) -> Card:
+        if not self:
+            self.extend(random.choices(DECK, k=self.chunk))
+            if self._undo is not None:
+                self._undo.append(self.chunk)
+        card = self.pop()
+        self.hilo_count += card.hilo_count
+        if self._undo is not None:
+            self._undo.append(card)
+        return card
+
+    def _undo_entry(self, entry: Card | int) -> None:  # type: ignore
+        if isinstance(entry, int):
+            # buffer refill, buffer was empty before
+            self.clear()
+        else:
+            self.append(entry)
+
+
 class Hand(list[Card]):
     """
     Container for cards with methods calculating hand value and comparing it with other
@@ -147,11 +398,19 @@ class Hand(list[Card]):
     `newCardEvent` can be used in event driven interfaces to trigger screen update.
     """
 
+    __slots__ = ("_no_blackjack", "_score", "_scored", "_version")
+
     newCardEvent = PubSubDecorator()
 
     def __init__(self, *cards: Card) -> None:
         super().__init__(cards)
         self._no_blackjack = False
+        self._score = BUST
+        # bumped by every change of cards, so that values derived from them can be
+        # cached (`score`, `HandPlay.choices_mask`)
+        self._version = 0
+        # `_version` when `_score` was computed
+        self._scored = -1
 
     @classmethod
     def from_split(cls, *cards: Card) -> Self:
@@ -209,6 +468,22 @@ class Hand(list[Card]):
             )
         )
 
+    @property
+    def score(self) -> int:
+        """
+        Score code: `BLACKJACK`, `BUST` or value of the hand. Hands compare by their
+        score codes.
+        """
+        if self._scored != self._version:
+            if self.is_blackjack():
+                self._score = BLACKJACK
+            elif (value := self.value) > 21:
+                self._score = BUST
+            else:
+                self._score = value
+            self._scored = self._version
+        return self._score
+
     def value_str(self) -> str:
         if len(self) < 2:
             return ""
@@ -236,59 +511,40 @@ class Hand(list[Card]):
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Hand):
             return NotImplemented
-        elif all((self.is_blackjack(), other.is_blackjack())):
-            return True
-        elif any((self.is_blackjack(), other.is_blackjack())):
-            return False
-        elif all((self.is_bust(), other.is_bust())):
-            return True
-        else:
-            return self.value == other.value
+        return self.score == other.score
 
     def __gt__(self, other: object) -> bool:
         if not isinstance(other, Hand):
             return NotImplemented
-        elif self.is_blackjack() and not other.is_blackjack():
-            return True
-        elif not self.is_blackjack() and other.is_blackjack():
-            return False
-        elif self.is_bust() and not other.is_bust():
-            return False
-        elif not self.is_bust() and other.is_bust():
-            return True
-        else:
-            return self.value > other.value
+        return self.score > other.score
 
     def __ge__(self, other: object) -> bool:
         if not isinstance(other, Hand):
             return NotImplemented
-        else:
-            return (self > other) or (self == other)
+        return self.score >= other.score
 
     def __lt__(self, other: object) -> bool:
         if not isinstance(other, Hand):
             return NotImplemented
-        elif not self.is_blackjack() and other.is_blackjack():
-            return True
-        elif self.is_blackjack() and not other.is_blackjack():
-            return False
-        elif self.is_bust() and not other.is_bust():
-            return True
-        elif not self.is_bust() and other.is_bust():
-            return False
-        else:
-            return self.value < other.value
+        return self.score < other.score
 
     def __le__(self, other: object) -> bool:
         if not isinstance(other, Hand):
             return NotImplemented
-        else:
-            return (self < other) or (self == other)
+        return self.score <= other.score
 
     def __iadd__(self, card: Card) -> Self:
         self.append(card)
         return self
 
+    def snapshot(self) -> int:
+        # cards are only ever added to a hand, so its length is its state
+        return len(self)
+
+    def restore(self, snapshot: int) -> None:
+        del self[snapshot:]
+        self._version += 1
+
     def __str__(self) -> str:
         return ", ".join(map(str, self))
 
@@ -296,18 +552,22 @@ class Hand(list[Card]):
 
     def __setitem__(self, index: int, item: Card) -> None:
         super().__setitem__(index, item)
+        self._version += 1
         self.newCardEvent.publish(item, self)
 
     def insert(self, index: int, item: Card) -> None:
         super().insert(index, item)
+        self._version += 1
         self.newCardEvent.publish(item, self)
 
     def extend(self, other: list[Card]) -> None:
         super().extend(other)
+        self._version += 1
         self.newCardEvent.publish(other, self)
 
     def append(self, item: Card) -> None:
         super().append(item)
+        self._version += 1
         self.newCardEvent.publish(item, self)
 
 
@@ -449,6 +709,36 @@ class Player:
         self.charge(betsize)
         return betsize
 
+    def snapshot(self) -> float:
+        return self.cash
+
+    def restore(self, snapshot: float) -> None:
+        self.cash = snapshot
+
+
+@lru_cache
+def settlement_table(blackjack_payout: float) -> tuple[tuple[float, ...], ...]:
+    """
+    Multiples of the bet credited to a hand, indexed by score codes of the hand and
+    of dealer's hand: `settlement_table(payout)[hand_score][dealer_score]`.
+    """
+    table = []
+    for player in range(SURRENDERED + 1):
+        row = []
+        for dealer in range(SURRENDERED + 1):
+            if player == SURRENDERED:
+                row.append(0.5)
+            elif player == BUST or player < dealer:
+                row.append(0.0)
+            elif player == dealer:
+                row.append(1.0)
+            elif player == BLACKJACK:
+                row.append(1 + blackjack_payout)
+            else:
+                row.append(2.0)
+        table.append(tuple(row))
+    return tuple(table)
+
 
 T = TypeVar("T")
 
@@ -477,6 +767,12 @@ class PlayDecision(Flag):
         return cls.from_predicates((True, True, True, False, True))
 
 
+# every combination of play decisions by value, faster than `PlayDecision(value)`
+PLAY_DECISIONS: tuple[PlayDecision, ...] = tuple(
+    map(PlayDecision, range(PlayDecision.all()._value_ + 1))
+)
+
+
 class YesNoDecision(Flag):
     YES = auto()
     NO = auto()
@@ -501,7 +797,7 @@ D = TypeVar("D", YesNoDecision, PlayDecision)
 type R = Sequence[HandPlay] | HandPlay | State
 
 
-@dataclass
+@dataclass(slots=True)
 class Decision(Generic[D]):
     callable: Callable[[D], R]
     choices: D
@@ -511,11 +807,34 @@ class Decision(Generic[D]):
         return self.callable(decision)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
+class HandPlayState:
+    """
+    State of a `HandPlay` returned by `HandPlay.snapshot`.
+    """
+
+    betsize: float
+    insurance: float
+    splits: int
+    doubled: bool
+    surrendered: bool
+    active: bool
+    is_done: bool
+    winnings: float
+    losses: float
+    is_cashed: bool
+    insurance_result: Literal[-1, 0, 1]
+    hand: int
+
+
+@dataclass(slots=True)
 class HandPlay:
     """
     Container for all information relevant to how a Hand is played and methods
     evaluating wheather play was won or lost.
+
+    Instances created by a `HandPlayPool` (`pool` is set) are recycled by the pool
+    once the round is over.
     """
 
     player: Player
@@ -524,27 +843,35 @@ class HandPlay:
     insurance: float = 0
     splits: int = 0
     doubled: bool = False
+    surrendered: bool = False
     active: bool = False
     _is_done: bool = field(default=False, repr=False)
     _winnings: float = field(default=0, repr=False)
     _losses: float = field(default=0, repr=False)
     _is_cashed: bool = field(default=False, repr=True)
     insurance_result: Literal[-1, 0, 1] = field(default=0, repr=False)
+    pool: HandPlayPool | None = field(default=None, repr=False, compare=False)
+    # allowed choices as `PlayDecision` bits and the state they were computed for
+    _choices: int = field(default=0, init=False, repr=False, compare=False)
+    _choices_key: tuple = field(default=(), init=False, repr=False, compare=False)
 
     def __post_init__(self):
         self._losses = -self.betsize
 
     @classmethod
-    def from_player(cls, player: Player) -> Self | None:
+    def from_player(
+        cls, player: Player, pool: HandPlayPool | None = None
+    ) -> HandPlay | None:
         try:
             betsize = player.bet()
         except NotEnoughCash:
             betsize = player.cash
 
+        make = cls if pool is None else pool.hand_play
         if betsize > CONFIG["table_limits"][1]:
-            return cls(player, CONFIG["table_limits"][1])
+            return make(player, CONFIG["table_limits"][1])
         elif betsize >= CONFIG["table_limits"][0]:
-            return cls(player, betsize)
+            return make(player, betsize)
         else:
             # cash that the player has is lower than table minimum
             # return bet that was already charged because play not possible
@@ -582,18 +909,49 @@ class HandPlay:
 
     @property
     def allowed_choices(self) -> PlayDecision | None:
-        if self.is_done:
-            return
+        if choices := self.choices_mask:
+            return PLAY_DECISIONS[choices]
         else:
-            predicates = (
-                self.can_hit(),
-                self.can_split(),
-                self.can_double(),
-                self.can_surrender(),
-                self.can_stand(),
-            )
-            if any(predicates):
-                return PlayDecision.from_predicates(predicates)
+            return None
+
+    @property
+    def choices_mask(self) -> int:
+        """
+        Allowed choices as `PlayDecision` bits, 0 if there are none.
+
+        Recomputed only when cards, bet or done state of the hand (or whether
+        player can afford to match the bet) changed, rules must not change while
+        the hand is played.
+        """
+        if self._choices_key != self._choices_state():
+            if self.is_done:
+                self._choices = 0
+            else:
+                predicates = (
+                    self.can_hit(),
+                    self.can_split(),
+                    self.can_double(),
+                    self.can_surrender(),
+                    self.can_stand(),
+                )
+                self._choices = sum(
+                    flag._value_
+                    for flag, predicate in zip(PlayDecision, predicates)
+                    if predicate
+                )
+            # `is_done` may have changed done state
+            self._choices_key = self._choices_state()
+        return self._choices
+
+    def _choices_state(self) -> tuple:
+        hand = self.hand
+        return (
+            id(hand),
+            hand._version,
+            self.betsize,
+            self._is_done,
+            self.player.cash < self.betsize,
+        )
 
     @property
     def result(self) -> float:
@@ -628,6 +986,7 @@ class HandPlay:
         self._is_done = True
 
     def surrender(self, dealer: Dealer) -> State:
+        self.surrendered = True
         self.credit_bet(0.5)
         # self.hand = Hand()
         self.cash_out(dealer)
@@ -655,24 +1014,30 @@ class HandPlay:
         return State.DONE
 
     def play(self, dealer: Dealer) -> R | Decision:
-        if self.allowed_choices is None:
+        if not (choices := self.choices_mask):
             return State.DONE
         if self.player.strategy is None:
             return Decision(
-                partial(self.process_decision, dealer), self.allowed_choices, self.hand
+                partial(self.process_decision, dealer),
+                PLAY_DECISIONS[choices],
+                self.hand,
             )
         else:
             return self.process_decision(
                 dealer,
-                self.player.strategy.play(dealer.hand, self.hand, self.allowed_choices),
+                self.player.strategy.play(
+                    dealer.hand, self.hand, PLAY_DECISIONS[choices]
+                ),
             )
 
     def process_decision(self, dealer: Dealer, decision: PlayDecision) -> R:
-        try:
-            assert self.allowed_choices is not None
-            assert decision in self.allowed_choices
-        except AssertionError as e:
-            raise GameError from e
+        choices = self.choices_mask
+        if (
+            not choices
+            or not isinstance(decision, PlayDecision)
+            or decision._value_ & ~choices
+        ):
+            raise GameError(f"Decision not allowed: {decision}")
 
         match decision:
             case PlayDecision.HIT:
@@ -709,6 +1074,7 @@ class HandPlay:
             self.hand,
             self.splits,
             self.insurance,
+            self.pool,
             _is_done=is_done,
         )
         for hand_play in new_hands:
@@ -735,17 +1101,17 @@ class HandPlay:
                 self.insurance_result = -1
         return State.DONE
 
+    @property
+    def score(self) -> int:
+        return SURRENDERED if self.surrendered else self.hand.score
+
     def eval_hand(self, dealer: Dealer) -> State:
-        dealer_hand = dealer.hand
-        if self.hand.is_bust() or self._is_cashed:
-            pass
-        elif self.hand > dealer_hand:
-            if self.hand.is_blackjack():
-                self.credit_bet(2.5)
-            else:
-                self.credit_bet(2)
-        elif self.hand == dealer_hand:
-            self.credit_bet(1)
+        if not self._is_cashed and (
+            multiple := settlement_table(CONFIG["blackjack_payout"])[self.score][
+                dealer.hand.score
+            ]
+        ):
+            self.credit_bet(multiple)
         return State.DONE
 
     def cash_out(self, _) -> State:
@@ -758,6 +1124,40 @@ class HandPlay:
         self.hand.append(card)
         return self
 
+    def snapshot(self) -> HandPlayState:
+        """
+        State of the hand play and its hand (not of its player, see
+        `Player.snapshot`). Hands created by a split aren't tracked.
+        """
+        return HandPlayState(
+            self.betsize,
+            self.insurance,
+            self.splits,
+            self.doubled,
+            self.surrendered,
+            self.active,
+            self._is_done,
+            self._winnings,
+            self._losses,
+            self._is_cashed,
+            self.insurance_result,
+            self.hand.snapshot(),
+        )
+
+    def restore(self, snapshot: HandPlayState) -> None:
+        self.betsize = snapshot.betsize
+        self.insurance = snapshot.insurance
+        self.splits = snapshot.splits
+        self.doubled = snapshot.doubled
+        self.surrendered = snapshot.surrendered
+        self.active = snapshot.active
+        self._is_done = snapshot.is_done
+        self._winnings = snapshot.winnings
+        self._losses = snapshot.losses
+        self._is_cashed = snapshot.is_cashed
+        self.insurance_result = snapshot.insurance_result
+        self.hand.restore(snapshot.hand)
+
     @check_if_done_first
     def can_surrender(self) -> bool:
         # override to enter surrender conditions
@@ -806,12 +1206,27 @@ class HandPlay:
         hand: Hand,
         splits: int,
         insurance: float,
+        pool: HandPlayPool | None = None,
         **kwargs: Any,
     ) -> Sequence[Self]:
-        new_hands = [
-            cls(player, bet_size, Hand.from_split(card), splits=splits + 1, **kwargs)
-            for card in reversed(hand)
-        ]
+        if pool is None:
+            new_hands = [
+                cls(
+                    player, bet_size, Hand.from_split(card), splits=splits + 1, **kwargs
+                )
+                for card in reversed(hand)
+            ]
+        else:
+            new_hands = [
+                pool.hand_play(
+                    player,
+                    bet_size,
+                    pool.hand(card, from_split=True),
+                    splits=splits + 1,
+                    **kwargs,
+                )
+                for card in reversed(hand)
+            ]
         new_hands[0].insurance = insurance
         new_hands[0]._losses -= insurance
         return new_hands
@@ -820,7 +1235,56 @@ class HandPlay:
         return str(self.hand)
 
 
-@dataclass
+class HandPlayPool:
+    """
+    Recycles `HandPlay` and `Hand` instances between rounds to avoid allocating
+    new objects for every round in long headless simulations.
+
+    `Game` with a pool returns hand plays of the previous round to the pool when
+    it makes a new round, so references to hands of past rounds must not be kept
+    (ie. don't use it with interfaces displaying results of past rounds).
+    """
+
+    def __init__(self) -> None:
+        self._hand_plays: list[HandPlay] = []
+        self._hands: list[Hand] = []
+
+    def hand(self, *cards: Card, from_split: bool = False) -> Hand:
+        if self._hands:
+            hand = self._hands.pop()
+            Hand.__init__(hand, *cards)
+        else:
+            hand = Hand(*cards)
+        hand._no_blackjack = from_split
+        return hand
+
+    def hand_play(
+        self,
+        player: Player,
+        betsize: float,
+        hand: Hand | None = None,
+        **kwargs: Any,
+    ) -> HandPlay:
+        if hand is None:
+            hand = self.hand()
+        if self._hand_plays:
+            hand_play = self._hand_plays.pop()
+            HandPlay.__init__(hand_play, player, betsize, hand, pool=self, **kwargs)
+        else:
+            hand_play = HandPlay(player, betsize, hand, pool=self, **kwargs)
+        return hand_play
+
+    def release(self, hand_plays: Sequence[HandPlay]) -> None:
+        for hand_play in hand_plays:
+            if hand_play.pool is self:
+                self._hand_plays.append(hand_play)
+                self._hands.append(hand_play.hand)
+
+    def __len__(self) -> int:
+        return len(self._hand_plays)
+
+
+@dataclass(slots=True)
 class TablePlay:
     _hands: list[HandPlay] = field(default_factory=list, repr=False)
     _done: list[HandPlay] = field(default_factory=list, repr=False)
@@ -881,6 +1345,32 @@ class TablePlay:
                 self._hands.append(hand_hands_or_done)
             self._in_progress = None
 
+    def run_all_hands_direct(self, name: str, dealer: Dealer) -> None:
+        # Equivalent of `run_all_hands` for tables where no hand needs an external
+        # decision; runs everything in one go without the generator machinery
+        hands, done = self._hands, self._done
+        while hands:
+            hand_play = self._in_progress = hands.pop()
+            result = getattr(hand_play, name)(dealer)
+            if result is State.DONE:
+                done.append(hand_play)
+            elif isinstance(result, HandPlay):
+                hands.append(result)
+            elif isinstance(result, Decision):
+                raise GameError(f"Unexpected decision request from: {hand_play}")
+            else:
+                hands.extend(result)
+            self._in_progress = None
+        done.reverse()
+        self._hands, self._done = done, []
+
+    def needs_decisions(self) -> bool:
+        """
+        Check if any hand belongs to a player without strategy, ie. whether
+        external decisions may be required to play the round.
+        """
+        return any(hand_play.player.strategy is None for hand_play in self.hands)
+
     @property
     def hands(self):
         if self._in_progress is None:
@@ -969,11 +1459,17 @@ class DecisionHandler:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Round:
     cashOutEvent: ClassVar = PubSubDecorator()
     dealer: Dealer
     table: TablePlay
+    profiler: Profiler | None = field(default=None, repr=False)
+    _step: Generator[Callable] = field(init=False, repr=False)
+    # all hands played by strategies, no decisions to wait for
+    _direct: bool = field(default=False, init=False, repr=False)
+    # last step that waited for a decision, see `resume`
+    _stage: str = field(default="", init=False, repr=False)
 
     @staticmethod
     def step(func):
@@ -984,17 +1480,66 @@ class Round:
             except StopIteration:
                 next_step = self.finalize
 
-            if (gen := func(self)) is State.DONE:
+            if self.profiler is not None:
+                return self._profiled_step(func, next_step)
+            elif (gen := func(self)) is State.DONE:
                 return self
             elif gen is None:
                 return next_step()
-            elif DecisionHandler.from_gen(gen, next_step):
+            elif self._wait(func.__name__, gen, next_step):
                 return
             else:
                 return next_step()
 
         return wrapper
 
+    def _profiled_step(self, func: Callable, next_step: Callable) -> Self | None:
+        # same as `step` but time spent in the step is recorded; when decision is
+        # required, only time until the decision is requested is counted
+        assert self.profiler is not None
+        start = perf_counter()
+        gen = func(self)
+        handler = (
+            None
+            if (gen is None or gen is State.DONE)
+            else self._wait(func.__name__, gen, next_step)
+        )
+        self.profiler.record(func.__name__, perf_counter() - start)
+        if gen is State.DONE:
+            return self
+        elif handler:
+            return None
+        else:
+            return next_step()
+
+    def _wait(
+        self, stage: str, gen: Generator, next_step: Callable
+    ) -> DecisionHandler | None:
+        # set first, decision request is published as soon as the handler is created
+        self._stage = stage
+        return DecisionHandler.from_gen(gen, next_step)
+
+    @property
+    def waiting(self) -> bool:
+        """
+        True if the round is waiting for a decision.
+        """
+        return not self._direct and self.table._in_progress is not None
+
+    def resume(self) -> Self | None:
+        """
+        Continue a round restored from a checkpoint while it was waiting for a
+        decision: the hand in progress must have been put back to the table's hands
+        still to play, the pending decision is requested again.
+        """
+        if not self._stage:
+            raise GameError("Round wasn't waiting for a decision")
+        pipe = self.pipe
+        names = [step.__name__ for step in pipe]
+        i = names.index(self._stage)
+        self._step = (step for step in pipe[i + 1 :])
+        return pipe[i]()
+
     def steps(self):
         for i in self.pipe:
             yield i
@@ -1013,6 +1558,7 @@ class Round:
         ]
 
     def play(self) -> Self | None:
+        self._direct = not self.table.needs_decisions()
         self._step = self.steps()
         try:
             first_step = next(self._step)
@@ -1036,27 +1582,35 @@ class Round:
     @step
     def offer_insurance(self) -> Generator | None:
         if self.dealer.has_ace:
-            return self.table.play_insurance(self.dealer)
+            return self.run_all_hands("play_insurance")
 
     @step
-    def player_play(self) -> Generator:
-        return self.table.play(self.dealer)
+    def player_play(self) -> Generator | None:
+        return self.run_all_hands("play")
 
     @step
     def dealer_play(self) -> None:
         self.dealer.play(self.table.hands)
 
     @step
-    def eval_insurance(self) -> Generator:
-        return self.table.eval_insurance(self.dealer)
+    def eval_insurance(self) -> Generator | None:
+        return self.run_all_hands("eval_insurance")
 
     @step
-    def eval_hands(self) -> Generator:
-        return self.table.eval_hand(self.dealer)
+    def eval_hands(self) -> Generator | None:
+        return self.run_all_hands("eval_hand")
 
     @step
-    def cash_out(self) -> Generator:
-        return self.table.cash_out(self.dealer)
+    def cash_out(self) -> Generator | None:
+        return self.run_all_hands("cash_out")
+
+    def run_all_hands(self, name: str) -> Generator | None:
+        # tables without human players are run directly, there is nothing to wait
+        # for, so no generator is returned
+        if self._direct:
+            self.table.run_all_hands_direct(name, self.dealer)
+            return None
+        return self.table.run_all_hands(name, self.dealer)
 
     def finalize(self):
         self.cashOutEvent.publish()
@@ -1081,30 +1635,51 @@ class Game:
 
     players: list of player objects
 
+    profiler: optional `instrumentation.Profiler`, if given every round step and
+    strategy callback is timed, see: `profile_report`
+
+    pool: optional `HandPlayPool` recycling hand plays between rounds (headless
+    games only)
+
 
     """
 
     players: list[Player]
     dealer: Dealer = field(default_factory=Dealer)
     round: Round = field(init=False)
+    profiler: Profiler | None = field(default=None, repr=False)
+    pool: HandPlayPool | None = field(default=None, repr=False)
 
     def __post_init__(self):
         self.round = Round(self.dealer, TablePlay())
 
     def make_round(self):
+        if self.pool is not None:
+            self.pool.release(self.round.table.hands)
         hand_plays: list[HandPlay] = []
         for player in self.players:
             for _ in range(player.number_of_hands):
-                hand_play = HandPlay.from_player(player)
+                hand_play = HandPlay.from_player(player, self.pool)
                 if hand_play is not None:
                     hand_plays.append(hand_play)
-        r = Round(self.dealer, TablePlay(hand_plays))
+        r = Round(self.dealer, TablePlay(hand_plays), self.profiler)
         return r
 
     def play(self) -> Round | None:
-        self.round = self.make_round()
+        if self.profiler is None:
+            self.round = self.make_round()
+        else:
+            self.profiler.instrument(self.players)
+            start = perf_counter()
+            self.round = self.make_round()
+            self.profiler.record("make_round", perf_counter() - start)
         return self.round.play()
 
+    def profile_report(self) -> str:
+        if self.profiler is None:
+            raise GameError("Profiling not enabled, pass `profiler` to `Game`")
+        return self.profiler.report()
+
     def loop_play(self):
         while True:
             self.play()
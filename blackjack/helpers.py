@@ -57,6 +57,13 @@ class PubSubDecorator:
                 f"Cannot subscribe to {other} of type: {type(other)}"
             )
 
+    def __set__(self, instance: object, value: object) -> None:
+        # `instance.event += callable` assigns the (same) event back to the
+        # attribute, which must work for instances without `__dict__`;
+        # no `__get__`, so that reading the attribute stays a plain lookup
+        if value is not self:
+            raise AttributeError("Event attribute cannot be replaced")
+
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}()"
 
@@ -0,0 +1,185 @@
+"""
+Opt-in timing of `Round` pipeline steps and strategy callbacks.
+
+Pass a `Profiler` to `Game` to enable it:
+
+    game = Game(players, profiler=Profiler())
+    ...
+    print(game.profile_report())
+
+Strategy callbacks are timed separately, so that time spent in bot strategies can be
+told apart from engine time. Without a profiler, the engine runs unchanged.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any
+
+from .engine import BettingStrategy, GameStrategy, Hand, PlayDecision, Player
+
+PLAY = "GameStrategy.play"
+INSURANCE = "GameStrategy.insurance"
+BET = "BettingStrategy.bet"
+STRATEGY_CALLBACKS = (PLAY, INSURANCE, BET)
+
+
+@dataclass
+class Timings:
+    """
+    Call count, cumulative time and a bounded reservoir sample of call durations
+    used for percentiles.
+    """
+
+    size: int = 10_000
+    count: int = 0
+    total: float = 0.0
+    samples: list[float] = field(default_factory=list, repr=False)
+    # private generator, so that sampling doesn't affect game randomness
+    _random: random.Random = field(default_factory=lambda: random.Random(0), repr=False)
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if len(self.samples) < self.size:
+            self.samples.append(seconds)
+        elif (i := self._random.randrange(self.count)) < self.size:
+            self.samples[i] = seconds
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))]
+
+
+class Profiler:
+    """
+    Collects `Timings` by name.
+    """
+
+    def __init__(self, reservoir_size: int = 10_000) -> None:
+        self.reservoir_size = reservoir_size
+        self.timings: dict[str, Timings] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        try:
+            self.timings[name].add(seconds)
+        except KeyError:
+            self.timings[name] = Timings(self.reservoir_size)
+            self.timings[name].add(seconds)
+
+    def instrument(self, players: list[Player]) -> None:
+        """
+        Wrap strategies of `players` so that their callbacks are timed. Players
+        without a strategy (waiting for external decisions) are left alone.
+        """
+        for player in players:
+            if player.strategy is not None and not isinstance(
+                player.strategy, TimedGameStrategy
+            ):
+                player.strategy = TimedGameStrategy(player.strategy, self)
+            if not isinstance(player.betting_strategy, TimedBettingStrategy):
+                player.betting_strategy = TimedBettingStrategy(
+                    player.betting_strategy, self
+                )
+
+    @property
+    def engine_time(self) -> float:
+        """
+        Time of all engine steps excluding time spent in strategy callbacks.
+        """
+        return (
+            sum(
+                timings.total
+                for name, timings in self.timings.items()
+                if name not in STRATEGY_CALLBACKS
+            )
+            - self.strategy_time
+        )
+
+    @property
+    def strategy_time(self) -> float:
+        return sum(
+            self.timings[name].total
+            for name in STRATEGY_CALLBACKS
+            if name in self.timings
+        )
+
+    def report(self) -> str:
+        header = (
+            f"{'':<24}{'calls':>10}{'total ms':>12}{'mean us':>10}"
+            f"{'p50 us':>10}{'p95 us':>10}{'p99 us':>10}"
+        )
+        lines = [header]
+        for name, timings in self.timings.items():
+            lines.append(
+                f"{name:<24}{timings.count:>10}{timings.total * 1e3:>12.1f}"
+                f"{timings.mean * 1e6:>10.1f}"
+                + "".join(f"{timings.percentile(p) * 1e6:>10.1f}" for p in (50, 95, 99))
+            )
+        lines.append(f"engine time:   {self.engine_time * 1e3:>10.1f} ms")
+        lines.append(f"strategy time: {self.strategy_time * 1e3:>10.1f} ms")
+        return "\n".join(lines)
+
+
+class TimedGameStrategy(GameStrategy):
+    """
+    Proxy timing callbacks of the wrapped strategy.
+    """
+
+    def __init__(self, strategy: GameStrategy, profiler: Profiler) -> None:
+        self.strategy = strategy
+        self.profiler = profiler
+
+    def play(
+        self, dealer_hand: Hand, player_hand: Hand, choices: PlayDecision
+    ) -> PlayDecision:
+        start = perf_counter()
+        decision = self.strategy.play(dealer_hand, player_hand, choices)
+        self.profiler.record(PLAY, perf_counter() - start)
+        return decision
+
+    def insurance(self, dealer_hand: Hand, player_hand: Hand) -> Any:
+        start = perf_counter()
+        decision = self.strategy.insurance(dealer_hand, player_hand)
+        self.profiler.record(INSURANCE, perf_counter() - start)
+        return decision
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "strategy":
+            raise AttributeError(name)
+        return getattr(self.strategy, name)
+
+    def __repr__(self) -> str:
+        return repr(self.strategy)
+
+
+class TimedBettingStrategy(BettingStrategy):
+    """
+    Proxy timing callbacks of the wrapped betting strategy.
+    """
+
+    def __init__(self, strategy: BettingStrategy, profiler: Profiler) -> None:
+        self.strategy = strategy
+        self.profiler = profiler
+
+    def bet(self, *args: Any, **kwargs: Any) -> float:
+        start = perf_counter()
+        betsize = self.strategy.bet(*args, **kwargs)
+        self.profiler.record(BET, perf_counter() - start)
+        return betsize
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "strategy":
+            raise AttributeError(name)
+        return getattr(self.strategy, name)
+
+    def __repr__(self) -> str:
+        return repr(self.strategy)
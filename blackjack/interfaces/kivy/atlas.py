@@ -0,0 +1,130 @@
+"""
+Card textures shared by all card widgets.
+
+Card images (and `back.png`, if present in `cards`) are packed into a single atlas at
+build time:
+
+    python -m blackjack.interfaces.kivy.atlas [--scale 0.5] [--size 4096]
+
+`preload` creates every texture once in the background at app start and `CardImage`
+widgets reuse them instead of loading their own files. If the atlas hasn't been
+built, textures are loaded from individual image files. A card needed before
+preloading is done is loaded on its own.
+"""
+
+import argparse
+import json
+import tempfile
+from functools import partial
+from pathlib import Path
+from typing import Callable
+
+from kivy.atlas import Atlas
+from kivy.core.image import Image as CoreImage
+from kivy.graphics.texture import Texture
+from kivy.loader import Loader, ProxyImage
+
+from blackjack.engine import Card
+
+CARDS_DIR = Path(__file__).parent / "cards"
+# Atlas.create writes `cards.atlas` and `cards-<page>.png` pages
+ATLAS = CARDS_DIR.with_suffix(".atlas")
+
+_textures: dict[str, Texture] = {}
+
+
+def card_files() -> list[Path]:
+    return sorted(CARDS_DIR.glob("*.png"))
+
+
+def build(scale: float = 0.5, size: int = 4096) -> None:
+    """
+    Pack card images scaled by `scale` (card files are much larger than cards on
+    screen) into atlas pages of `size` x `size` pixels.
+    """
+    # Pillow is required by kivy.atlas anyway
+    from PIL import Image as PILImage
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = []
+        for path in card_files():
+            with PILImage.open(path) as image:
+                image.resize(
+                    (round(image.width * scale), round(image.height * scale)),
+                    PILImage.Resampling.LANCZOS,
+                ).save(Path(tmp) / path.name)
+            files.append(str(Path(tmp) / path.name))
+        if not Atlas.create(str(ATLAS.with_suffix("")), files, size):
+            raise ValueError(f"Card images don't fit atlas of size {size}")
+
+
+def load_async(path: Path, callback: Callable[[Texture | None], None]) -> None:
+    """
+    Decode image at `path` on a loader thread, call `callback` with its texture
+    (created on the UI thread), or with None if the image can't be loaded.
+    """
+
+    def loaded(proxy: ProxyImage) -> None:
+        callback(proxy.image.texture)
+
+    def failed(proxy: ProxyImage, *args) -> None:
+        # proxy holds Loader's error image, which must not be used
+        callback(None)
+
+    proxy = Loader.image(str(path))
+    if proxy.loaded:
+        loaded(proxy)
+    else:
+        proxy.bind(on_load=loaded, on_error=failed)
+
+
+def preload(callback: Callable[[], None] | None = None) -> None:
+    """
+    Create textures of all cards in the background, `callback` is called once all
+    of them are created.
+    """
+    # regions of textures in every image file, None for the whole image
+    sources: dict[Path, dict[str, list[int] | None]]
+    if ATLAS.exists():
+        with open(ATLAS) as f:
+            sources = {
+                ATLAS.parent / page: regions for page, regions in json.load(f).items()
+            }
+    else:
+        sources = {path: {path.stem: None} for path in card_files()}
+    pending = set(sources)
+
+    def loaded(path: Path, texture: Texture | None) -> None:
+        # cards of a failed image are loaded on their own, see: `card_texture`
+        if texture is not None:
+            for name, region in sources[path].items():
+                _textures[name] = (
+                    texture if region is None else texture.get_region(*region)
+                )
+        pending.discard(path)
+        if not pending and callback is not None:
+            callback()
+
+    for path in sources:
+        load_async(path, partial(loaded, path))
+
+
+def card_texture(card: Card) -> Texture:
+    name = f"{card.rank.lower()}_{card.suit.lower()}"
+    if (texture := _textures.get(name)) is None:
+        # not preloaded yet
+        texture = _textures[name] = CoreImage(str(CARDS_DIR / f"{name}.png")).texture
+    return texture
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Build card texture atlas.")
+    parser.add_argument("--scale", type=float, default=0.5)
+    parser.add_argument("--size", type=int, default=4096)
+    args = parser.parse_args(argv)
+    build(args.scale, args.size)
+    print(f"Atlas written to: {ATLAS}")
+
+
+if __name__ == "__main__":
+    main()
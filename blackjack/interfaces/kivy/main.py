@@ -1,14 +1,25 @@
+# imported first, startup phases are timed from here
+from blackjack.interfaces.kivy.startup import timer  # isort: skip
+
+import threading
+import time
 from dataclasses import dataclass
+from functools import cache, partial
 from pathlib import Path
 from typing import Any, Callable, Literal
 
+from kivy.animation import Animation
 from kivy.app import App
+from kivy.clock import Clock, mainthread
 from kivy.graphics import Color, Line
+from kivy.graphics.texture import Texture
+from kivy.logger import Logger
 from kivy.properties import NumericProperty, ObjectProperty, StringProperty
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.button import Button
 from kivy.uix.image import Image
 from kivy.uix.label import Label
+from kivy.uix.progressbar import ProgressBar
 from kivy.uix.settings import SettingNumeric, SettingOptions, SettingsWithSidebar
 from kivy.uix.slider import Slider
 from kivy.uix.togglebutton import ToggleButton
@@ -23,12 +34,23 @@ from blackjack.engine import (
     Game,
     GameStrategy,
     Hand,
-    HandPlay,
     PlayDecision,
     Player,
     Round,
     YesNoDecision,
 )
+from blackjack.interfaces.kivy import atlas, startup
+from blackjack.interfaces.kivy.worker import (
+    CARD_DELAY,
+    EngineWorker,
+    GameSnapshot,
+    HandPlaySnapshot,
+    PacedStrategy,
+    copy_hand,
+)
+from blackjack.simulation import RunningStats
+
+timer.mark(startup.IMPORTS)
 
 root_dir = Path(__file__).parent
 
@@ -44,6 +66,22 @@ IMAGE_HEIGHT_RATIO = 0.26
 # this is the ratio of actual image file
 IMAGE_HEIGHT_WIDTH_RATIO = 1.452
 
+# screen regions redrawn by `Screen.update`
+CASH = "cash"
+COUNT = "count"
+SHOE = "shoe"
+PLAYAREA = "playarea"
+REGIONS = frozenset((CASH, COUNT, SHOE, PLAYAREA))
+
+# duration of fade in of new cards
+CARD_FADE_IN = 0.15
+
+# how often autoplay progress is reported (seconds)
+AUTOPLAY_REPORT_INTERVAL = 0.1
+
+# position of dealer's hand and positions of player hands
+type Layout = tuple[tuple[float, float], list[tuple[float, float]]]
+
 
 class CountButton(ToggleButton):
     """
@@ -90,6 +128,8 @@ class DecisionButtons(BoxLayout):
             )
 
     def on_decision(self, widget, decision):
+        # decision is made once, buttons are replaced after engine has processed it
+        self.disabled = True
         self.callable(decision)
 
 
@@ -110,6 +150,7 @@ class InsuranceButtons(BoxLayout):
             self.add_widget(YesNoButton(action))
 
     def on_decision(self, _, decision):
+        self.disabled = True
         self.callable(decision)
 
 
@@ -122,9 +163,14 @@ class KivyBettingStrategy(Slider):
         self.reset()
 
     def bet(self, *args: Any, **kwargs: Any) -> float:
-        self.disabled = True
+        # called on engine thread
+        self.disable()
         return self.value
 
+    @mainthread
+    def disable(self) -> None:
+        self.disabled = True
+
     def on_max_bet(self, *args):
         self.max = min(CONFIG["table_limits"][1], self.max_bet)
 
@@ -139,12 +185,46 @@ class DealButton(Button):
     pass
 
 
+class AutoplayProgress(BoxLayout):
+    """
+    Shown instead of decision buttons while rounds are played automatically.
+    """
+
+    def __init__(self, rounds: int, stop: Callable[[], None], **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.rounds = rounds
+        self.bar = ProgressBar(max=rounds, size_hint_x=0.4)
+        self.stats_label = Label(size_hint_x=0.45)
+        self.stop_button = Button(text="STOP", size_hint_x=0.15)
+        self.stop_button.bind(on_release=lambda *args: stop())
+        for widget in (self.bar, self.stats_label, self.stop_button):
+            self.add_widget(widget)
+
+    def finish(self) -> None:
+        # results stay on screen next to deal button
+        self.remove_widget(self.stop_button)
+        self.remove_widget(self.bar)
+
+    @mainthread
+    def report(self, rounds: int, cash: float, ev: float, se: float) -> None:
+        self.bar.value = rounds
+        self.stats_label.text = (
+            f"{rounds:,}/{self.rounds:,}  CASH ${cash:,.2f}  "
+            f"EV/ROUND ${ev:,.2f} \u00b1 {se:,.2f}"
+        )
+
+
 class CardImage(Image):
     def __init__(self, card: Card, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
-        self.source = f"{root_dir}/cards/{card.rank.lower()}_{card.suit.lower()}.png"
+        # texture shared by all images of the card, see: `atlas`
+        self.texture = atlas.card_texture(card)
         self.width = self.height / IMAGE_HEIGHT_WIDTH_RATIO
 
+    def resize(self, height: float) -> None:
+        self.height = height
+        self.width = height / IMAGE_HEIGHT_WIDTH_RATIO
+
 
 class RotatedCardImage(CardImage):
     # defined in kv
@@ -155,6 +235,7 @@ class InsuranceLabel(Label):
     _color = None
 
     def __init__(self, result: Literal[-1, 0, 1] = 0, *args, **kwargs):
+        self.result = result
         if result == 0:
             self._color = 0, 0, 1, 1
         elif result == 1:
@@ -165,6 +246,11 @@ class InsuranceLabel(Label):
 
 
 class HandWidget(Widget):
+    """
+    Cards of a hand. Widgets are retained between updates: `sync` adds images only
+    for cards dealt since last update and moves existing widgets if layout changed.
+    `hand` is a snapshot, every update brings a new copy of the same hand.
+    """
 
     _offset = 0.15, 0.15
 
@@ -172,11 +258,12 @@ class HandWidget(Widget):
         self, image_height: float, pos: tuple[float, float], hand: Hand, **kwargs
     ) -> None:
         super().__init__(**kwargs)
-        self.image_height = image_height
-        self.center = pos
         self.hand = hand
-        if len(self.hand) > 0:
-            self.render()
+        self.images: list[CardImage] = []
+        self.value_label = Label()
+        for label in self.labels():
+            self.add_widget(label)
+        self.sync(image_height, pos)
 
     @property
     def offset(self):
@@ -185,24 +272,62 @@ class HandWidget(Widget):
             self._offset[1] * self.image_height,
         )
 
-    def render(self):
-        for i, card in enumerate(self.hand):
-            self.add_widget(
-                image := CardImage(
-                    card,
-                    height=self.image_height,
-                    center=self._offset_position(i),
-                )
-            )
-        self.add_widget(
-            Label(
-                text=self.points_value_str(),
-                center=self._label_position(image, i),
-                font_size=self.image_height * 0.15,
-            )
+    def sync(
+        self, image_height: float, pos: tuple[float, float], hand: Hand | None = None
+    ) -> None:
+        if hand is not None:
+            self.hand = hand
+        self.image_height = image_height
+        self.center = pos
+        if self.sync_cards():
+            # keep labels on top of new cards
+            for label in self.labels():
+                self.remove_widget(label)
+                self.add_widget(label)
+        self.sync_labels()
+
+    def image_class(self, n: int) -> type[CardImage]:
+        return CardImage
+
+    def sync_cards(self) -> bool:
+        """
+        Create images for new cards and position all images. Return True if any
+        image was created.
+        """
+        created = False
+        for image in self.images[len(self.hand) :]:
+            self.remove_widget(image)
+        del self.images[len(self.hand) :]
+        for n, card in enumerate(self.hand):
+            image_class = self.image_class(n)
+            if n == len(self.images):
+                self.images.append(image_class(card, opacity=0))
+                self.add_widget(self.images[n])
+                Animation(opacity=1, d=CARD_FADE_IN).start(self.images[n])
+                created = True
+            elif type(self.images[n]) is not image_class:
+                self.remove_widget(self.images[n])
+                self.images[n] = image_class(card)
+                self.add_widget(self.images[n])
+                created = True
+            self.images[n].resize(self.image_height)
+            self.images[n].center = self.card_position(n)
+        return created
+
+    def labels(self) -> list[Label]:
+        return [self.value_label]
+
+    def sync_labels(self) -> None:
+        if not self.images:
+            self.value_label.text = ""
+            return
+        self.value_label.text = self.points_value_str()
+        self.value_label.font_size = self.image_height * 0.15
+        self.value_label.center = self._label_position(
+            self.images[-1], len(self.images) - 1
         )
 
-    def _offset_position(self, n):
+    def card_position(self, n: float) -> tuple[float, float]:
         return (
             self.center[0] + self.offset[0] * n,
             self.center[1] + self.offset[1] * n,
@@ -223,24 +348,109 @@ class PlayerHand(HandWidget):
         self,
         image_height: float,
         pos: tuple[float, float],
-        hand_play: HandPlay,
+        hand_play: HandPlaySnapshot,
         active: bool = False,
         **kwargs,
     ) -> None:
-        Widget.__init__(self, **kwargs)
-        self.image_height = image_height
-        self.center = pos
-        self.hand = hand_play.hand
         self.hand_play = hand_play
-        if len(self.hand) > 0:
-            self.render()
-        if active:
+        self.active = active
+        self.frame: Line | None = None
+        self.result_label = Label(font_name="data/fonts/Roboto-Bold.ttf")
+        self.bet_label = Label()
+        self.insurance_label: InsuranceLabel | None = None
+        super().__init__(image_height, pos, hand_play.hand, **kwargs)
+
+    def sync(
+        self,
+        image_height: float,
+        pos: tuple[float, float],
+        active: bool | None = None,
+        hand_play: HandPlaySnapshot | None = None,
+    ) -> None:
+        if active is not None:
+            self.active = active
+        if hand_play is not None:
+            self.hand_play = hand_play
+        super().sync(image_height, pos, self.hand_play.hand)
+        if self.active and self.frame is None:
             with self.canvas.before:  # type: ignore
-                Color(1, 0, 0)  # Set color to red
-                self.frame = Line(
-                    rectangle=self.get_bounding_box(), width=2
-                )  # Draw the red frame
-                self.bind(pos=self.update_frame, size=self.update_frame)  # type: ignore
+                self.frame_color = Color(1, 0, 0)  # Set color to red
+                self.frame = Line(width=2)  # Draw the red frame
+            self.bind(pos=self.update_frame, size=self.update_frame)  # type: ignore
+        if self.frame is not None:
+            # frame is kept, but hidden when hand is no longer active
+            self.frame_color.a = 1 if self.active else 0
+            self.update_frame()
+
+    def image_class(self, n: int) -> type[CardImage]:
+        # card dealt on double is shown sideways
+        if self.hand_play.doubled and n == len(self.hand) - 1:
+            return RotatedCardImage
+        return CardImage
+
+    def card_position(self, n: float) -> tuple[float, float]:
+        if self.hand_play.doubled and n == len(self.hand) - 1:
+            return (
+                super().card_position(n + 1.1)[0],
+                super().card_position(n + 0.25)[1],
+            )
+        return super().card_position(n)
+
+    def labels(self) -> list[Label]:
+        labels = [self.value_label, self.result_label, self.bet_label]
+        if self.insurance_label is not None:
+            labels.append(self.insurance_label)
+        return labels
+
+    def sync_labels(self) -> None:
+        if not self.images:
+            for label in self.labels():
+                label.text = ""
+            return
+        font_size = self.image_height * 0.15
+        self.value_label.text = self.points_value_str()
+        self.value_label.font_size = font_size
+        if isinstance(self.images[-1], RotatedCardImage) and len(self.images) > 1:
+            self.value_label.center = (
+                self.images[-1].center[0],
+                self._label_position(self.images[-2])[1],
+            )
+        else:
+            self.value_label.center = self._label_position(self.images[-1])
+
+        self.result_label.text = self.result_str()
+        self.result_label.color = (1, 0, 0) if self.hand_play.result < 0 else (0, 1, 0)
+        self.result_label.font_size = font_size
+        self.result_label.center = (
+            self.center_x,
+            self.images[0].top - self.image_height * 1.075,
+        )
+
+        self.bet_label.text = f"${self.hand_play.betsize:.0f}"
+        self.bet_label.font_size = font_size
+        self.bet_label.center = (
+            self.center[0] - self.size[0] / 2 - self.offset[1] * 1.5,
+            self.center[1],
+        )
+        self.sync_insurance_label()
+
+    def sync_insurance_label(self) -> None:
+        if not self.hand_play.insurance:
+            return
+        label = self.insurance_label
+        if label is None or label.result != self.hand_play.insurance_result:
+            # label color is set on creation
+            if label is not None:
+                self.remove_widget(label)
+            label = self.insurance_label = InsuranceLabel(
+                result=self.hand_play.insurance_result, text="I"
+            )
+            self.add_widget(label)
+        label.font_size = self.image_height * 0.2
+        label.center = (
+            self.center[0] - self.size[0] / 2 - self.offset[1] * 1.5,
+            self.center[1] + self.image_height / 2,
+        )
 
     def get_bounding_box(self):
         # Initialize with the widget's own position and size
@@ -271,78 +481,11 @@ class PlayerHand(HandWidget):
 
     def update_frame(self, *args):
         # Update frame to match the computed bounding box
-        bbox = self.get_bounding_box()
-        self.frame.rectangle = bbox
-
-    def render(self):
-
-        if not self.hand_play.doubled:
-            super().render()
-        else:
-            new_hand = self.hand.copy()
-            last_card = new_hand.pop()
-            for i, card in enumerate(new_hand):
-                self.add_widget(
-                    image := CardImage(
-                        card,
-                        height=self.image_height,
-                        center=self._offset_position(i),
-                    )
-                )
-            self.add_widget(
-                rotated_image := RotatedCardImage(
-                    last_card,
-                    height=self.image_height,
-                    center=(
-                        self._offset_position(i + 2.1)[0],
-                        self._offset_position(i + 1.25)[1],
-                    ),
-                )
-            )
-            self.add_widget(
-                Label(
-                    text=self.hand.value_str(),
-                    center=(rotated_image.center[0], self._label_position(image, i)[1]),
-                    font_size=self.image_height * 0.15,
-                )
-            )
-        self.add_widget(
-            Label(
-                text=self.result_str(),
-                color=(1, 0, 0) if self.hand_play.result < 0 else (0, 1, 0),
-                center=(
-                    self.center_x,
-                    self.children[-1].top - self.image_height * 1.075,
-                ),
-                font_size=self.image_height * 0.15,
-                font_name="data/fonts/Roboto-Bold.ttf",
-            )
-        )
-        self.add_widget(
-            Label(
-                text=f"${self.hand_play.betsize:.0f}",
-                center=(
-                    self.center[0] - self.size[0] / 2 - self.offset[1] * 1.5,
-                    self.center[1],
-                ),
-                font_size=self.image_height * 0.15,
-            )
-        )
-        if self.hand_play.insurance:
-            self.add_widget(
-                InsuranceLabel(
-                    result=self.hand_play.insurance_result,
-                    text="I",
-                    center=(
-                        self.center[0] - self.size[0] / 2 - self.offset[1] * 1.5,
-                        self.center[1] + self.image_height / 2,
-                    ),
-                    font_size=self.image_height * 0.2,
-                )
-            )
+        if self.frame is not None and self.active:
+            self.frame.rectangle = self.get_bounding_box()
 
     def result_str(self) -> str:
-        if not self.hand_play._is_cashed:
+        if not self.hand_play.cashed:
             return ""
         else:
             result = self.hand_play.result
@@ -356,7 +499,7 @@ class DealerHand(HandWidget):
 
     _offset = 1, 0
 
-    def _offset_position(self, n):
+    def card_position(self, n):
         offset = self.offset[0]
         if len(self.hand) > 4:
             n = n - len(self.hand) + 4
@@ -374,12 +517,49 @@ class DealerHand(HandWidget):
 
 
 class PlayArea(Widget):
-    playerhands: list[HandPlay] = []
+    """
+    Table with dealer's and players' hands.
+
+    Hand widgets are retained between updates and matched to hands by snapshot keys,
+    only widgets of new hands are created. Hand positions are cached per number of hands
+    and widget geometry.
+    """
+
+    playerhands: list[HandPlaySnapshot] = []
     dealercards: Hand = Hand()
+    dealer_key: int = 0
     felt_image = StringProperty(f"{root_dir}/felt.jpg")
+    # plain color is drawn until loaded, see: `load_felt`
+    felt_texture = ObjectProperty(None, allownone=True)
     size_shrinker = 1
 
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self._dealer_widget: DealerHand | None = None
+        self._dealer_widget_key = 0
+        self._hand_widgets: dict[int, PlayerHand] = {}
+        self._layout: dict[tuple[float, ...], Layout] = {}
+
+    def load_felt(self, callback: Callable[[], None] | None = None) -> None:
+        """
+        Load felt image in the background, `callback` is called once it's loaded or
+        failed to load. Table stays plain color without the image.
+        """
+
+        def loaded(texture: Texture | None) -> None:
+            self.felt_texture = texture
+            if callback is not None:
+                callback()
+
+        path = Path(self.felt_image)
+        if path.exists():
+            atlas.load_async(path, loaded)
+        else:
+            loaded(None)
+
     def on_size(self, *args):
+        # cached positions are valid for one size only
+        self._layout.clear()
         self.update()
 
     @property
@@ -391,26 +571,53 @@ class PlayArea(Widget):
         )
 
     def update(self, *args):
-        self.clear_widgets()
-        self.dealer_hand()
-        self.player_hands()
+        dealer_position, player_positions = self.layout(len(self.playerhands))
+        self.dealer_hand(dealer_position)
+        self.player_hands(player_positions)
 
-    def player_hands(self):
-        if len(self.playerhands) == 0:
-            return
-        for position_index, hand in zip(
-            self.get_player_position_indexes(len(self.playerhands)), self.playerhands
-        ):
-            position = self.get_position(position_index)
-            active = hand.active if len(self.playerhands) > 1 else False
-            hand_widget = PlayerHand(self.image_height, position, hand, active)
-            self.add_widget(hand_widget)
+    def layout(self, n: int) -> Layout:
+        """
+        Position of dealer's hand and positions of `n` player hands.
+        """
+        key = (n, *self.pos, *self.size)
+        if (layout := self._layout.get(key)) is None:
+            layout = self._layout[key] = (
+                self.get_position(-0.5),
+                [self.get_position(t) for t in self.get_player_position_indexes(n)],
+            )
+        return layout
 
-    def dealer_hand(self) -> None:
+    def player_hands(self, positions: list[tuple[float, float]]) -> None:
+        widgets = {}
+        for position, hand in zip(positions, self.playerhands):
+            active = hand.active if len(self.playerhands) > 1 else False
+            if (widget := self._hand_widgets.pop(hand.key, None)) is None:
+                widget = PlayerHand(self.image_height, position, hand, active)
+                self.add_widget(widget)
+            else:
+                widget.sync(self.image_height, position, active, hand)
+            widgets[hand.key] = widget
+        # widgets of hands no longer on the table (new round, split)
+        for widget in self._hand_widgets.values():
+            self.remove_widget(widget)
+        self._hand_widgets = widgets
+
+    def dealer_hand(self, position: tuple[float, float]) -> None:
+        widget = self._dealer_widget
+        if widget is not None and (
+            not self.dealercards or self._dealer_widget_key != self.dealer_key
+        ):
+            self.remove_widget(widget)
+            widget = self._dealer_widget = None
         if self.dealercards:
-            position = self.get_position(-0.5)
-            hand_widget = DealerHand(self.image_height, position, self.dealercards)
-            self.add_widget(hand_widget)
+            if widget is None:
+                self._dealer_widget = DealerHand(
+                    self.image_height, position, self.dealercards
+                )
+                self._dealer_widget_key = self.dealer_key
+                self.add_widget(self._dealer_widget)
+            else:
+                widget.sync(self.image_height, position, self.dealercards)
 
     def get_player_position_indexes(self, n: int):
         # n is number of hands to spread out
@@ -457,6 +664,13 @@ class PlayArea(Widget):
 
 
 class Screen(BoxLayout):
+    """
+    Engine runs on `worker` thread. Game events are handled on that thread: they
+    take a snapshot of the game and post it to the UI thread, where they only mark
+    screen regions as dirty. All dirty regions are redrawn once per frame (see:
+    `redraw`), so that dealing many cards at once doesn't redraw the screen for every
+    card. Player's decisions are posted back to the worker (see: `engine`).
+    """
 
     playarea = ObjectProperty()
     buttonstrip = ObjectProperty()
@@ -471,77 +685,264 @@ class Screen(BoxLayout):
     def __init__(self, config, **kwargs: Any) -> None:
         super().__init__(**kwargs)
         self.config = config
-        Hand.newCardEvent += self.update
-        DecisionHandler.newDecisionEven += self.on_decision_widget
-        Round.cashOutEvent += self.update
-        self.game = self.start()
+        self._dirty: set[str] = set()
+        self._snapshot: GameSnapshot | None = None
+        self._trigger_redraw = Clock.create_trigger(self.redraw)
+        # accessed on engine thread only
+        self._awaiting_decision = False
+        self._headless = False
+        # rule changes waiting for the round in progress to finish
+        self._pending_rules: dict[str, Any] = {}
+        # accessed on UI thread only
+        self._deal_ready = False
+        self._stop_autoplay = threading.Event()
+        self.worker = EngineWorker()
+        self.worker.start()
+        Hand.newCardEvent += self.on_new_card
+        DecisionHandler.newDecisionEven += self.on_decision
+        Round.cashOutEvent += self.on_cash_out
+        self.start()
+
+    def engine(self, task: Callable[..., Any], *args: Any) -> None:
+        """
+        Run `task` on engine thread. Once it's done, deal button is shown unless
+        engine is waiting for player's decision.
+        """
 
-    def update(self, *args):
-        cash = self.playing_player.cash  # type: ignore
-        self.playarea.dealercards = self.game.dealer.hand
-        self.playarea.playerhands = list(
-            reversed([hand_play for hand_play in self.game.round.table.hands])
-        )
-        self.count_button.count = self.game.dealer.shoe.hilo_count
-        self.cash_label.text = "${:>5,.2f}".format(cash)
-        shoe = self.game.dealer.shoe
-        self.shoe.text = (
-            f"DECKS: "
-            f"{len(shoe)/52:.1f} "
-            f"{'SHUFFLE' if shoe.will_shuffle else '({:.1f})'.format(shoe._cut_card/52)}"
-        )
-        self.bet_size.max_bet = cash
-        self.playarea.update()
+        def run() -> None:
+            task(*args)
+            if not self._awaiting_decision:
+                self.apply_rules()
+                self.show_decision(None)
 
-    def on_number_of_hands(self, hands: int) -> None:
+        self.worker.submit(run)
+
+    def change_rule(self, key: str, value: Any) -> None:
+        """
+        Change `CONFIG[key]` on engine thread, once no round is in progress (rules
+        must not change while a hand is played).
+        """
+
+        def change() -> None:
+            self._pending_rules[key] = value
+            if not self._awaiting_decision:
+                self.apply_rules()
+
+        self.worker.submit(change)
+
+    # engine thread
+
+    def apply_rules(self) -> None:
+        CONFIG.update(self._pending_rules)
+        self._pending_rules.clear()
+
+    def post(self, *regions: str) -> None:
         if self.playing_player is not None:
-            self.playing_player.number_of_hands = hands
+            self.apply(GameSnapshot.take(self.game, self.playing_player), regions)
+
+    def on_new_card(self, *args) -> None:
+        if not self._headless:
+            self.post(COUNT, SHOE, PLAYAREA)
+            self.worker.pause(CARD_DELAY)
+
+    def on_cash_out(self, *args) -> None:
+        if not self._headless:
+            self.post(CASH, PLAYAREA)
+
+    def on_decision(self, decision: DecisionHandler) -> None:
+        if decision.choices is None:
+            # decision made, round goes on until the next one or until it's over
+            self._awaiting_decision = False
+            self.clear_decision()
+        else:
+            self._awaiting_decision = True
+            self.post()
+            self.show_decision(decision, decision.choices, copy_hand(decision.hand))
+
+    # UI thread
+
+    @mainthread
+    def apply(self, snapshot: GameSnapshot, regions: tuple[str, ...]) -> None:
+        self._snapshot = snapshot
+        self.update(*regions)
+
+    def update(self, *regions: str) -> None:
+        """
+        Schedule redraw of `regions` (all regions if none given) in the next frame.
+        """
+        self._dirty.update(REGIONS.intersection(regions) or REGIONS)
+        self._trigger_redraw()
+
+    def redraw(self, *args) -> None:
+        if (snapshot := self._snapshot) is None:
+            return
+        dirty, self._dirty = self._dirty, set()
+        if CASH in dirty:
+            self.cash_label.text = "${:>5,.2f}".format(snapshot.cash)
+            self.bet_size.max_bet = snapshot.cash
+        if COUNT in dirty:
+            self.count_button.count = snapshot.count
+        if SHOE in dirty:
+            cut = (
+                "SHUFFLE"
+                if snapshot.will_shuffle
+                else f"({snapshot.cut_card / 52:.1f})"
+            )
+            self.shoe.text = f"DECKS: {snapshot.shoe_cards / 52:.1f} {cut}"
+        if PLAYAREA in dirty:
+            self.playarea.dealercards = snapshot.dealer_hand
+            self.playarea.dealer_key = snapshot.dealer_key
+            self.playarea.playerhands = list(reversed(snapshot.hands))
+            self.playarea.update()
+
+    def on_number_of_hands(self, hands: int) -> None:
+        # `game` and `playing_player` are replaced on engine thread (`new_game`), so
+        # they're looked up there
+        def set_hands() -> None:
+            if self.playing_player is not None:
+                self.playing_player.number_of_hands = hands
+
+        self.worker.submit(set_hands)
 
     def update_npc(self):
         player_config = dict(self.config["players"])
-        npcs = PlayerFactory(player_config, self.bet_size).npcs
-        assert self.playing_player
-        npcs.insert(1, self.playing_player)
-        players = [player for player in npcs if player]
-        self.game.players = players
+        npcs = PlayerFactory(player_config, self.bet_size, self.worker).npcs
+
+        def set_players() -> None:
+            # players are changed between rounds
+            assert self.playing_player
+            npcs.insert(1, self.playing_player)
+            self.game.players = [player for player in npcs if player]
+
+        self.worker.submit(set_players)
 
-    def on_decision_widget(self, decision):
+    @mainthread
+    def clear_decision(self) -> None:
+        self.buttonstrip.clear_widgets()
+
+    @mainthread
+    def show_decision(
+        self,
+        decision: DecisionHandler | None,
+        choices: PlayDecision | YesNoDecision | None = None,
+        hand: Hand | None = None,
+    ) -> None:
+        """
+        Show buttons for `decision` or deal button if it's None.
+        """
         self.buttonstrip.clear_widgets()
-        assert self.playing_player
-        if decision is None or decision.choices is None:
+        self._deal_ready = decision is None
+        if decision is None:
             self.buttonstrip.add_widget(DealButton())
             self.bet_size.disabled = False
-        elif isinstance(decision.choices, YesNoDecision):
+        elif isinstance(choices, YesNoDecision):
             self.buttonstrip.add_widget(
-                InsuranceButtons(decision, decision.choices, decision.hand)
+                InsuranceButtons(partial(self.engine, decision), choices, hand)
             )
-        elif isinstance(decision.choices, PlayDecision):
+        elif isinstance(choices, PlayDecision):
             self.bet_size.disabled = True
             self.buttonstrip.add_widget(
-                DecisionButtons(decision, decision.choices, decision.hand)
+                DecisionButtons(partial(self.engine, decision), choices, hand)
             )
         self.update()
 
     def play(self, *args, **kwargs):
-        self.game.play()
+        self._deal_ready = False
+        self.buttonstrip.clear_widgets()
+        self.engine(lambda: self.game.play())
+
+    def autoplay(self, *args) -> None:
+        """
+        Play number of rounds set in settings with bot strategy for player's hands,
+        without drawing them. Only possible between rounds.
+        """
+        strategy_cls = PlayerFactory._translate_strategy_config(
+            self.config["players"]["autoplay_strategy"]
+        )
+        if not self._deal_ready or strategy_cls is None:
+            return
+        rounds = int(self.config["players"]["autoplay_rounds"])
+        progress = AutoplayProgress(rounds, self._stop_autoplay.set)
+        self._deal_ready = False
+        self._stop_autoplay.clear()
+        self.bet_size.disabled = True
+        self.buttonstrip.clear_widgets()
+        self.buttonstrip.add_widget(progress)
+        self.worker.submit(
+            self.run_autoplay,
+            strategy_cls(),
+            strategies.FixedBettingStrategy(self.bet_size.value),
+            rounds,
+            progress,
+        )
 
-    def start(self, *args) -> Game:
+    def run_autoplay(
+        self,
+        strategy: GameStrategy,
+        betting_strategy: BettingStrategy,
+        rounds: int,
+        progress: AutoplayProgress,
+    ) -> None:
+        # engine thread
+        player = self.playing_player
+        assert player is not None
+        human = player.strategy, player.betting_strategy
+        player.strategy, player.betting_strategy = strategy, betting_strategy
+        self._headless = True
+        self.worker.paced = False
+        stats = RunningStats()
+        next_report = time.monotonic()
+        try:
+            while stats.n < rounds and not self._stop_autoplay.is_set():
+                if player.cash < CONFIG["table_limits"][0]:
+                    break
+                cash = player.cash
+                self.game.play()
+                stats.push(player.cash - cash)
+                if time.monotonic() >= next_report:
+                    progress.report(stats.n, player.cash, stats.mean, stats.se)
+                    next_report += AUTOPLAY_REPORT_INTERVAL
+        finally:
+            player.strategy, player.betting_strategy = human
+            self._headless = False
+            self.worker.paced = True
+        progress.report(stats.n, player.cash, stats.mean, stats.se)
+        # table as left by the last round
+        self.post()
+        self.finish_autoplay(progress)
+
+    @mainthread
+    def finish_autoplay(self, progress: AutoplayProgress) -> None:
+        # back to interactive play, results stay next to deal button
+        progress.finish()
+        self.buttonstrip.clear_widgets()
+        self.buttonstrip.add_widget(progress)
+        self.buttonstrip.add_widget(DealButton())
+        self._deal_ready = True
+        self.bet_size.disabled = False
+        self.update()
+
+    def start(self, *args) -> None:
+        self._stop_autoplay.set()
         player_config = dict(self.config["players"])
         assert player_config is not None
         self.bet_size.reset()
-        players = PlayerFactory(player_config, self.bet_size).players
+        players = PlayerFactory(player_config, self.bet_size, self.worker).players
         if len(players) == 1 and players[0].number_of_hands == 0:
             players[0].number_of_hands = 1
-        self.game = Game(players)
+        self.buttonstrip.clear_widgets()
+        self.engine(self.new_game, players)
 
+    def new_game(self, players: list[Player]) -> None:
+        # engine thread, any round in progress is abandoned
+        self.game = Game(players)
         playing_player = [
             player for player in self.game.players if player.strategy is None
         ]
         assert len(playing_player) == 1
         self.playing_player = playing_player[0]
-        # initialize buttons
-        self.on_decision_widget(None)
-        return self.game
+        self._awaiting_decision = False
+        self.post()
 
 
 @dataclass
@@ -552,6 +953,8 @@ class PlayerFactory:
 
     config: dict[str, str]
     betting_strategy: BettingStrategy
+    # if given, npcs pause before every decision (played on this worker)
+    worker: EngineWorker | None = None
 
     @property
     def players(self):
@@ -582,9 +985,12 @@ class PlayerFactory:
             assert strategy_str is not None
             strategy_cls = self._translate_strategy_config(strategy_str)
             if strategy_cls is not None:
+                strategy = strategy_cls()
+                if self.worker is not None:
+                    strategy = PacedStrategy(strategy, self.worker)
                 npc_players.append(
                     Player(
-                        strategy_cls(),
+                        strategy,
                         strategies.FixedBettingStrategy(
                             max(
                                 round(CONFIG["player_cash"] * 0.025, 0),
@@ -646,18 +1052,54 @@ class FractionSettingOptions(SettingOptions):
         self.popup.dismiss()
 
 
+@cache
+def settings_json(panel: str) -> str:
+    with open(root_dir / f"settings_{panel}.json", "rt") as f:
+        return f.read()
+
+
 rules_types = {key: type(value) for key, value in CONFIG.items()}
 function_dict = {int: "getint", float: "getfloat", bool: "getboolean"}
 
 
 class BlackjackApp(App):
+    """
+    Only what's needed for the first frame is done before it's drawn. Card and felt
+    images are loaded in the background (cards needed before that are loaded on
+    their own), settings panels are built when first opened. Startup phases are
+    logged, see: `startup`.
+    """
 
     def build(self):
+        timer.mark(startup.KV)
         self.settings_cls = SettingsWithSidebar
         self.use_kivy_settings = False
         self.screen = Screen(self.config)
+        pending = ["cards", "felt"]
+
+        def loaded(asset: str) -> None:
+            pending.remove(asset)
+            if not pending:
+                self.startup_phase(startup.ASSETS)
+
+        atlas.preload(partial(loaded, "cards"))
+        self.screen.playarea.load_felt(partial(loaded, "felt"))
+        self.startup_phase(startup.BUILD)
         return self.screen
 
+    def on_start(self):
+        # called before the first frame is drawn, scheduled callback runs after it
+        Clock.schedule_once(lambda *args: self.startup_phase(startup.FIRST_FRAME))
+
+    def startup_phase(self, phase: str) -> None:
+        Logger.info(f"Startup: {phase} done after {timer.mark(phase):.3f}s")
+        if timer.report_requested and timer.done(startup.FIRST_FRAME, startup.ASSETS):
+            print(timer.report(), flush=True)
+            self.stop()
+
+    def on_stop(self):
+        self.screen.worker.stop()
+
     def build_config(self, config):
         config.setdefaults(
             "players",
@@ -665,6 +1107,8 @@ class BlackjackApp(App):
                 "number_of_hands": 1,
                 "r_strategy": None,
                 "l_strategy": None,
+                "autoplay_rounds": 10_000,
+                "autoplay_strategy": "MimickDealer",
             },
         )
         config.setdefaults("rules", CONFIG.copy())
@@ -672,6 +1116,7 @@ class BlackjackApp(App):
     def load_config(self):
         config = super().load_config()
         self.update_config(config)
+        timer.mark(startup.CONFIG)
         return config
 
     def update_config(self, config):
@@ -683,11 +1128,8 @@ class BlackjackApp(App):
         settings.register_type("fraction_options", FractionSettingOptions)
         settings.register_type("positive_numeric", PositiveSettingNumeric)
 
-        with open(root_dir / "settings_players.json", "rt") as player_json:
-            settings.add_json_panel("Players", self.config, data=player_json.read())
-
-        with open(root_dir / "settings_rules.json", "rt") as rules_json:
-            settings.add_json_panel("Rules", self.config, data=rules_json.read())
+        settings.add_json_panel("Players", self.config, data=settings_json("players"))
+        settings.add_json_panel("Rules", self.config, data=settings_json("rules"))
 
     def on_config_change(self, config, section, key, value):
         if section == "rules":
@@ -696,11 +1138,11 @@ class BlackjackApp(App):
             result = callable("rules", key)  # type: ignore
             if isinstance(result, str):
                 result = eval(result)
-            CONFIG[key] = result
+            self.screen.change_rule(key, result)
         elif section == "players":
             if key == "number_of_hands":
                 self.screen.on_number_of_hands(int(value))  # type: ignore
-            else:
+            elif key in ("l_strategy", "r_strategy"):
                 self.screen.update_npc()
 
 
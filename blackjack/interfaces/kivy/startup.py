@@ -0,0 +1,53 @@
+"""
+Startup phase timing of the Kivy app.
+
+`main` imports this module before anything else, every phase is timed from that
+moment. With environment variable `BLACKJACK_STARTUP_REPORT` set, the app prints the
+timings as a line of JSON once it's interactive and all assets are loaded, then
+exits (used by `benchmarks.kivy_startup`).
+
+Doesn't import kivy, so that kivy import time is measured too.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+
+REPORT_ENV = "BLACKJACK_STARTUP_REPORT"
+
+# phases in order
+IMPORTS = "imports"
+CONFIG = "config"
+KV = "kv"
+BUILD = "build"
+FIRST_FRAME = "first_frame"
+ASSETS = "assets"
+
+
+class StartupTimer:
+    """
+    Seconds from import of this module to the end of every phase.
+    """
+
+    def __init__(self) -> None:
+        self.start = time.perf_counter()
+        self.phases: dict[str, float] = {}
+
+    def mark(self, phase: str) -> float:
+        elapsed = self.phases[phase] = time.perf_counter() - self.start
+        return elapsed
+
+    def done(self, *phases: str) -> bool:
+        return all(phase in self.phases for phase in phases)
+
+    @property
+    def report_requested(self) -> bool:
+        return bool(os.environ.get(REPORT_ENV))
+
+    def report(self) -> str:
+        return json.dumps(self.phases)
+
+
+timer = StartupTimer()
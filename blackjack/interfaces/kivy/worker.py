@@ -0,0 +1,170 @@
+"""
+Engine thread for the Kivy interface.
+
+All engine code (dealing, bot seats, dealer play, human decisions) runs on a single
+`EngineWorker` thread. The UI thread never touches engine objects: it renders
+immutable snapshots taken on the engine thread (`GameSnapshot`) and posts human
+decisions back as tasks, so input latency doesn't depend on how much the engine has
+to do.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable
+
+from kivy.logger import Logger
+
+from blackjack.engine import (
+    Game,
+    GameStrategy,
+    Hand,
+    HandPlay,
+    PlayDecision,
+    Player,
+    YesNoDecision,
+)
+
+# pause after every card dealt and every bot decision, so that play can be followed
+CARD_DELAY = 0.15
+NPC_DELAY = 0.3
+
+
+def copy_hand(hand: Hand) -> Hand:
+    copy = Hand(*hand)
+    copy._no_blackjack = hand._no_blackjack
+    return copy
+
+
+@dataclass(frozen=True, slots=True)
+class HandPlaySnapshot:
+    """
+    State of a `HandPlay` needed to draw it. `key` identifies the hand play across
+    snapshots.
+    """
+
+    # only identity of `source` is used, keeping it alive prevents reuse of its id
+    source: HandPlay
+    hand: Hand
+    betsize: float
+    doubled: bool
+    active: bool
+    insurance: float
+    insurance_result: int
+    result: float
+    cashed: bool
+
+    @classmethod
+    def take(cls, hand_play: HandPlay) -> HandPlaySnapshot:
+        return cls(
+            hand_play,
+            copy_hand(hand_play.hand),
+            hand_play.betsize,
+            hand_play.doubled,
+            hand_play.active,
+            hand_play.insurance,
+            hand_play.insurance_result,
+            hand_play.result,
+            hand_play._is_cashed,
+        )
+
+    @property
+    def key(self) -> int:
+        return id(self.source)
+
+
+@dataclass(frozen=True, slots=True)
+class GameSnapshot:
+    """
+    State of the table, shoe and cash of the human player.
+    """
+
+    dealer_source: Hand
+    dealer_hand: Hand
+    hands: tuple[HandPlaySnapshot, ...]
+    cash: float
+    count: int
+    shoe_cards: int
+    will_shuffle: bool
+    cut_card: int
+
+    @classmethod
+    def take(cls, game: Game, player: Player) -> GameSnapshot:
+        shoe = game.dealer.shoe
+        return cls(
+            game.dealer.hand,
+            copy_hand(game.dealer.hand),
+            tuple(map(HandPlaySnapshot.take, game.round.table.hands)),
+            player.cash,
+            shoe.hilo_count,
+            len(shoe),
+            shoe.will_shuffle,
+            shoe._cut_card,
+        )
+
+    @property
+    def dealer_key(self) -> int:
+        return id(self.dealer_source)
+
+
+class EngineWorker(threading.Thread):
+    """
+    Executes submitted tasks one by one on a background thread.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(name="engine", daemon=True)
+        self.tasks: queue.SimpleQueue[Callable[[], Any] | None] = queue.SimpleQueue()
+        # pacing is switched off e.g. for headless play
+        self.paced = True
+
+    def submit(self, task: Callable[..., Any], *args: Any) -> None:
+        self.tasks.put(partial(task, *args))
+
+    def stop(self) -> None:
+        self.tasks.put(None)
+
+    def run(self) -> None:
+        while (task := self.tasks.get()) is not None:
+            try:
+                task()
+            except Exception:
+                # keep the thread alive, game can be restarted from the UI
+                Logger.exception("Engine: task failed")
+
+    @property
+    def is_current(self) -> bool:
+        return threading.current_thread() is self
+
+    def pause(self, seconds: float) -> None:
+        """
+        Sleep if called on engine thread with pacing on.
+        """
+        if self.paced and self.is_current:
+            time.sleep(seconds)
+
+
+class PacedStrategy(GameStrategy):
+    """
+    Proxy pausing before every decision of a bot seat.
+    """
+
+    def __init__(self, strategy: GameStrategy, worker: EngineWorker) -> None:
+        self.strategy = strategy
+        self.worker = worker
+
+    def play(
+        self, dealer_hand: Hand, player_hand: Hand, choices: PlayDecision
+    ) -> PlayDecision:
+        self.worker.pause(NPC_DELAY)
+        return self.strategy.play(dealer_hand, player_hand, choices)
+
+    def insurance(self, dealer_hand: Hand, player_hand: Hand) -> YesNoDecision:
+        return self.strategy.insurance(dealer_hand, player_hand)
+
+    def __repr__(self) -> str:
+        return repr(self.strategy)
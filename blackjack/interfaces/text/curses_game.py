@@ -0,0 +1,252 @@
+"""
+Full screen terminal frontend.
+
+The screen is a fixed set of cells (cash, count, shoe, dealer's hand, one line per
+player's hand, status and prompt). Every redraw builds the text of all cells, but only
+cells whose text changed since the last redraw are written, so a long session over a
+slow connection sends little more than the cards dealt. The screen is redrawn only
+when player's input is needed and after every round, not for every card.
+
+Decisions are single keys: mnemonics of `DecisionTranslator` (Enter for stand), Y/N
+for insurance, +/- and Enter for bets, Q to quit.
+"""
+
+from __future__ import annotations
+
+import curses
+import locale
+import sys
+from typing import Any, Protocol
+
+from blackjack.engine import (
+    CONFIG,
+    Game,
+    Hand,
+    HandPlay,
+    PlayDecision,
+    Player,
+    YesNoDecision,
+)
+from blackjack.interfaces.text.text_game import DecisionTranslator
+from blackjack.strategies import BettingStrategy, GameStrategy
+
+ENTER = ("\n", "\r", "KEY_ENTER")
+
+# (row, column) of a cell, negative rows count from the bottom of the screen
+type Cell = tuple[int, int]
+
+CASH: Cell = (0, 0)
+COUNT: Cell = (0, 24)
+SHOE: Cell = (0, 38)
+DEALER: Cell = (2, 0)
+FIRST_HAND_ROW = 4
+STATUS: Cell = (-2, 0)
+PROMPT: Cell = (-1, 0)
+
+# width of cells, cells not listed span to the end of the line
+WIDTHS = {CASH: 22, COUNT: 12}
+
+
+class Window(Protocol):
+    """
+    Part of `curses.window` used by `CursesView`.
+    """
+
+    def getmaxyx(self) -> tuple[int, int]: ...
+
+    def addstr(self, y: int, x: int, text: str) -> None: ...
+
+    def getkey(self) -> str: ...
+
+    def clear(self) -> None: ...
+
+    def refresh(self) -> None: ...
+
+
+class CursesView:
+    """
+    Draws state of `game` as seen by `player` and reads keys.
+    """
+
+    def __init__(self, window: Window) -> None:
+        self.window = window
+        self.game: Game | None = None
+        self.player: Player | None = None
+        # text of cells as last drawn
+        self._drawn: dict[Cell, str] = {}
+
+    def cells(
+        self, active: Hand | None = None, status: str = "", prompt: str = ""
+    ) -> dict[Cell, str]:
+        assert self.game is not None and self.player is not None
+        shoe = self.game.dealer.shoe
+        dealer_hand = self.game.dealer.hand
+        cells = {
+            CASH: f"CASH ${self.player.cash:,.2f}",
+            COUNT: f"COUNT {shoe.hilo_count:+d}",
+            SHOE: f"DECKS {len(shoe) / 52:.1f}"
+            + (" SHUFFLE" if shoe.will_shuffle else ""),
+            DEALER: (
+                f"Dealer: {dealer_hand} ({dealer_hand.dealer_value_str()})"
+                if dealer_hand
+                else "Dealer:"
+            ),
+            STATUS: status,
+            PROMPT: prompt,
+        }
+        for i, hand_play in enumerate(self.game.round.table.hands):
+            cells[FIRST_HAND_ROW + i, 0] = self.hand_str(
+                hand_play, hand_play.hand is active
+            )
+        return cells
+
+    @staticmethod
+    def hand_str(hand_play: HandPlay, active: bool = False) -> str:
+        hand = hand_play.hand
+        text = (
+            f"{'>' if active else ' '} {hand} ({hand.value_str()})"
+            f"  bet ${hand_play.betsize:,.0f}"
+        )
+        if hand_play.doubled:
+            text += " doubled"
+        if hand_play.insurance:
+            text += " insured"
+        if hand_play._is_cashed:
+            result = hand_play.result
+            text += (
+                f"  WIN +{result:,.2f}"
+                if result > 0
+                else f"  LOSS {result:,.2f}" if result < 0 else "  PUSH"
+            )
+        return text
+
+    def render(self, **kwargs: Any) -> None:
+        """
+        Redraw cells that changed, see `cells` for arguments.
+        """
+        self.draw(self.cells(**kwargs))
+
+    def draw(self, cells: dict[Cell, str]) -> None:
+        height, width = self.window.getmaxyx()
+        # cells no longer shown (e.g. fewer hands than in last round) are blanked
+        for cell in self._drawn.keys() - cells.keys():
+            cells[cell] = ""
+        for (row, column), text in cells.items():
+            if self._drawn.get((row, column)) == text:
+                continue
+            self._drawn[row, column] = text
+            y = row if row >= 0 else height + row
+            # bottom right corner can't be written to
+            span = WIDTHS.get((row, column), width - column - 1)
+            if 0 <= y < height and column < width - 1:
+                self.window.addstr(y, column, text.ljust(span)[: width - column - 1])
+        self.window.refresh()
+
+    def invalidate(self) -> None:
+        """
+        Force full redraw (e.g. after terminal resize).
+        """
+        self._drawn.clear()
+        self.window.clear()
+
+    def read_key(self, keys: list[str], default: str | None = None) -> str:
+        """
+        Wait for one of `keys` (case insensitive), Enter means `default`.
+        """
+        while True:
+            key = self.window.getkey()
+            if key == "KEY_RESIZE":
+                cells = {cell: text for cell, text in self._drawn.items() if text}
+                self.invalidate()
+                self.draw(cells)
+            elif key in ENTER and default is not None:
+                return default
+            elif key.upper() in keys:
+                return key.upper()
+
+
+class CursesGameStrategy(GameStrategy):
+
+    def __init__(self, view: CursesView) -> None:
+        self.view = view
+
+    def play(
+        self, dealer_hand: Hand, player_hand: Hand, choices: PlayDecision
+    ) -> PlayDecision:
+        translator = DecisionTranslator(choices)
+        self.view.render(
+            active=player_hand,
+            prompt=f"{translator.full_choices_str()} or [Enter] for Stand",
+        )
+        return translator.str_decision(
+            self.view.read_key(translator.str_choices(), "S")  # type: ignore
+        )
+
+    def insurance(self, dealer_hand: Hand, player_hand: Hand) -> YesNoDecision:
+        question = "EVEN MONEY" if player_hand.is_blackjack() else "INSURANCE"
+        self.view.render(active=player_hand, prompt=f"{question} (Y/N)? [Enter] for N")
+        return (
+            YesNoDecision.YES
+            if self.view.read_key(["Y", "N"], "N") == "Y"
+            else YesNoDecision.NO
+        )
+
+
+class CursesBettingStrategy(BettingStrategy):
+    """
+    Bet is changed by table minimum with +/-, Enter deals.
+    """
+
+    def __init__(self, view: CursesView, betsize: float) -> None:
+        self.view = view
+        self.betsize = betsize
+
+    def bet(self, *args: Any, **kwargs: Any) -> float:
+        low, high = CONFIG["table_limits"]
+        status = ""
+        while True:
+            self.view.render(
+                status=status,
+                prompt=f"BET ${self.betsize:,.0f}: [+/-] change, [Enter] deal, [Q]uit",
+            )
+            key = self.view.read_key(["+", "-", "Q"], "")
+            status = ""
+            if key == "Q":
+                sys.exit()
+            elif key == "+":
+                self.betsize = min(self.betsize + low, high)
+            elif key == "-":
+                self.betsize = max(self.betsize - low, low)
+            elif self.view.player is not None and self.betsize > self.view.player.cash:
+                status = "Not enough cash for this bet."
+            else:
+                return self.betsize
+
+
+def main(window: Any) -> None:
+    try:
+        curses.curs_set(0)
+    except curses.error:
+        # invisible cursor not supported by terminal
+        pass
+    view = CursesView(window)
+    player = Player(
+        CursesGameStrategy(view),
+        CursesBettingStrategy(view, CONFIG["table_limits"][0]),
+    )
+    view.game, view.player = Game([player]), player
+    # results of a round stay on screen until the next bet is placed
+    while player.cash >= CONFIG["table_limits"][0]:
+        view.game.play()
+    view.render(status="Not enough cash, game over.", prompt="[Q]uit")
+    view.read_key(["Q"])
+
+
+def run():
+    # suit symbols are written in locale's encoding
+    locale.setlocale(locale.LC_ALL, "")
+    curses.wrapper(main)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,263 @@
+"""
+Monte Carlo rollout strategy.
+
+`RolloutStrategy` estimates the value of every allowed `PlayDecision` by playing out
+the rest of the hand many times with cards drawn from what's left in the shoe, and
+picks the best one. It needs no chart, so it's a reference bot for rule sets without
+published basic strategy.
+
+Rollouts don't touch the engine: cards are plain ints (ace is 1) sampled in batches,
+one sample of the remaining cards is shared by all decisions (dealer draws from its
+front, player from its back), so differences between decisions aren't swamped by
+noise and dealer's hand is played only once per sample. Dealer has no hole card in
+this game, so its second card is just another unknown card in the shoe.
+
+After the decision being evaluated, player's hands are finished with a simple fixed
+policy (`player_hits`, `player_doubles` after a split) and split hands are never
+resplit, so estimates of hit and split are a little pessimistic.
+"""
+
+from __future__ import annotations
+
+import random
+from time import perf_counter
+
+from .engine import (
+    BLACKJACK,
+    BUST,
+    CONFIG,
+    DECK,
+    GameStrategy,
+    Hand,
+    InfiniteShoe,
+    PlayDecision,
+    Shoe,
+    YesNoDecision,
+)
+
+# cards drawn per rollout, enough for dealer and two split hands in practice
+SAMPLE = 24
+
+# evaluation order, first one wins ties
+DECISIONS = (
+    PlayDecision.STAND,
+    PlayDecision.HIT,
+    PlayDecision.DOUBLE,
+    PlayDecision.SPLIT,
+    PlayDecision.SURRENDER,
+)
+
+
+def total(hard: int, ace: bool) -> int:
+    return hard + 10 if ace and hard <= 11 else hard
+
+
+def player_hits(hard: int, ace: bool, up: int) -> bool:
+    """
+    Policy finishing player's hands in rollouts (close to basic strategy without
+    doubles and splits).
+    """
+    if ace and hard <= 11:
+        soft = hard + 10
+        return soft < 18 or (soft == 18 and (up >= 9 or up == 1))
+    elif hard <= 11:
+        return True
+    elif hard >= 17:
+        return False
+    elif 2 <= up <= 6:
+        return hard == 12 and up <= 3
+    else:
+        return True
+
+
+def player_doubles(hard: int, ace: bool, up: int) -> bool:
+    """
+    Policy doubling split hands in rollouts, hard 9 to 11 only.
+    """
+    if ace:
+        return False
+    elif hard == 11:
+        return up != 1
+    elif hard == 10:
+        return 2 <= up <= 9
+    else:
+        return hard == 9 and 3 <= up <= 6
+
+
+def dealer_result(cards: list[int], up: int, h17: bool) -> tuple[int, int]:
+    """
+    Play dealer's hand from the front of `cards`, return its score code (see:
+    `Hand.score`) and index of the first unused card.
+    """
+    hole = cards[0]
+    hard, ace = up + hole, up == 1 or hole == 1
+    if ace and hard == 11:
+        return BLACKJACK, 1
+    i = 1
+    while (value := total(hard, ace)) < 17 or (h17 and value == 17 and hard == 7):
+        if i == len(cards):
+            break
+        card = cards[i]
+        hard += card
+        ace = ace or card == 1
+        i += 1
+    return (BUST if value > 21 else value), i
+
+
+def settle(value: int, dealer: int) -> int:
+    # any player's total beats a busted dealer, nothing beats dealer's blackjack
+    # (player can't have one when asked for a decision)
+    if value > 21 or value < dealer:
+        return -1
+    elif value > dealer:
+        return 1
+    else:
+        return 0
+
+
+class RolloutStrategy(GameStrategy):
+    """
+    Play every decision with the highest estimated value.
+
+    `shoe` is the game's shoe (`game.dealer.shoe`), cards are drawn from what's left
+    in it; without a shoe (or with an `InfiniteShoe`) every card is drawn from a
+    single deck. Strategies created by name get the game's shoe from
+    `simulation.make_game`. Each decision gets up to `rollouts` rollouts and
+    `time_budget` seconds, whichever runs out first, checked after every `batch`
+    rollouts. Can't be compiled (see: `compiler`).
+    """
+
+    def __init__(
+        self,
+        shoe: Shoe | None = None,
+        rollouts: int | None = 2_000,
+        time_budget: float | None = None,
+        batch: int = 100,
+    ) -> None:
+        if rollouts is None and time_budget is None:
+            raise ValueError("Either rollouts or time_budget required")
+        self.shoe = shoe
+        self.rollouts = rollouts
+        self.time_budget = time_budget
+        self.batch = batch
+
+    def cards(self) -> tuple[list[int], bool]:
+        """
+        Values of cards that can be dealt and whether they're drawn with
+        replacement.
+        """
+        if self.shoe is None or isinstance(self.shoe, InfiniteShoe):
+            return [card.value for card in DECK], True
+        else:
+            return [card.value for card in self.shoe], False
+
+    def estimate(
+        self, dealer_hand: Hand, player_hand: Hand, choices: PlayDecision
+    ) -> dict[PlayDecision, float]:
+        """
+        Estimated value of every decision in `choices` in units of the bet.
+        """
+        if not choices & ~PlayDecision.SURRENDER:
+            return {PlayDecision.SURRENDER: -0.5}
+        cards, infinite = self.cards()
+        k = min(SAMPLE, len(cards))
+        draw = random.choices if infinite else random.sample
+        up = dealer_hand[0].value
+        h17 = CONFIG["dealer_h17"]
+        hard, ace = player_hand.hard_value, player_hand._has_ace()
+        pair = player_hand[0].value
+        split_aces_done = pair == 1 and CONFIG["single_card_on_split_aces"]
+        restrictions = CONFIG["double_restrictions"]
+        double_after_split = CONFIG["double_after_split"]
+        hit = PlayDecision.HIT in choices
+        double = PlayDecision.DOUBLE in choices
+        split = PlayDecision.SPLIT in choices
+
+        # sums of results for stand, hit, double, split
+        stand_sum = hit_sum = double_sum = split_sum = 0
+        n = 0
+        start = perf_counter()
+        while True:
+            for _ in range(self.batch):
+                sample = draw(cards, k=k)
+                dealer, low = dealer_result(sample, up, h17)
+                stand_sum += settle(total(hard, ace), dealer)
+                # player draws from the back of the sample, down to `low`
+                j = k - 1
+                if double:
+                    # no card left only in a nearly empty shoe
+                    card = sample[j] if j >= low else 0
+                    double_sum += 2 * settle(
+                        total(hard + card, ace or card == 1), dealer
+                    )
+                if hit:
+                    h, a, i = hard, ace, j
+                    while i >= low:
+                        card = sample[i]
+                        h += card
+                        a = a or card == 1
+                        i -= 1
+                        if not player_hits(h, a, up):
+                            break
+                    hit_sum += settle(total(h, a), dealer)
+                if split:
+                    i = j
+                    for _hand in range(2):
+                        h, a, stake = pair, pair == 1, 1
+                        while i >= low:
+                            card = sample[i]
+                            h += card
+                            a = a or card == 1
+                            i -= 1
+                            if split_aces_done or stake == 2:
+                                break
+                            elif (
+                                h == pair + card
+                                and double_after_split
+                                and (not restrictions or h in restrictions)
+                                and player_doubles(h, a, up)
+                            ):
+                                stake = 2
+                            elif not player_hits(h, a, up):
+                                break
+                        split_sum += stake * settle(total(h, a), dealer)
+            n += self.batch
+            if (self.rollouts is not None and n >= self.rollouts) or (
+                self.time_budget is not None
+                and perf_counter() - start >= self.time_budget
+            ):
+                break
+
+        sums = {
+            PlayDecision.STAND: stand_sum,
+            PlayDecision.HIT: hit_sum,
+            PlayDecision.DOUBLE: double_sum,
+            PlayDecision.SPLIT: split_sum,
+            # half of the bet is returned right away
+            PlayDecision.SURRENDER: -0.5 * n,
+        }
+        return {
+            decision: sums[decision] / n
+            for decision in DECISIONS
+            if decision in choices
+        }
+
+    def play(
+        self, dealer_hand: Hand, player_hand: Hand, choices: PlayDecision
+    ) -> PlayDecision:
+        if len(choices) == 1:
+            return choices
+        estimates = self.estimate(dealer_hand, player_hand, choices)
+        return max(estimates, key=estimates.__getitem__)
+
+    def insurance(self, dealer_hand: Hand, player_hand: Hand) -> YesNoDecision:
+        # insurance pays 2:1, so it's worth it if more than a third of cards are tens
+        cards, _ = self.cards()
+        tens = cards.count(10)
+        return YesNoDecision.YES if 3 * tens > len(cards) else YesNoDecision.NO
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__qualname__}(rollouts={self.rollouts}, "
+            f"time_budget={self.time_budget})"
+        )
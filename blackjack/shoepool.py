@@ -0,0 +1,279 @@
+"""
+Pre-shuffled shoes stored on disk, so that different strategies can be compared on
+exactly the same card sequences (common random numbers).
+
+Pool file format (little-endian):
+
+    header: magic b"BJSP", version (u16), decks (u16), entries (u32)
+    entry:  cut card position (u16), decks * 52 card indexes into `DECK` (u8 each)
+
+File is memory-mapped, so pools much larger than available memory can be used.
+
+Every contender plays the same pool entries and results are compared entry by
+entry, so variance of the difference is lower than with independent runs. By default
+every round is dealt from a fresh entry (`per_round`): contenders taking different
+numbers of cards would otherwise get different cards for the rest of the shoe, which
+wastes most of the benefit of pairing.
+
+Usage:
+
+    python -m blackjack.shoepool generate pool.bin --entries 10000 --decks 6
+    python -m blackjack.shoepool compare pool.bin MimickDealer StayOnEleven
+"""
+
+from __future__ import annotations
+
+import argparse
+import mmap
+import random
+import struct
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from .engine import CONFIG, DECK, Dealer, Game, Player, Shoe
+from .simulation import RunningStats, Seat, bind_shoe, seeded
+
+MAGIC = b"BJSP"
+VERSION = 1
+HEADER = struct.Struct("<4sHHI")
+CUT = struct.Struct("<H")
+
+
+def write_pool(
+    path: Path, entries: int, decks: int | None = None, seed: int | None = None
+) -> None:
+    """
+    Write `entries` shoes shuffled with current `CONFIG` (number of decks can be
+    overridden) to a new pool file. Shoes are shuffled with their own random
+    generator seeded with `seed`, state of `random` is left alone.
+    """
+    decks = decks or CONFIG["number_of_decks"]
+    rng = random.Random(seed)
+    cards = list(range(len(DECK))) * decks
+    # cut card is placed like `Shoe.cut_card_position` does
+    penetration = CONFIG["penetration"]
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, decks, entries))
+        for _ in range(entries):
+            rng.shuffle(cards)
+            cut = rng.randint(100 - penetration - 5, 100 - penetration + 5)
+            f.write(CUT.pack(int(cut * len(cards) / 100)))
+            f.write(bytes(cards))
+
+
+class ShoePool:
+    """
+    Read-only view of a pool file.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < HEADER.size:
+            self.close()
+            raise ValueError(f"{path} is not a shoe pool file")
+        magic, version, self.decks, self.entries = HEADER.unpack_from(self._mmap)
+        self.cards = self.decks * 52
+        self.entry_size = CUT.size + self.cards
+        if (
+            magic != MAGIC
+            or version != VERSION
+            or len(self._mmap) != HEADER.size + self.entries * self.entry_size
+        ):
+            self.close()
+            raise ValueError(f"{path} is not a valid shoe pool file")
+
+    def __len__(self) -> int:
+        return self.entries
+
+    def entry(self, k: int) -> tuple[int, bytes]:
+        """
+        Cut card position and card indexes of entry `k`.
+        """
+        if not 0 <= k < self.entries:
+            raise IndexError(f"Pool has {self.entries} entries, no entry {k}")
+        offset = HEADER.size + k * self.entry_size
+        (cut,) = CUT.unpack_from(self._mmap, offset)
+        return cut, self._mmap[offset + CUT.size : offset + self.entry_size]
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    def __enter__(self) -> ShoePool:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class PoolShoe(Shoe):
+    """
+    Shoe dealing pool entries in order, starting from entry `k`. Every shuffle loads
+    the next entry; after the last one, pool starts over from entry 0.
+
+    If `per_round`, shoe is reshuffled (next entry loaded) before every round that
+    would otherwise be dealt from an entry already used.
+    """
+
+    def __init__(self, pool: ShoePool, k: int = 0, per_round: bool = False):
+        self.pool = pool
+        # entry loaded by the next shuffle
+        self.k = k
+        self.per_round = per_round
+        super().__init__(pool.decks)
+
+    @property
+    def will_shuffle(self) -> bool:
+        # entry just loaded (e.g. entry `k` on construction) is dealt before the next
+        return len(self) < self._cut_card or (
+            self.per_round and len(self) < self.pool.cards
+        )
+
+    def shuffle(self) -> None:
+        cut, cards = self.pool.entry(self.k % len(self.pool))
+        self.k += 1
+        self[:] = map(DECK.__getitem__, cards)
+        self.hilo_count = 0
+        self._cut_card = cut
+        if self._undo is not None:
+            self._undo = []
+
+
+@dataclass
+class ContenderResult:
+    """
+    Results of one contender: money won per pool entry and per round, and paired
+    difference to the baseline (first contender) per pool entry.
+    """
+
+    name: str
+    entry_results: RunningStats = field(default_factory=RunningStats)
+    rounds: int = 0
+    total: float = 0.0
+    # difference to baseline, per pool entry
+    diff: RunningStats = field(default_factory=RunningStats)
+
+    @property
+    def ev(self) -> float:
+        return self.total / self.rounds if self.rounds else 0.0
+
+
+def play_entry(
+    pool: ShoePool, k: int, player: Player, per_round: bool = True
+) -> tuple[float, int]:
+    """
+    Play pool entry `k` until the shoe is due to be reshuffled (after one round if
+    `per_round`). Return money won by `player` and number of rounds played.
+    """
+    shoe = PoolShoe(pool, k, per_round)
+    bind_shoe([player], shoe)
+    game = Game([player], Dealer(shoe=shoe))
+    total = 0.0
+    rounds = 0
+    while True:
+        game.play()
+        total += sum(hand_play.result for hand_play in game.round.table.hands)
+        rounds += 1
+        if shoe.will_shuffle:
+            return total, rounds
+
+
+def compare(
+    pool: ShoePool,
+    contenders: dict[str, Callable[[], Player]],
+    entries: int | None = None,
+    seed: int = 0,
+    per_round: bool = True,
+) -> list[ContenderResult]:
+    """
+    Play the first `entries` pool entries with every contender (a factory returning
+    a fresh player), each entry starting from the same random state. First contender
+    is the baseline. See `play_entry` for `per_round`. Caller's state of `random` is
+    restored.
+    """
+    entries = len(pool) if entries is None else entries
+    if not 0 < entries <= len(pool):
+        raise ValueError(f"Number of entries must be between 1 and {len(pool)}")
+    results = [ContenderResult(name) for name in contenders]
+    for k in range(entries):
+        baseline = 0.0
+        for i, (result, make_player) in enumerate(zip(results, contenders.values())):
+            with seeded(seed * len(pool) + k):
+                total, rounds = play_entry(pool, k, make_player(), per_round)
+            result.entry_results.push(total)
+            result.rounds += rounds
+            result.total += total
+            if i == 0:
+                baseline = total
+            result.diff.push(total - baseline)
+    return results
+
+
+def report(results: list[ContenderResult]) -> str:
+    baseline = results[0]
+    lines = [
+        f"baseline: {baseline.name}, pool entries: {baseline.entry_results.n}",
+        f"{'':<24}{'rounds':>10}{'ev/round':>10}{'diff/entry':>12}"
+        f"{'95% ci':>22}{'paired se':>11}{'unpaired se':>13}",
+    ]
+    for result in results:
+        unpaired = (
+            result.entry_results.variance / result.entry_results.n
+            + baseline.entry_results.variance / baseline.entry_results.n
+        ) ** 0.5
+        ci_low, ci_high = result.diff.ci()
+        lines.append(
+            f"{result.name:<24}{result.rounds:>10}{result.ev:>10.4f}"
+            f"{result.diff.mean:>12.3f}{f'({ci_low:.3f}, {ci_high:.3f})':>22}"
+            f"{result.diff.se:>11.3f}{unpaired:>13.3f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Shoe pools for paired comparisons.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    generate_parser = subparsers.add_parser("generate", help="write a new pool")
+    generate_parser.add_argument("path", type=Path)
+    generate_parser.add_argument("--entries", type=int, default=10_000)
+    generate_parser.add_argument("--decks", type=int, default=None)
+    generate_parser.add_argument("--seed", type=int, default=None)
+
+    compare_parser = subparsers.add_parser(
+        "compare", help="compare strategies on a pool"
+    )
+    compare_parser.add_argument("path", type=Path)
+    compare_parser.add_argument(
+        "strategies", nargs="+", help="strategy names, first one is the baseline"
+    )
+    compare_parser.add_argument("--bet", type=float, default=Seat.bet)
+    compare_parser.add_argument("--entries", type=int, default=None)
+    compare_parser.add_argument("--seed", type=int, default=0)
+    compare_parser.add_argument(
+        "--per-shoe",
+        action="store_true",
+        help="play every entry to the cut card instead of one round per entry",
+    )
+
+    args = parser.parse_args(argv)
+    if args.command == "generate":
+        write_pool(args.path, args.entries, args.decks, args.seed)
+    else:
+        contenders = {
+            name: Seat(name, args.bet).player for name in dict.fromkeys(args.strategies)
+        }
+        with ShoePool(args.path) as pool:
+            print(
+                report(
+                    compare(
+                        pool, contenders, args.entries, args.seed, not args.per_shoe
+                    )
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,376 @@
+"""
+Headless simulation helpers shared by batch tools (rule sweeps etc.).
+
+Nothing in here imports interface code, so it can be safely used in worker
+processes.
+"""
+
+from __future__ import annotations
+
+import importlib
+import itertools
+import math
+import random
+import time
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+
+from . import strategies
+from .compiler import CompiledStrategy
+from .engine import (
+    CONFIG,
+    BettingStrategy,
+    CSMShoe,
+    Dealer,
+    Game,
+    GameStrategy,
+    InfiniteShoe,
+    LazyShoe,
+    Player,
+    Shoe,
+)
+
+# per hand tallies (see: `play_rounds`)
+HANDS = "hands"
+BLACKJACKS = "blackjacks"
+BUSTS = "busts"
+SURRENDERS = "surrenders"
+
+# shoe types available by name
+SHOES: dict[str, type[Shoe]] = {
+    "standard": Shoe,
+    "lazy": LazyShoe,
+    "csm": CSMShoe,
+    "infinite": InfiniteShoe,
+}
+
+
+@contextmanager
+def rules(**overrides: Any) -> Iterator[dict[str, Any]]:
+    """
+    Temporarily override `CONFIG` values. Original values are restored on exit.
+    """
+    unknown = set(overrides) - set(CONFIG)
+    if unknown:
+        raise KeyError(f"Unknown rules: {sorted(unknown)}")
+    saved = {key: CONFIG[key] for key in overrides}
+    CONFIG.update(overrides)
+    try:
+        yield CONFIG
+    finally:
+        CONFIG.update(saved)
+
+
+@contextmanager
+def seeded(seed: Any) -> Iterator[None]:
+    """
+    Temporarily seed the `random` module (used by shoes and strategies). Caller's
+    random state is restored on exit.
+    """
+    state = random.getstate()
+    random.seed(seed)
+    try:
+        yield
+    finally:
+        random.setstate(state)
+
+
+def strategy_class[T: (GameStrategy, BettingStrategy)](
+    name: str, base: type[T] = GameStrategy
+) -> type[T]:
+    """
+    Resolve strategy name to a subclass of `base` (`GameStrategy` or
+    `BettingStrategy`).
+
+    `name` is either a class name from `blackjack.strategies` or a fully qualified
+    `package.module:ClassName` string.
+    """
+    if ":" in name:
+        module_name, _, class_name = name.partition(":")
+        module = importlib.import_module(module_name)
+    else:
+        module, class_name = strategies, name
+    cls = getattr(module, class_name, None)
+    if not (isinstance(cls, type) and issubclass(cls, base)):
+        raise ValueError(f"{name} is not a {base.__name__}")
+    return cls
+
+
+@dataclass
+class RunningStats:
+    """
+    Running mean and variance (Welford's algorithm). Instances collected in
+    different processes can be combined with `merge`.
+    """
+
+    n: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    def push(self, x: float) -> None:
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+
+    def merge(self, other: RunningStats) -> None:
+        if other.n == 0:
+            return
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean += delta * other.n / n
+        self.m2 += other.m2 + delta**2 * self.n * other.n / n
+        self.n = n
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.n - 1) if self.n > 1 else math.inf
+
+    @property
+    def sd(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def se(self) -> float:
+        return self.sd / math.sqrt(self.n) if self.n > 1 else math.inf
+
+    def ci(self, z: float = 1.96) -> tuple[float, float]:
+        return self.mean - z * self.se, self.mean + z * self.se
+
+
+@dataclass(frozen=True)
+class Seat:
+    """
+    Description of a bot player that can be sent to a worker process.
+
+    `strategy` and `betting` are resolved with `strategy_class`, betting strategy
+    is created with `bet` as its only argument. If `compiled`, game strategy is
+    replaced with its lookup table version (see: `compiler.CompiledStrategy`).
+    """
+
+    strategy: str = "MimickDealer"
+    bet: float = 10
+    hands: int = 1
+    betting: str = "FixedBettingStrategy"
+    compiled: bool = False
+
+    def player(self) -> Player:
+        low, high = CONFIG["table_limits"]
+        if not low <= self.bet <= high:
+            raise ValueError(f"Bet {self.bet} outside of table limits {low}-{high}")
+        strategy = strategy_class(self.strategy)()
+        if self.compiled:
+            strategy = CompiledStrategy(strategy)
+        return Player(
+            strategy,
+            strategy_class(self.betting, BettingStrategy)(self.bet),
+            cash=math.inf,
+            number_of_hands=self.hands,
+        )
+
+
+def bind_shoe(players: list[Player], shoe: Shoe) -> None:
+    """
+    Give `shoe` to strategies drawing from the game's shoe that were created without
+    one (e.g. `RolloutStrategy` created by `Seat.player`).
+    """
+    for player in players:
+        if getattr(player.strategy, "shoe", False) is None:
+            player.strategy.shoe = shoe  # type: ignore
+
+
+def make_game(seats: tuple[Seat, ...], shoe: str = "standard") -> Game:
+    """
+    Game with bot players that never run out of cash. Shoe of type given by name
+    (see: `SHOES`) is created with current `CONFIG` and bound to strategies that
+    need it (see: `bind_shoe`).
+    """
+    players = [seat.player() for seat in seats]
+    dealer = Dealer(shoe=SHOES[shoe](CONFIG["number_of_decks"]))
+    bind_shoe(players, dealer.shoe)
+    return Game(players, dealer)
+
+
+def play_rounds(
+    game: Game, rounds: int, stats: RunningStats, tally: Counter[str] | None = None
+) -> None:
+    """
+    Play `rounds` rounds, pushing the result of the first player (in units of its
+    bet) to `stats` after every round. If `tally` is given, first player's hands,
+    blackjacks, busts and surrenders are counted in it.
+    """
+    player = game.players[0]
+    unit = player.betting_strategy.bet()
+    if tally is None:
+        for _ in range(rounds):
+            game.play()
+            stats.push(
+                sum(hp.result for hp in game.round.table.hands if hp.player is player)
+                / unit
+            )
+        return
+    for _ in range(rounds):
+        game.play()
+        result = 0.0
+        for hand_play in game.round.table.hands:
+            if hand_play.player is not player:
+                continue
+            result += hand_play.result
+            tally[HANDS] += 1
+            if hand_play.hand.is_blackjack():
+                tally[BLACKJACKS] += 1
+            elif hand_play.surrendered:
+                tally[SURRENDERS] += 1
+            elif hand_play.is_bust:
+                tally[BUSTS] += 1
+        stats.push(result / unit)
+
+
+def run(
+    seats: tuple[Seat, ...] = (Seat(),),
+    rule_overrides: dict[str, Any] | None = None,
+    seed: int | None = None,
+    max_rounds: int = 100_000,
+    target_se: float | None = None,
+    chunk: int = 10_000,
+    shoe: str = "standard",
+) -> RunningStats:
+    """
+    Stats of a single process `simulate` stopped by `max_rounds` or `target_se`.
+    """
+    return simulate(
+        seats,
+        rule_overrides,
+        seed=seed,
+        target_se=target_se,
+        max_rounds=max_rounds,
+        chunk=chunk,
+        shoe=shoe,
+    ).stats
+
+
+def run_chunk(
+    seats: tuple[Seat, ...],
+    rule_overrides: dict[str, Any] | None,
+    shoe: str,
+    seed: int,
+    index: int,
+    rounds: int,
+    tally: bool = False,
+) -> tuple[RunningStats, Counter[str]]:
+    """
+    Play `rounds` rounds of a new game, return stats and tally (empty unless `tally`,
+    see: `play_rounds`). Random state depends only on `seed` and chunk `index`, so
+    chunks can be played in any process in any order. State of `random` is restored
+    afterwards.
+    """
+    counter: Counter[str] = Counter()
+    with rules(**(rule_overrides or {})), seeded(f"{seed}:{index}"):
+        game = make_game(seats, shoe)
+        stats = RunningStats()
+        play_rounds(game, rounds, stats, counter if tally else None)
+    return stats, counter
+
+
+@dataclass
+class SimulationResult:
+    """
+    Merged stats (and tallies) of all played chunks. `stopped_by` is the criterion
+    that ended the simulation: "target_se", "time_budget" or "max_rounds".
+    """
+
+    stats: RunningStats = field(default_factory=RunningStats)
+    tally: Counter[str] = field(default_factory=Counter)
+    chunks: int = 0
+    elapsed: float = 0.0
+    stopped_by: str | None = None
+
+    @property
+    def rounds(self) -> int:
+        return self.stats.n
+
+    def ci(self, z: float = 1.96) -> tuple[float, float]:
+        return self.stats.ci(z)
+
+
+def simulate(
+    seats: tuple[Seat, ...] = (Seat(),),
+    rule_overrides: dict[str, Any] | None = None,
+    seed: int | None = None,
+    target_se: float | None = None,
+    time_budget: float | None = None,
+    max_rounds: int | None = None,
+    chunk: int = 10_000,
+    shoe: str = "standard",
+    workers: int = 1,
+    progress: Callable[[SimulationResult], None] | None = None,
+    tally: bool = False,
+) -> SimulationResult:
+    """
+    Play chunks of `chunk` rounds until standard error of EV per round is at most
+    `target_se`, `time_budget` seconds have passed or `max_rounds` rounds have been
+    played, whichever comes first. Stopping criteria are checked after every chunk.
+
+    With `workers` > 1 chunks are played in a process pool, but merged and checked
+    in order, so the result for a given `seed` doesn't depend on number of workers
+    (unless stopped by `time_budget`).
+
+    `progress` is called with the result so far after every merged chunk. If
+    `tally`, per hand outcomes of the first seat are counted (see: `play_rounds`).
+    """
+    if target_se is None and time_budget is None and max_rounds is None:
+        raise ValueError("At least one of target_se, time_budget, max_rounds required")
+    if seed is None:
+        seed = random.getrandbits(64)
+    result = SimulationResult()
+    start = time.perf_counter()
+    scheduled = 0
+
+    def chunks() -> Iterator[tuple[int, int]]:
+        nonlocal scheduled
+        index = 0
+        while max_rounds is None or scheduled < max_rounds:
+            rounds = chunk if max_rounds is None else min(chunk, max_rounds - scheduled)
+            scheduled += rounds
+            yield index, rounds
+            index += 1
+
+    def stop(chunk_result: tuple[RunningStats, Counter[str]]) -> bool:
+        stats, chunk_tally = chunk_result
+        result.stats.merge(stats)
+        result.tally.update(chunk_tally)
+        result.chunks += 1
+        result.elapsed = time.perf_counter() - start
+        if target_se is not None and result.stats.se <= target_se:
+            result.stopped_by = "target_se"
+        elif time_budget is not None and result.elapsed >= time_budget:
+            result.stopped_by = "time_budget"
+        elif max_rounds is not None and result.stats.n >= max_rounds:
+            result.stopped_by = "max_rounds"
+        if progress is not None:
+            progress(result)
+        return result.stopped_by is not None
+
+    args = (seats, rule_overrides, shoe, seed)
+    if workers == 1:
+        for index, rounds in chunks():
+            if stop(run_chunk(*args, index, rounds, tally)):
+                break
+        return result
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        todo = chunks()
+        pending: deque[Future[tuple[RunningStats, Counter[str]]]] = deque(
+            executor.submit(run_chunk, *args, index, rounds, tally)
+            for index, rounds in itertools.islice(todo, workers)
+        )
+        while pending:
+            if stop(pending.popleft().result()):
+                executor.shutdown(cancel_futures=True)
+                break
+            if (next_chunk := next(todo, None)) is not None:
+                pending.append(executor.submit(run_chunk, *args, *next_chunk, tally))
+    return result
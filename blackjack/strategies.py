@@ -4,6 +4,7 @@ import random
 from typing import Any
 
 from .engine import BettingStrategy, GameStrategy, Hand, PlayDecision, YesNoDecision
+from .rollout import RolloutStrategy  # noqa: F401
 
 
 class RandomStrategy(GameStrategy):
@@ -0,0 +1,215 @@
+"""
+House edge for a grid of rule variations.
+
+Grid spec is a JSON object mapping `CONFIG` keys to lists of values, e.g.:
+
+    {
+        "number_of_decks": [1, 2, 6, 8],
+        "dealer_h17": [false, true],
+        "blackjack_payout": ["3/2", "6/5"]
+    }
+
+Every combination of values (cell) is simulated with the same strategy and seed
+across a process pool. Finished cells are stored in a cache file, so extending the
+grid only simulates new cells. Results are written as a tidy csv table, one row per
+cell.
+
+Usage:
+
+    python -m blackjack.sweep grid.json -o results.csv --workers 8 --target-se 0.001
+
+Every cell is simulated until it reaches `target_se` (or runs out of `max_rounds` or
+`time_budget` seconds), so low-variance cells finish early.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import hashlib
+import itertools
+import json
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from fractions import Fraction
+from pathlib import Path
+from typing import Any, Iterator
+
+from .engine import CONFIG
+from .simulation import Seat, simulate
+
+# Part of every cache key, bump when changes to the engine make cached results
+# stale. 2: blackjacks are paid `blackjack_payout` (were always paid 3:2).
+CACHE_VERSION = 2
+
+
+@dataclass(frozen=True)
+class SweepSettings:
+    """
+    Parameters shared by all cells of a sweep.
+    """
+
+    strategy: str = "MimickDealer"
+    bet: float = 10
+    seed: int = 0
+    max_rounds: int = 1_000_000
+    target_se: float | None = None
+    chunk: int = 10_000
+    time_budget: float | None = None
+
+
+def parse_value(key: str, value: Any) -> Any:
+    """
+    Convert JSON value to the type used by `CONFIG[key]`.
+    """
+    if key not in CONFIG:
+        raise KeyError(f"Unknown rule: {key}")
+    if isinstance(CONFIG[key], tuple):
+        return tuple(value)
+    elif isinstance(CONFIG[key], float):
+        return float(Fraction(value))
+    return value
+
+
+def cells(grid: dict[str, list[Any]]) -> Iterator[dict[str, Any]]:
+    keys = list(grid)
+    values = [[parse_value(key, value) for value in grid[key]] for key in keys]
+    for combination in itertools.product(*values):
+        yield dict(zip(keys, combination))
+
+
+def cell_key(cell: dict[str, Any], settings: SweepSettings) -> str:
+    # unset settings are left out, so adding an optional setting keeps old keys
+    settings_dict = {
+        key: value for key, value in asdict(settings).items() if value is not None
+    }
+    payload = json.dumps(
+        {"rules": cell, "settings": settings_dict, "version": CACHE_VERSION},
+        sort_keys=True,
+    )
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def run_cell(cell: dict[str, Any], settings: SweepSettings) -> dict[str, Any]:
+    result = simulate(
+        (Seat(settings.strategy, settings.bet),),
+        cell,
+        seed=settings.seed,
+        target_se=settings.target_se,
+        time_budget=settings.time_budget,
+        max_rounds=settings.max_rounds,
+        chunk=settings.chunk,
+    )
+    stats = result.stats
+    ci_low, ci_high = result.ci()
+    return {
+        "rounds": stats.n,
+        "ev": stats.mean,
+        "sd": stats.sd,
+        "se": stats.se,
+        "ci_low": ci_low,
+        "ci_high": ci_high,
+        "house_edge": -stats.mean,
+        "stopped_by": result.stopped_by,
+    }
+
+
+def load_cache(path: Path | None) -> dict[str, dict[str, float]]:
+    if path is None or not path.exists():
+        return {}
+    with open(path, "rt") as f:
+        return json.load(f)
+
+
+def save_cache(path: Path | None, cache: dict[str, dict[str, float]]) -> None:
+    if path is None:
+        return
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wt") as f:
+        json.dump(cache, f)
+    tmp.replace(path)
+
+
+def sweep(
+    grid: dict[str, list[Any]],
+    settings: SweepSettings = SweepSettings(),
+    workers: int | None = None,
+    cache_path: Path | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Simulate every cell of the grid not found in cache. Return list of rows (dicts
+    of rules and stats) in grid order.
+
+    Cache is saved after each finished cell, so an interrupted sweep can be resumed.
+    """
+    grid_cells = list(cells(grid))
+    keys = [cell_key(cell, settings) for cell in grid_cells]
+    cache = load_cache(cache_path)
+    todo = {key: cell for key, cell in zip(keys, grid_cells) if key not in cache}
+
+    if workers == 1:
+        for key, cell in todo.items():
+            cache[key] = run_cell(cell, settings)
+            save_cache(cache_path, cache)
+    elif todo:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(run_cell, cell, settings): key
+                for key, cell in todo.items()
+            }
+            for future in as_completed(futures):
+                cache[futures[future]] = future.result()
+                save_cache(cache_path, cache)
+
+    return [
+        {**cell, **cache[key], "cached": key not in todo}
+        for key, cell in zip(keys, grid_cells)
+    ]
+
+
+def write_table(rows: list[dict[str, Any]], path: Path) -> None:
+    if not rows:
+        return
+    with open(path, "wt", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("grid", type=Path, help="json file with grid spec")
+    parser.add_argument("-o", "--output", type=Path, default=Path("sweep.csv"))
+    parser.add_argument(
+        "--cache", type=Path, help="cache file (default: <output>.cache.json)"
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--strategy", default=SweepSettings.strategy)
+    parser.add_argument("--bet", type=float, default=SweepSettings.bet)
+    parser.add_argument("--seed", type=int, default=SweepSettings.seed)
+    parser.add_argument("--max-rounds", type=int, default=SweepSettings.max_rounds)
+    parser.add_argument("--target-se", type=float, default=None)
+    parser.add_argument("--chunk", type=int, default=SweepSettings.chunk)
+    parser.add_argument(
+        "--time-budget", type=float, default=None, help="seconds per cell"
+    )
+    args = parser.parse_args(argv)
+
+    with open(args.grid, "rt") as f:
+        grid = json.load(f)
+    settings = SweepSettings(
+        args.strategy,
+        args.bet,
+        args.seed,
+        args.max_rounds,
+        args.target_se,
+        args.chunk,
+        args.time_budget,
+    )
+    cache_path = args.cache or args.output.with_suffix(".cache.json")
+    rows = sweep(grid, settings, args.workers, cache_path)
+    write_table(rows, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Tournament of all game strategies found in `blackjack.strategies` (and any other
+modules given).
+
+Every strategy is paired with the same betting strategy and plays the same number of
+rounds with `simulation.simulate`, so chunks are played across a process pool and
+chunk `i` of every contender starts from the same seed. Results are printed as a
+table ranked by EV.
+
+Usage:
+
+    python -m blackjack.tournament --rounds 1000000 --module my_strategies
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import inspect
+import os
+from collections import Counter
+from dataclasses import dataclass, field
+
+from . import strategies
+from .engine import GameStrategy
+from .simulation import (
+    BLACKJACKS,
+    BUSTS,
+    HANDS,
+    SURRENDERS,
+    RunningStats,
+    Seat,
+    simulate,
+)
+
+
+def discover(modules: tuple[str, ...] = ()) -> list[str]:
+    """
+    Names (usable as `Seat.strategy`) of concrete `GameStrategy` subclasses defined
+    in `blackjack.strategies` and `modules`.
+    """
+    names = []
+    for module in [strategies, *map(importlib.import_module, modules)]:
+        for name, obj in vars(module).items():
+            if (
+                inspect.isclass(obj)
+                and issubclass(obj, GameStrategy)
+                and not inspect.isabstract(obj)
+                and obj.__module__ == module.__name__
+            ):
+                names.append(
+                    name if module is strategies else f"{module.__name__}:{name}"
+                )
+    return names
+
+
+@dataclass
+class Standing:
+    """
+    Results of one strategy: EV per round (in units of the bet) and per hand
+    tallies.
+    """
+
+    strategy: str
+    stats: RunningStats = field(default_factory=RunningStats)
+    tally: Counter[str] = field(default_factory=Counter)
+
+    def rate(self, key: str) -> float:
+        return self.tally[key] / self.tally[HANDS] if self.tally[HANDS] else 0.0
+
+
+def tournament(
+    names: list[str],
+    rounds: int,
+    bet: float = Seat.bet,
+    betting: str = Seat.betting,
+    seed: int = 0,
+    chunk: int = 10_000,
+    workers: int | None = None,
+) -> list[Standing]:
+    """
+    Play `rounds` rounds with every strategy in `names`. Return standings ranked by
+    EV, best first.
+    """
+    standings = []
+    for name in names:
+        result = simulate(
+            (Seat(name, bet, betting=betting),),
+            seed=seed,
+            max_rounds=rounds,
+            chunk=chunk,
+            workers=workers or os.cpu_count() or 1,
+            tally=True,
+        )
+        standings.append(Standing(name, result.stats, result.tally))
+    return sorted(standings, key=lambda standing: -standing.stats.mean)
+
+
+def report(standings: list[Standing]) -> str:
+    lines = [
+        f"{'':>4} {'strategy':<30}{'rounds':>10}{'ev':>9}{'sd':>8}{'se':>8}"
+        f"{'bj %':>7}{'bust %':>8}{'surr %':>8}"
+    ]
+    for rank, standing in enumerate(standings, 1):
+        stats = standing.stats
+        lines.append(
+            f"{rank:>4} {standing.strategy:<30}{stats.n:>10}{stats.mean:>9.4f}"
+            f"{stats.sd:>8.3f}{stats.se:>8.4f}"
+            f"{standing.rate(BLACKJACKS):>7.2%}{standing.rate(BUSTS):>8.2%}"
+            f"{standing.rate(SURRENDERS):>8.2%}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Ranked tournament of strategies.")
+    parser.add_argument("--rounds", type=int, default=100_000)
+    parser.add_argument(
+        "--module",
+        action="append",
+        default=[],
+        help="additional module with strategies (can be repeated)",
+    )
+    parser.add_argument("--betting", default=Seat.betting)
+    parser.add_argument("--bet", type=float, default=Seat.bet)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    standings = tournament(
+        discover(tuple(args.module)),
+        args.rounds,
+        args.bet,
+        args.betting,
+        args.seed,
+        args.chunk,
+        args.workers,
+    )
+    print(report(standings))
+
+
+if __name__ == "__main__":
+    main()
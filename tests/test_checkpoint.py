@@ -0,0 +1,158 @@
+import random
+
+import pytest
+
+from blackjack.checkpoint import dumps, load, loads, save
+from blackjack.engine import (
+    CONFIG,
+    CSMShoe,
+    Dealer,
+    DecisionHandler,
+    Game,
+    HandPlayPool,
+    InfiniteShoe,
+    LazyShoe,
+    PlayDecision,
+    Player,
+    Shoe,
+    YesNoDecision,
+)
+from blackjack.rollout import RolloutStrategy
+from blackjack.simulation import rules
+from blackjack.strategies import FixedBettingStrategy, RandomStrategy, StayOnEleven
+
+
+def state(game):
+    shoe = game.dealer.shoe
+    return (
+        [player.cash for player in game.players],
+        list(map(str, shoe)),
+        shoe.hilo_count,
+        shoe._cut_card,
+        [str(hand_play.hand) for hand_play in game.round.table.hands],
+        str(game.dealer.hand),
+    )
+
+
+def make_game(shoe_type=Shoe, pool=None):
+    return Game(
+        [
+            Player(RandomStrategy(), FixedBettingStrategy(10), 1_000_000),
+            Player(StayOnEleven(), FixedBettingStrategy(20), 1_000_000, 2),
+        ],
+        Dealer(shoe=shoe_type(2)),
+        pool=pool,
+    )
+
+
+@pytest.mark.parametrize("shoe_type", [Shoe, LazyShoe, CSMShoe, InfiniteShoe])
+def test_resume_is_identical(shoe_type):
+    random.seed(1)
+    game = make_game(shoe_type)
+    for _ in range(30):
+        game.play()
+    data = dumps(game)
+    played = []
+    for _ in range(50):
+        game.play()
+        played.append(state(game))
+
+    # whatever happens in between is undone by loading
+    random.random()
+    restored = loads(data)
+    assert restored.round.table.hands
+    resumed = []
+    for _ in range(50):
+        restored.play()
+        resumed.append(state(restored))
+    assert resumed == played
+
+
+def test_players_and_pool_restored():
+    game = make_game(pool=HandPlayPool())
+    game.play()
+    restored = loads(dumps(game))
+    assert [(p.cash, p.number_of_hands) for p in restored.players] == [
+        (p.cash, p.number_of_hands) for p in game.players
+    ]
+    assert isinstance(restored.players[1].strategy, StayOnEleven)
+    assert restored.players[1].betting_strategy.bet() == 20
+    assert restored.pool is not None
+    assert [hand_play.result for hand_play in restored.round.table.hands] == [
+        hand_play.result for hand_play in game.round.table.hands
+    ]
+
+
+def test_rules_restored():
+    with rules(number_of_decks=2, table_limits=(10, 100)):
+        data = dumps(make_game())
+    with rules(number_of_decks=6, table_limits=(5, 50)):
+        loads(data)
+        assert CONFIG["number_of_decks"] == 2
+        assert CONFIG["table_limits"] == (10, 100)
+
+
+def test_strategy_gets_loaded_shoe():
+    dealer = Dealer(shoe=Shoe(2))
+    game = Game(
+        [Player(RolloutStrategy(dealer.shoe, rollouts=100), FixedBettingStrategy(10))],
+        dealer,
+    )
+    restored = loads(dumps(game))
+    assert restored.players[0].strategy.shoe is restored.dealer.shoe
+
+
+def test_external_objects():
+    betting = FixedBettingStrategy(10)
+    game = Game([Player(StayOnEleven(), betting)])
+    data = dumps(game, external={"betting": betting})
+    other = FixedBettingStrategy(30)
+    assert loads(data, external={"betting": other}).players[0].betting_strategy is other
+    with pytest.raises(ValueError):
+        loads(data)
+
+
+def test_round_waiting_for_decision():
+    decisions = []
+    DecisionHandler.newDecisionEven.subscribe(decisions.append)
+    try:
+        random.seed(4)
+        game = Game([Player(None, FixedBettingStrategy(10))], Dealer(shoe=Shoe(2)))
+        game.play()
+        assert game.round.waiting
+        data = dumps(game)
+
+        def finish(game):
+            while game.round.waiting:
+                handler = decisions[-1]
+                if isinstance(handler.choices, YesNoDecision):
+                    handler(YesNoDecision.NO)
+                else:
+                    handler(PlayDecision.HIT)
+            return state(game)
+
+        expected = finish(game)
+        restored = loads(data)
+        assert restored.round.waiting is False
+        restored.round.resume()
+        assert restored.round.waiting
+        assert finish(restored) == expected
+    finally:
+        DecisionHandler.newDecisionEven.unsubscribe(decisions.append)
+
+
+def test_save_and_load(tmp_path):
+    path = tmp_path / "game.ckpt"
+    game = make_game()
+    game.play()
+    save(game, path)
+    save(game, path)
+    assert state(load(path)) == state(game)
+    assert [p.name for p in tmp_path.iterdir()] == ["game.ckpt"]
+
+
+def test_invalid_checkpoint():
+    with pytest.raises(ValueError):
+        loads(b"nope")
+    with pytest.raises(ValueError):
+        loads(dumps(make_game())[:-3])
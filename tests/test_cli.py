@@ -0,0 +1,124 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+from blackjack.cli import SimConfig, load_config, main
+from blackjack.simulation import Seat
+
+
+def test_load_json_config(tmp_path):
+    path = tmp_path / "sim.json"
+    path.write_text(
+        json.dumps(
+            {
+                "rules": {"number_of_decks": 2, "blackjack_payout": "6/5"},
+                "players": [{"strategy": "StayOnEleven", "bet": 20}, {}],
+                "shoe": "csm",
+            }
+        )
+    )
+    config = load_config(path)
+    assert config.rules == {"number_of_decks": 2, "blackjack_payout": 1.2}
+    assert config.seats == (Seat("StayOnEleven", 20), Seat())
+    assert config.shoe == "csm"
+
+
+def test_load_toml_config(tmp_path):
+    path = tmp_path / "sim.toml"
+    path.write_text(
+        '[rules]\ntable_limits = [5, 500]\n\n[[players]]\nstrategy = "MimickDealer"\n'
+    )
+    config = load_config(path)
+    assert config.rules == {"table_limits": (5, 500)}
+    assert config.seats == (Seat("MimickDealer"),)
+
+
+def test_empty_config_uses_defaults(tmp_path):
+    path = tmp_path / "sim.json"
+    path.write_text("{}")
+    assert load_config(path) == SimConfig()
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"rulez": {}},
+        {"players": [{"strategy_name": "x"}]},
+        {"shoe": "x"},
+        {"players": [{"strategy": "StayOnEleve"}]},
+        {"players": [{"betting": "MimickDealer"}]},
+        {"players": [{"strategy": "no_such_module:Strategy"}]},
+        {"players": [{"bet": 1_000}]},
+        {"rules": {"table_limits": [20, 100]}, "players": [{"bet": 10}]},
+    ],
+)
+def test_invalid_config(tmp_path, data):
+    path = tmp_path / "sim.json"
+    path.write_text(json.dumps(data))
+    with pytest.raises(ValueError):
+        load_config(path)
+
+
+def test_main_writes_report_and_progress(tmp_path, capsys):
+    config = tmp_path / "sim.json"
+    config.write_text("{}")
+    output = tmp_path / "report.json"
+    main(
+        [
+            str(config),
+            "--rounds",
+            "300",
+            "--chunk",
+            "100",
+            "--seed",
+            "3",
+            "-o",
+            str(output),
+        ]
+    )
+    report = json.loads(output.read_text())
+    assert report["rounds"] == 300
+    assert report["seed"] == 3
+    assert report["stopped_by"] == "max_rounds"
+    assert "rounds/s" in capsys.readouterr().err
+
+
+def test_main_reports_invalid_player(tmp_path, capsys):
+    config = tmp_path / "sim.json"
+    config.write_text(json.dumps({"players": [{"strategy": "StayOnEleve"}]}))
+    with pytest.raises(SystemExit):
+        main([str(config), "--rounds", "10"])
+    assert "StayOnEleve" in capsys.readouterr().err
+
+
+def test_main_report_is_valid_json_for_one_round(tmp_path, capsys):
+    config = tmp_path / "sim.json"
+    config.write_text("{}")
+    main([str(config), "--rounds", "1", "--seed", "1"])
+
+    def reject(constant):
+        raise ValueError(constant)
+
+    report = json.loads(capsys.readouterr().out, parse_constant=reject)
+    assert report["se"] is None
+    assert report["ci_low"] is None
+
+
+def test_main_requires_stopping_criterion(tmp_path):
+    config = tmp_path / "sim.json"
+    config.write_text("{}")
+    with pytest.raises(SystemExit):
+        main([str(config)])
+
+
+def test_cli_does_not_import_kivy():
+    code = (
+        "import sys, blackjack.cli; "
+        "print(any(m.startswith('kivy') for m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
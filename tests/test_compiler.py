@@ -0,0 +1,119 @@
+import random
+
+import pytest
+
+from blackjack.compiler import (
+    CHOICES,
+    HARD,
+    PAIR,
+    SOFT,
+    CompiledStrategy,
+    hand_key,
+    probe_hands,
+)
+from blackjack.engine import Card, Dealer, Game, Hand, PlayDecision, Player, Shoe
+from blackjack.simulation import Seat
+from blackjack.strategies import (
+    FixedBettingStrategy,
+    MimickDealer,
+    RandomStrategy,
+    StayOnEleven,
+)
+
+
+def hand(*ranks):
+    return Hand(*(Card(rank, "S") for rank in ranks))
+
+
+@pytest.mark.parametrize(
+    "ranks, key",
+    [
+        (("8", "8"), (PAIR, 8)),
+        (("A", "A"), (PAIR, 1)),
+        (("10", "K"), (HARD, 20)),
+        (("A", "6"), (SOFT, 17)),
+        (("A", "2", "3"), (SOFT, 16)),
+        (("A", "6", "10"), (HARD, 17)),
+        (("5", "4", "7"), (HARD, 16)),
+    ],
+)
+def test_hand_key(ranks, key):
+    assert hand_key(hand(*ranks)) == key
+
+
+def test_probe_hands_differ():
+    hands = probe_hands()[HARD, 16]
+    assert len(hands) == 3
+    assert len({tuple(card.rank for card in h) for h in hands}) == 3
+
+
+class CountsCards(StayOnEleven):
+    # depends on number of cards, which is not part of the key
+    def play(self, dealer_hand, player_hand, choices):
+        if len(player_hand) > 2:
+            return PlayDecision.STAND
+        return super().play(dealer_hand, player_hand, choices)
+
+
+class Fails(StayOnEleven):
+    def play(self, dealer_hand, player_hand, choices):
+        if dealer_hand[0].is_ace:
+            raise ValueError
+        return super().play(dealer_hand, player_hand, choices)
+
+
+def test_key_only_strategy_fully_compiled():
+    strategy = CompiledStrategy(StayOnEleven())
+    assert strategy.compiled_states == len(probe_hands()) * 10 * len(CHOICES)
+    assert all(strategy.insurance_table[HARD * 32 + total] for total in range(5, 21))
+
+
+def test_compiled_answers_match(monkeypatch):
+    strategy = CompiledStrategy(StayOnEleven())
+    monkeypatch.setattr(StayOnEleven, "play", lambda *args: pytest.fail())
+    choices = PlayDecision.HIT | PlayDecision.STAND
+    assert strategy.play(hand("9"), hand("5", "6"), choices) is PlayDecision.HIT
+    assert strategy.play(hand("9"), hand("5", "7"), choices) is PlayDecision.STAND
+
+
+def test_ambiguous_states_fall_back_to_memo():
+    strategy = CompiledStrategy(CountsCards(), memo_size=2)
+    assert strategy.compiled_states < CompiledStrategy(StayOnEleven()).compiled_states
+    choices = PlayDecision.HIT | PlayDecision.STAND
+    assert strategy.play(hand("9"), hand("2", "3", "4"), choices) is PlayDecision.STAND
+    assert strategy.play(hand("9"), hand("2", "7"), choices) is PlayDecision.HIT
+    strategy.play(hand("9"), hand("2", "2", "4"), choices)
+    strategy.play(hand("9"), hand("3", "3", "4"), choices)
+    assert len(strategy._memo) == 2
+
+
+def test_failing_states_not_compiled():
+    strategy = CompiledStrategy(Fails())
+    choices = PlayDecision.HIT | PlayDecision.STAND
+    with pytest.raises(ValueError):
+        strategy.play(hand("A"), hand("5", "6"), choices)
+    assert strategy.play(hand("9"), hand("5", "6"), choices) is PlayDecision.HIT
+
+
+def test_random_strategy_refused():
+    with pytest.raises(ValueError):
+        CompiledStrategy(RandomStrategy())
+    with pytest.raises(ValueError):
+        Seat("RandomStrategy", compiled=True).player()
+
+
+@pytest.mark.parametrize("strategy_type", [MimickDealer, StayOnEleven])
+def test_game_results_unchanged(strategy_type):
+    cash = []
+    for strategy in (strategy_type(), CompiledStrategy(strategy_type())):
+        random.seed(0)
+        player = Player(strategy, FixedBettingStrategy(10), 1_000_000)
+        game = Game([player], Dealer(shoe=Shoe(6)))
+        for _ in range(500):
+            game.play()
+        cash.append(player.cash)
+    assert cash[0] == cash[1]
+
+
+def test_seat_compiled():
+    assert isinstance(Seat(compiled=True).player().strategy, CompiledStrategy)
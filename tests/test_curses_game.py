@@ -0,0 +1,94 @@
+import random
+
+import pytest
+
+from blackjack.engine import CONFIG, Game, Player
+from blackjack.interfaces.text.curses_game import (
+    CASH,
+    PROMPT,
+    CursesBettingStrategy,
+    CursesGameStrategy,
+    CursesView,
+)
+
+
+class FakeWindow:
+    def __init__(self, keys=(), height=24, width=80):
+        self.keys = list(keys)
+        self.size = height, width
+        self.writes = []
+        self.refreshes = 0
+
+    def getmaxyx(self):
+        return self.size
+
+    def addstr(self, y, x, text):
+        self.writes.append((y, x, text))
+
+    def getkey(self):
+        # Enter once scripted keys run out
+        return self.keys.pop(0) if self.keys else "\n"
+
+    def clear(self):
+        self.writes.clear()
+
+    def refresh(self):
+        self.refreshes += 1
+
+
+def test_draw_writes_only_changed_cells():
+    window = FakeWindow()
+    view = CursesView(window)
+    view.draw({(0, 0): "a", (1, 0): "b"})
+    view.draw({(0, 0): "a", (1, 0): "c"})
+    assert [(y, text.strip()) for y, _, text in window.writes] == [
+        (0, "a"),
+        (1, "b"),
+        (1, "c"),
+    ]
+
+
+def test_draw_blanks_cells_no_longer_shown():
+    window = FakeWindow()
+    view = CursesView(window)
+    view.draw({(0, 0): "a", (5, 0): "hand"})
+    view.draw({(0, 0): "a"})
+    assert window.writes[-1][:2] == (5, 0)
+    assert not window.writes[-1][2].strip()
+
+
+def test_draw_negative_rows_from_bottom():
+    window = FakeWindow(height=10, width=20)
+    view = CursesView(window)
+    view.draw({PROMPT: "x" * 30})
+    # clipped before bottom right corner
+    assert window.writes == [(9, 0, "x" * 19)]
+
+
+def test_read_key():
+    view = CursesView(FakeWindow(["x", "h"]))
+    assert view.read_key(["H", "S"], "S") == "H"
+    assert view.read_key(["H", "S"], "S") == "S"
+
+
+def test_resize_redraws_everything():
+    window = FakeWindow(["KEY_RESIZE", "h"])
+    view = CursesView(window)
+    view.draw({(0, 0): "a", (1, 0): "b"})
+    view.read_key(["H"])
+    assert [text.strip() for _, _, text in window.writes] == ["a", "b"]
+
+
+@pytest.mark.parametrize("keys", [[], ["+", "+", "\n", "d", "h", "p"]])
+def test_play_rounds(keys):
+    random.seed(0)
+    window = FakeWindow(keys)
+    view = CursesView(window)
+    player = Player(CursesGameStrategy(view), CursesBettingStrategy(view, 10))
+    view.game, view.player = Game([player]), player
+    for _ in range(20):
+        view.game.play()
+    assert player.cash != CONFIG["player_cash"]
+    # cash cell is written only when it changes
+    cash_writes = [text for y, x, text in window.writes if (y, x) == CASH]
+    assert len(cash_writes) < window.refreshes
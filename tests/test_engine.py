@@ -1,21 +1,35 @@
+import random
+
 import pytest
 
 from blackjack.engine import (
+    BLACKJACK,
+    BUST,
     CONFIG,
     DECK,
+    RANKS,
+    SURRENDERED,
     Card,
+    CSMShoe,
     Dealer,
+    Game,
     GameError,
     GameStrategy,
     Hand,
     HandPlay,
+    HandPlayPool,
+    InfiniteShoe,
+    LazyShoe,
     NotEnoughCash,
     PlayDecision,
     Player,
     Shoe,
     State,
+    TablePlay,
     YesNoDecision,
+    settlement_table,
 )
+from blackjack.simulation import rules
 from blackjack.strategies import FixedBettingStrategy, RandomStrategy
 
 
@@ -502,6 +516,13 @@ class TestHandPlay:
         hand_play.surrender(dealer)
         assert hand_play.is_done
 
+    def test_surrender_is_recorded(self, hand_play: HandPlay, dealer: Dealer):
+        hand_play += Card("A", "S")
+        hand_play += Card("9", "H")
+        assert not hand_play.surrendered
+        hand_play.surrender(dealer)
+        assert hand_play.surrendered
+
     def test_surrender_charges_half_bet(self, hand_play: HandPlay, dealer: Dealer):
         hand_play += Card("A", "S")
         hand_play += Card("9", "H")
@@ -916,3 +937,431 @@ class TestHandPlay:
         hand_play.eval_hand(dealer)
         hand_play.cash_out(dealer)
         assert hand_play.result < 0
+
+
+class TestHandPlayPool:
+
+    @pytest.fixture
+    def player(self):
+        return Player(RandomStrategy(), FixedBettingStrategy(5))
+
+    def test_engine_objects_have_no_dict(self, player: Player):
+        hand_play = HandPlay(player, 5)
+        assert not hasattr(hand_play, "__dict__")
+        assert not hasattr(hand_play.hand, "__dict__")
+
+    def test_released_hand_play_is_reused_and_reset(self, player: Player):
+        pool = HandPlayPool()
+        hand_play = pool.hand_play(player, 5)
+        hand_play += Card("A", "H")
+        hand_play.done()
+        hand = hand_play.hand
+        pool.release([hand_play])
+        reused = pool.hand_play(player, 10)
+        assert reused is hand_play
+        assert reused.hand is hand
+        assert len(reused.hand) == 0
+        assert not reused._is_done
+        assert reused.betsize == 10
+        assert reused.result == 0
+
+    def test_split_hands_come_from_pool(self, player: Player):
+        pool = HandPlayPool()
+        hand_play = pool.hand_play(player, 5)
+        hand_play += Card("8", "S")
+        hand_play += Card("8", "H")
+        split_hands = hand_play.split(Dealer())
+        assert all(hand.pool is pool for hand in split_hands)
+        assert not any(hand.hand.is_blackjack() for hand in split_hands)
+
+    def test_game_with_pool_gives_same_results(self):
+        def play(pool):
+            random.seed(0)
+            player = Player(RandomStrategy(), FixedBettingStrategy(5), 10_000)
+            game = Game([player], pool=pool)
+            for _ in range(200):
+                game.play()
+            return player.cash
+
+        assert play(None) == play(HandPlayPool())
+
+
+class TestDirectPlay:
+
+    @staticmethod
+    def play_rounds(rounds: int = 300) -> list[list[float]]:
+        random.seed(2)
+        players = [
+            Player(RandomStrategy(), FixedBettingStrategy(5), 100_000),
+            Player(RandomStrategy(), FixedBettingStrategy(10), 100_000, 2),
+        ]
+        game = Game(players)
+        results = []
+        for _ in range(rounds):
+            game.play()
+            results.append(
+                [hand_play.result for hand_play in game.round.table.hands]
+                + [player.cash for player in players]
+            )
+        return results
+
+    def test_bot_table_doesnt_need_decisions(self):
+        player = Player(RandomStrategy(), FixedBettingStrategy(5))
+        assert not TablePlay([HandPlay(player, 5)]).needs_decisions()
+
+    def test_table_with_human_needs_decisions(self):
+        bot = Player(RandomStrategy(), FixedBettingStrategy(5))
+        human = Player(None, FixedBettingStrategy(5))
+        table = TablePlay([HandPlay(bot, 5), HandPlay(human, 5)])
+        assert table.needs_decisions()
+
+    def test_direct_play_gives_same_results(self, monkeypatch):
+        direct = self.play_rounds()
+        monkeypatch.setattr(TablePlay, "needs_decisions", lambda self: True)
+        assert self.play_rounds() == direct
+
+
+class TestLazyShoe:
+
+    def test_new_shoe_has_correct_number_of_cards(self):
+        assert len(LazyShoe(6)) == 6 * 52
+
+    def test_deals_every_card_once(self):
+        shoe = LazyShoe(1)
+        dealt = [shoe.deal() for _ in range(52)]
+        assert sorted(map(repr, dealt)) == sorted(map(repr, DECK))
+
+    def test_shuffle_returns_dealt_cards(self):
+        shoe = LazyShoe(6)
+        while not shoe.will_shuffle:
+            shoe.deal()
+        shoe.shuffle()
+        assert len(shoe) == 6 * 52
+        assert not shoe.will_shuffle
+        assert shoe.hilo_count == 0
+
+    def test_hi_lo_count(self):
+        shoe = LazyShoe(6)
+        cards = [shoe.deal() for _ in range(10)]
+        assert shoe.hilo_count == sum(card.hilo_count for card in cards)
+
+    def test_first_card_is_uniform(self):
+        random.seed(0)
+        counts = {rank: 0 for rank in RANKS}
+        for _ in range(2_600):
+            shoe = LazyShoe(1)
+            counts[shoe.deal().rank] += 1
+        # expected 200 per rank
+        assert all(140 < count < 260 for count in counts.values())
+
+
+class TestCSMShoe:
+
+    def test_deal_removes_card(self):
+        shoe = CSMShoe(6)
+        shoe.deal()
+        assert len(shoe) == 6 * 52 - 1
+
+    def test_shuffles_after_any_card_dealt(self):
+        shoe = CSMShoe(6)
+        assert not shoe.will_shuffle
+        shoe.deal()
+        assert shoe.will_shuffle
+
+    def test_dealer_returns_cards_to_machine(self):
+        dealer = Dealer(shoe=CSMShoe(1))
+        for _ in range(5):
+            dealer.deal_self()
+        dealer.shuffle()
+        assert len(dealer.shoe) == 52
+        assert sorted(map(repr, dealer.shoe)) == sorted(map(repr, DECK))
+        assert dealer.shoe.hilo_count == 0
+
+    def test_game_plays_with_csm(self):
+        player = Player(RandomStrategy(), FixedBettingStrategy(5), 10_000)
+        game = Game([player], Dealer(shoe=CSMShoe(2)))
+        for _ in range(50):
+            game.play()
+        assert (
+            len(game.dealer.shoe)
+            + sum(len(hand_play.hand) for hand_play in game.round.table.hands)
+            + len(game.dealer.hand)
+            == 2 * 52
+        )
+
+
+class TestInfiniteShoe:
+
+    def test_never_shuffles(self):
+        shoe = InfiniteShoe(6)
+        for _ in range(3 * InfiniteShoe.chunk):
+            shoe.deal()
+        assert not shoe.will_shuffle
+
+    def test_refills_buffer(self):
+        shoe = InfiniteShoe(6)
+        shoe.deal()
+        assert len(shoe) == InfiniteShoe.chunk - 1
+
+    def test_rank_frequencies(self):
+        random.seed(0)
+        shoe = InfiniteShoe(1)
+        tens = sum(shoe.deal().value == 10 for _ in range(52_000))
+        assert abs(tens - 16_000) < 500
+
+    def test_count_reset_on_forced_shuffle(self):
+        dealer = Dealer(shoe=InfiniteShoe(1))
+        for _ in range(20):
+            dealer.deal_self()
+        dealer.force_shuffle()
+        assert dealer.shoe.hilo_count == 0
+
+    def test_game_plays_with_infinite_shoe(self):
+        player = Player(RandomStrategy(), FixedBettingStrategy(5), 10_000)
+        game = Game([player], Dealer(shoe=InfiniteShoe(1)))
+        for _ in range(50):
+            game.play()
+        assert game.round.table.hands
+
+
+def small_infinite_shoe(decks):
+    shoe = InfiniteShoe(decks)
+    # refill buffer several times during the test
+    shoe.chunk = 8
+    return shoe
+
+
+SHOE_TYPES = [Shoe, LazyShoe, CSMShoe, small_infinite_shoe]
+
+
+class TestSnapshot:
+
+    @pytest.mark.parametrize("shoe_type", SHOE_TYPES)
+    def test_restore_shoe(self, shoe_type):
+        shoe = shoe_type(2)
+        for _ in range(10):
+            shoe.deal()
+        cards = list(shoe)
+        count = shoe.hilo_count
+        snapshot = shoe.snapshot()
+        state = random.getstate()
+        first = [shoe.deal() for _ in range(40)]
+        shoe.restore(snapshot)
+        assert list(shoe) == cards
+        assert shoe.hilo_count == count
+        random.setstate(state)
+        assert [shoe.deal() for _ in range(40)] == first
+
+    @pytest.mark.parametrize("shoe_type", SHOE_TYPES)
+    def test_restore_many_times_and_nested(self, shoe_type):
+        shoe = shoe_type(1)
+        cards = list(shoe)
+        outer = shoe.snapshot()
+        for _ in range(3):
+            shoe.deal()
+            inner = shoe.snapshot()
+            after_one = list(shoe)
+            shoe.deal()
+            shoe.restore(inner)
+            assert list(shoe) == after_one
+            shoe.restore(outer)
+            assert list(shoe) == cards
+
+    @pytest.mark.parametrize("shoe_type", SHOE_TYPES)
+    def test_restore_invalidates_later_snapshots(self, shoe_type):
+        shoe = shoe_type(1)
+        cards = list(shoe)
+        first = shoe.snapshot()
+        for _ in range(3):
+            shoe.deal()
+        later = shoe.snapshot()
+        shoe.restore(first)
+        shoe.deal()
+        with pytest.raises(GameError):
+            shoe.restore(later)
+        for _ in range(3):
+            shoe.deal()
+        with pytest.raises(GameError):
+            shoe.restore(later)
+        shoe.restore(first)
+        assert list(shoe) == cards
+
+    def test_lazy_shoe_dealt_cards_restored(self):
+        shoe = LazyShoe(1)
+        snapshot = shoe.snapshot()
+        for _ in range(20):
+            shoe.deal()
+        shoe.restore(snapshot)
+        shoe.shuffle()
+        assert sorted(map(repr, shoe)) == sorted(map(repr, DECK))
+
+    def test_shuffle_invalidates_snapshot(self):
+        shoe = Shoe(1)
+        snapshot = shoe.snapshot()
+        shoe.shuffle()
+        with pytest.raises(GameError):
+            shoe.restore(snapshot)
+
+    def test_release_invalidates_snapshot(self):
+        shoe = Shoe(1)
+        snapshot = shoe.snapshot()
+        shoe.release()
+        shoe.deal()
+        with pytest.raises(GameError):
+            shoe.restore(snapshot)
+
+    def test_restore_hand_play_and_player(self):
+        player = Player(None, FixedBettingStrategy(10), cash=100)
+        dealer = Dealer(shoe=Shoe(1))
+        hand_play = HandPlay(player, 10, Hand(Card("5", "S"), Card("6", "H")))
+        shoe_snapshot = dealer.shoe.snapshot()
+        snapshot = hand_play.snapshot()
+        cash = player.snapshot()
+        hand_play.process_decision(dealer, PlayDecision.DOUBLE)
+        dealer.deal_self()
+        hand_play.eval_hand(dealer)
+        hand_play.cash_out(dealer)
+        assert hand_play.doubled and len(hand_play.hand) == 3
+        hand_play.restore(snapshot)
+        player.restore(cash)
+        dealer.shoe.restore(shoe_snapshot)
+        assert hand_play == HandPlay(player, 10, Hand(Card("5", "S"), Card("6", "H")))
+        assert player.cash == 100
+        assert len(dealer.shoe) == 52
+
+
+def make_hand(*ranks: str) -> Hand:
+    return Hand(*(Card(rank, "S") for rank in ranks))
+
+
+class TestSettlement:
+
+    @pytest.mark.parametrize(
+        "ranks,score",
+        [
+            (("A", "K"), BLACKJACK),
+            (("10", "6", "K"), BUST),
+            (("A", "5", "K"), 16),
+            (("7", "A", "A", "2"), 21),
+        ],
+    )
+    def test_score(self, ranks, score):
+        assert make_hand(*ranks).score == score
+
+    def test_split_21_is_not_blackjack(self):
+        hand = Hand.from_split(Card("A", "S"))
+        hand += Card("K", "S")
+        assert hand.score == 21
+
+    def test_score_follows_new_cards_and_restore(self):
+        hand = make_hand("10", "6")
+        snapshot = hand.snapshot()
+        assert hand.score == 16
+        hand += Card("K", "S")
+        assert hand.score == BUST
+        hand.restore(snapshot)
+        hand += Card("4", "S")
+        assert hand.score == 20
+
+    def test_surrendered_hand_play(self):
+        hand_play = HandPlay(Player(None, FixedBettingStrategy(10)), 10, make_hand())
+        hand_play.surrendered = True
+        assert hand_play.score == SURRENDERED
+
+    @pytest.mark.parametrize(
+        "player,dealer,multiple",
+        [
+            (BLACKJACK, 20, 2.5),
+            (BLACKJACK, BLACKJACK, 1),
+            (21, BLACKJACK, 0),
+            (BUST, BUST, 0),
+            (12, BUST, 2),
+            (18, 18, 1),
+            (17, 18, 0),
+            (SURRENDERED, BLACKJACK, 0.5),
+        ],
+    )
+    def test_table(self, player, dealer, multiple):
+        assert settlement_table(1.5)[player][dealer] == multiple
+
+    def test_table_is_cached(self):
+        assert settlement_table(1.5) is settlement_table(1.5)
+
+    @pytest.mark.parametrize("payout,credit", [(3 / 2, 25), (6 / 5, 22), (1, 20)])
+    def test_blackjack_payout(self, payout, credit):
+        player = Player(None, FixedBettingStrategy(10), cash=100)
+        hand_play = HandPlay(player, 10, make_hand("A", "K"))
+        dealer = Dealer(hand=make_hand("10", "8"))
+        with rules(blackjack_payout=payout):
+            hand_play.eval_hand(dealer)
+        hand_play.cash_out(dealer)
+        assert player.cash == 100 + credit
+
+
+class TestChoicesMask:
+
+    class CountingHandPlay(HandPlay):
+        __slots__ = ("computed",)
+
+        def can_hit(self) -> bool:
+            self.computed += 1
+            return super().can_hit()
+
+    @pytest.fixture
+    def hand_play(self):
+        CONFIG["surrender"] = True
+        player = Player(None, FixedBettingStrategy(10), cash=100)
+        hand_play = self.CountingHandPlay(player, 10, make_hand("5", "6"))
+        hand_play.computed = 0
+        return hand_play
+
+    def test_mask_matches_flag(self, hand_play):
+        assert hand_play.choices_mask == 29
+        assert hand_play.allowed_choices is (
+            PlayDecision.HIT
+            | PlayDecision.DOUBLE
+            | PlayDecision.SURRENDER
+            | PlayDecision.STAND
+        )
+
+    def test_computed_once_per_state(self, hand_play):
+        for _ in range(3):
+            hand_play.allowed_choices
+            hand_play.choices_mask
+        assert hand_play.computed == 1
+
+    def test_recomputed_on_new_card(self, hand_play):
+        hand_play.choices_mask
+        hand_play += Card("2", "S")
+        assert hand_play.choices_mask == 17
+        assert hand_play.computed == 2
+
+    def test_recomputed_on_replaced_card(self, hand_play):
+        assert not hand_play.choices_mask & PlayDecision.SPLIT._value_
+        # same hand object and number of cards
+        hand_play.hand[1] = Card("5", "H")
+        assert hand_play.choices_mask & PlayDecision.SPLIT._value_
+
+    def test_recomputed_on_restore(self, hand_play):
+        snapshot = hand_play.hand.snapshot()
+        hand_play.choices_mask
+        hand_play.hand.restore(snapshot - 1)
+        hand_play.hand.append(Card("5", "H"))
+        assert hand_play.choices_mask & PlayDecision.SPLIT._value_
+
+    def test_recomputed_when_done(self, hand_play):
+        hand_play.choices_mask
+        hand_play.done()
+        assert hand_play.choices_mask == 0
+        assert hand_play.allowed_choices is None
+
+    def test_recomputed_when_player_cant_match_bet(self, hand_play):
+        assert hand_play.choices_mask & PlayDecision.DOUBLE._value_
+        hand_play.player.cash = 5
+        assert not hand_play.choices_mask & PlayDecision.DOUBLE._value_
+
+    def test_disallowed_decision_raises(self, hand_play):
+        with pytest.raises(GameError):
+            hand_play.process_decision(Dealer(), PlayDecision.SPLIT)
+        with pytest.raises(GameError):
+            hand_play.process_decision(Dealer(), "H")
@@ -0,0 +1,89 @@
+import random
+
+import pytest
+
+from blackjack.engine import Game, GameError, Player
+from blackjack.instrumentation import (
+    BET,
+    PLAY,
+    Profiler,
+    TimedGameStrategy,
+    Timings,
+)
+from blackjack.strategies import FixedBettingStrategy, MimickDealer
+
+STEPS = (
+    "shuffle",
+    "deal",
+    "offer_insurance",
+    "player_play",
+    "dealer_play",
+    "eval_insurance",
+    "eval_hands",
+    "cash_out",
+)
+
+
+@pytest.fixture
+def profiled_game() -> Game:
+    random.seed(0)
+    game = Game(
+        [Player(MimickDealer(), FixedBettingStrategy(10), cash=10_000)],
+        profiler=Profiler(),
+    )
+    for _ in range(50):
+        game.play()
+    return game
+
+
+def test_every_step_is_counted(profiled_game: Game):
+    assert profiled_game.profiler
+    timings = profiled_game.profiler.timings
+    for step in STEPS:
+        assert timings[step].count == 50
+
+
+def test_strategy_callbacks_are_timed(profiled_game: Game):
+    assert profiled_game.profiler
+    timings = profiled_game.profiler.timings
+    assert timings[BET].count == 50
+    assert timings[PLAY].count >= 50
+
+
+def test_strategies_wrapped_once(profiled_game: Game):
+    strategy = profiled_game.players[0].strategy
+    assert isinstance(strategy, TimedGameStrategy)
+    assert isinstance(strategy.strategy, MimickDealer)
+
+
+def test_report(profiled_game: Game):
+    report = profiled_game.profile_report()
+    assert "player_play" in report
+    assert "engine time" in report
+
+
+def test_profiling_does_not_change_results():
+    def play(profiler):
+        random.seed(1)
+        player = Player(MimickDealer(), FixedBettingStrategy(10), cash=10_000)
+        game = Game([player], profiler=profiler)
+        for _ in range(50):
+            game.play()
+        return player.cash
+
+    assert play(None) == play(Profiler())
+
+
+def test_report_without_profiler():
+    game = Game([Player(MimickDealer(), FixedBettingStrategy(10))])
+    with pytest.raises(GameError):
+        game.profile_report()
+
+
+def test_timings_reservoir_is_bounded():
+    timings = Timings(size=10)
+    for i in range(100):
+        timings.add(i)
+    assert timings.count == 100
+    assert len(timings.samples) == 10
+    assert timings.percentile(0) <= timings.percentile(50) <= timings.percentile(99)
@@ -0,0 +1,152 @@
+import pytest
+
+from blackjack.engine import (
+    BLACKJACK,
+    BUST,
+    Card,
+    Dealer,
+    Game,
+    Hand,
+    InfiniteShoe,
+    PlayDecision,
+    Player,
+    Shoe,
+    YesNoDecision,
+)
+from blackjack.rollout import RolloutStrategy, dealer_result
+from blackjack.shoepool import PoolShoe, ShoePool, play_entry, write_pool
+from blackjack.simulation import Seat, make_game, rules
+from blackjack.strategies import FixedBettingStrategy
+
+ALL = (
+    PlayDecision.HIT
+    | PlayDecision.STAND
+    | PlayDecision.DOUBLE
+    | PlayDecision.SPLIT
+    | PlayDecision.SURRENDER
+)
+
+
+def shoe_of(*ranks: str, copies: int = 30) -> Shoe:
+    shoe = Shoe(1)
+    shoe[:] = [Card(rank, "S") for rank in ranks] * copies
+    return shoe
+
+
+def hand(*ranks: str) -> Hand:
+    return Hand(*(Card(rank, "H") for rank in ranks))
+
+
+@pytest.mark.parametrize(
+    "cards,up,h17,result",
+    [
+        ([10, 5], 1, False, BLACKJACK),
+        ([6, 10], 10, False, BUST),
+        ([6, 1], 1, False, 17),
+        ([6, 10], 1, True, 17),
+        ([6, 3], 1, True, 20),
+        ([2] * 8, 2, False, 18),
+    ],
+)
+def test_dealer_result(cards, up, h17, result):
+    assert dealer_result(cards, up, h17)[0] == result
+
+
+def test_only_tens_left():
+    # dealer always ends with 20, every extra card busts player's 20
+    strategy = RolloutStrategy(shoe_of("10", "K"), rollouts=200)
+    estimates = strategy.estimate(hand("10"), hand("10", "Q"), ALL)
+    assert estimates == {
+        PlayDecision.STAND: 0,
+        PlayDecision.HIT: -1,
+        PlayDecision.DOUBLE: -2,
+        PlayDecision.SPLIT: 0,
+        PlayDecision.SURRENDER: -0.5,
+    }
+    assert strategy.play(hand("10"), hand("10", "Q"), ALL) is PlayDecision.STAND
+
+
+def test_double_on_eleven_with_tens_left():
+    strategy = RolloutStrategy(shoe_of("10"), rollouts=200)
+    choices = PlayDecision.HIT | PlayDecision.STAND | PlayDecision.DOUBLE
+    assert strategy.play(hand("5"), hand("5", "6"), choices) is PlayDecision.DOUBLE
+
+
+def test_only_choices_allowed_are_estimated():
+    strategy = RolloutStrategy(rollouts=100)
+    choices = PlayDecision.HIT | PlayDecision.STAND
+    assert set(strategy.estimate(hand("7"), hand("9", "7"), choices)) == {
+        PlayDecision.HIT,
+        PlayDecision.STAND,
+    }
+
+
+def test_surrender_only():
+    strategy = RolloutStrategy(rollouts=100)
+    assert strategy.estimate(hand("A"), hand("9", "7"), PlayDecision.SURRENDER) == {
+        PlayDecision.SURRENDER: -0.5
+    }
+
+
+def test_clear_decisions():
+    strategy = RolloutStrategy(rollouts=2_000)
+    choices = PlayDecision.HIT | PlayDecision.STAND
+    assert strategy.play(hand("10"), hand("2", "3"), choices) is PlayDecision.HIT
+    assert strategy.play(hand("6"), hand("10", "K"), choices) is PlayDecision.STAND
+
+
+def test_time_budget():
+    strategy = RolloutStrategy(rollouts=None, time_budget=0.01, batch=10)
+    estimates = strategy.estimate(hand("9"), hand("10", "6"), ALL)
+    assert -1 <= estimates[PlayDecision.HIT] <= 1
+
+
+def test_budget_required():
+    with pytest.raises(ValueError):
+        RolloutStrategy(rollouts=None, time_budget=None)
+
+
+def test_insurance_depends_on_tens_left():
+    strategy = RolloutStrategy(shoe_of("10"))
+    assert strategy.insurance(hand("A"), hand("9", "7")) is YesNoDecision.YES
+    strategy = RolloutStrategy(shoe_of("2", "3"))
+    assert strategy.insurance(hand("A"), hand("9", "7")) is YesNoDecision.NO
+
+
+def test_infinite_shoe_draws_from_single_deck():
+    cards, infinite = RolloutStrategy(InfiniteShoe(1)).cards()
+    assert infinite
+    assert len(cards) == 52
+
+
+def test_plays_game():
+    with rules(surrender=True):
+        dealer = Dealer(shoe=Shoe(2))
+        player = Player(
+            RolloutStrategy(dealer.shoe, rollouts=100), FixedBettingStrategy(10)
+        )
+        game = Game([player], dealer)
+        for _ in range(20):
+            game.play()
+    assert player.cash != 1_000 or game.round.table.hands
+
+
+def test_available_by_name_gets_game_shoe():
+    game = make_game((Seat("RolloutStrategy"),))
+    strategy = game.players[0].strategy
+    assert isinstance(strategy, RolloutStrategy)
+    assert strategy.shoe is game.dealer.shoe
+
+
+def test_pool_entry_gets_pool_shoe(tmp_path):
+    path = tmp_path / "pool.bin"
+    write_pool(path, entries=1, decks=1, seed=0)
+    strategy = RolloutStrategy(rollouts=100)
+    with ShoePool(path) as pool:
+        play_entry(pool, 0, Player(strategy, FixedBettingStrategy(10)))
+    assert isinstance(strategy.shoe, PoolShoe)
+
+
+def test_not_compiled():
+    with pytest.raises(ValueError):
+        Seat("RolloutStrategy", compiled=True).player()
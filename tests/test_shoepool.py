@@ -0,0 +1,139 @@
+import random
+
+import pytest
+
+from blackjack.engine import DECK, Dealer, Hand
+from blackjack.shoepool import (
+    PoolShoe,
+    ShoePool,
+    compare,
+    main,
+    play_entry,
+    report,
+    write_pool,
+)
+from blackjack.simulation import Seat
+
+
+@pytest.fixture
+def pool(tmp_path):
+    path = tmp_path / "pool.bin"
+    write_pool(path, entries=5, decks=2, seed=0)
+    with ShoePool(path) as pool:
+        yield pool
+
+
+def test_pool_header(pool):
+    assert len(pool) == 5
+    assert pool.decks == 2
+
+
+def test_pool_entries_differ(pool):
+    assert pool.entry(0)[1] != pool.entry(1)[1]
+
+
+def test_pool_entry_out_of_range(pool):
+    with pytest.raises(IndexError):
+        pool.entry(5)
+
+
+def test_invalid_file(tmp_path):
+    path = tmp_path / "bad.bin"
+    path.write_bytes(b"not a pool file")
+    with pytest.raises(ValueError):
+        ShoePool(path)
+
+
+def test_pool_shoe_deals_entry(pool):
+    cut, cards = pool.entry(2)
+    shoe = PoolShoe(pool, 2)
+    assert len(shoe) == 2 * 52
+    assert shoe._cut_card == cut
+    assert [repr(card) for card in shoe] == [repr(DECK[i]) for i in cards]
+    assert len(set(cards)) == 52
+
+
+@pytest.mark.parametrize("k", [0, 4])
+def test_play_entry_deals_entry_k_first(pool, k):
+    dealt = []
+
+    def record(card, hand):
+        dealt.append(card)
+
+    Hand.newCardEvent += record
+    try:
+        play_entry(pool, k, Seat("StayOnEleven").player())
+    finally:
+        Hand.newCardEvent -= record
+    assert dealt[0] is DECK[pool.entry(k)[1][-1]]
+
+
+def test_pool_shoe_advances_on_shuffle(pool):
+    shoe = PoolShoe(pool, 4)
+    dealer = Dealer(shoe=shoe)
+    dealer.force_shuffle()
+    assert shoe.k == 6
+    assert list(map(repr, shoe)) == list(map(repr, PoolShoe(pool, 0)))
+
+
+def test_per_round_shoe_shuffles_after_dealing(pool):
+    shoe = PoolShoe(pool, per_round=True)
+    assert not shoe.will_shuffle
+    shoe.deal()
+    assert shoe.will_shuffle
+    assert not PoolShoe(pool).will_shuffle
+
+
+@pytest.mark.parametrize("per_round", [True, False])
+def test_compare_same_strategy_has_no_difference(pool, per_round):
+    results = compare(
+        pool,
+        {"a": Seat("StayOnEleven").player, "b": Seat("StayOnEleven").player},
+        per_round=per_round,
+    )
+    assert results[1].total == results[0].total
+    assert results[1].diff.mean == 0
+    assert results[1].diff.sd == 0
+
+
+def test_compare_report(pool):
+    results = compare(
+        pool, {"a": Seat("MimickDealer").player, "b": Seat("StayOnEleven").player}
+    )
+    assert results[1].diff.n == 5
+    assert results[0].rounds == 5
+    assert "baseline: a" in report(results)
+
+
+def test_compare_whole_shoes(pool):
+    results = compare(pool, {"a": Seat().player}, per_round=False)
+    assert results[0].rounds > 5
+
+
+def test_compare_too_many_entries(pool):
+    with pytest.raises(ValueError):
+        compare(pool, {"a": Seat().player}, entries=6)
+
+
+def test_main(tmp_path, capsys):
+    path = tmp_path / "pool.bin"
+    main(["generate", str(path), "--entries", "3", "--decks", "1"])
+    main(["compare", str(path), "MimickDealer", "StayOnEleven"])
+    assert "StayOnEleven" in capsys.readouterr().out
+
+
+def test_random_state_left_alone(tmp_path):
+    random.seed(5)
+    expected = random.random()
+    random.seed(5)
+    path = tmp_path / "pool.bin"
+    write_pool(path, entries=2, decks=1, seed=1)
+    with ShoePool(path) as pool:
+        compare(pool, {"a": Seat("RandomStrategy").player})
+    assert random.random() == expected
+
+
+def test_pool_reproducible_with_seed(tmp_path):
+    for name in ("a.bin", "b.bin"):
+        write_pool(tmp_path / name, entries=3, decks=1, seed=7)
+    assert (tmp_path / "a.bin").read_bytes() == (tmp_path / "b.bin").read_bytes()
@@ -0,0 +1,155 @@
+import random
+import statistics
+
+import pytest
+
+from blackjack.engine import CONFIG, BettingStrategy
+from blackjack.simulation import (
+    RunningStats,
+    Seat,
+    rules,
+    run,
+    simulate,
+    strategy_class,
+)
+from blackjack.strategies import FixedBettingStrategy, MimickDealer
+
+
+def test_RunningStats_matches_statistics_module():
+    data = [1.0, -1.0, 0.0, 1.5, -1.0, -0.5, 2.0]
+    stats = RunningStats()
+    for x in data:
+        stats.push(x)
+    assert stats.n == len(data)
+    assert stats.mean == pytest.approx(statistics.mean(data))
+    assert stats.sd == pytest.approx(statistics.stdev(data))
+
+
+def test_RunningStats_merge():
+    data = [1.0, -1.0, 0.0, 1.5, -1.0, -0.5, 2.0]
+    left, right, full = RunningStats(), RunningStats(), RunningStats()
+    for x in data[:3]:
+        left.push(x)
+    for x in data[3:]:
+        right.push(x)
+    for x in data:
+        full.push(x)
+    left.merge(right)
+    assert left.n == full.n
+    assert left.mean == pytest.approx(full.mean)
+    assert left.variance == pytest.approx(full.variance)
+
+
+def test_rules_restores_config():
+    original = CONFIG["number_of_decks"]
+    with rules(number_of_decks=1):
+        assert CONFIG["number_of_decks"] == 1
+    assert CONFIG["number_of_decks"] == original
+
+
+def test_rules_rejects_unknown_key():
+    with pytest.raises(KeyError):
+        with rules(no_such_rule=1):
+            pass
+
+
+def test_strategy_class_by_name():
+    assert strategy_class("MimickDealer") is MimickDealer
+
+
+def test_strategy_class_by_qualified_name():
+    assert strategy_class("blackjack.strategies:MimickDealer") is MimickDealer
+
+
+def test_strategy_class_betting_strategy():
+    assert (
+        strategy_class("FixedBettingStrategy", BettingStrategy) is FixedBettingStrategy
+    )
+
+
+def test_seat_betting_strategy():
+    player = Seat(bet=15).player()
+    assert isinstance(player.betting_strategy, FixedBettingStrategy)
+    assert player.betting_strategy.bet() == 15
+
+
+def test_strategy_class_rejects_non_strategy():
+    with pytest.raises(ValueError):
+        strategy_class("FixedBettingStrategy")
+
+
+def test_run_is_reproducible_with_seed():
+    first = run(seed=1, max_rounds=500)
+    second = run(seed=1, max_rounds=500)
+    assert first.n == 500
+    assert first == second
+
+
+def test_run_stops_early_on_target_se():
+    stats = run(seed=1, max_rounds=10_000, target_se=1, chunk=100)
+    assert stats.n == 100
+
+
+def test_seat_outside_table_limits():
+    with pytest.raises(ValueError):
+        Seat(bet=CONFIG["table_limits"][1] + 1).player()
+
+
+def test_simulate_requires_stopping_criterion():
+    with pytest.raises(ValueError):
+        simulate()
+
+
+def test_simulate_max_rounds_trims_last_chunk():
+    result = simulate(seed=1, max_rounds=250, chunk=100)
+    assert result.rounds == 250
+    assert result.chunks == 3
+    assert result.stopped_by == "max_rounds"
+
+
+def test_simulate_keeps_callers_random_state():
+    random.seed(5)
+    expected = random.random()
+    random.seed(5)
+    simulate(seed=1, max_rounds=100, chunk=50)
+    assert random.random() == expected
+
+
+def test_simulate_tally_counts_first_seat_hands():
+    seats = (Seat("StayOnEleven"), Seat(hands=2))
+    kwargs = dict(seed=1, max_rounds=200, chunk=100)
+    result = simulate(seats, **kwargs, tally=True)
+    assert result.tally["hands"] >= 200
+    assert result.tally["busts"] == 0
+    assert simulate(seats, **kwargs, tally=True, workers=2).tally == result.tally
+    assert not simulate(seats, **kwargs).tally
+
+
+def test_simulate_stops_on_target_se():
+    result = simulate(seed=1, target_se=1, max_rounds=10_000, chunk=100)
+    assert result.rounds == 100
+    assert result.stopped_by == "target_se"
+    low, high = result.ci()
+    assert low < result.stats.mean < high
+
+
+def test_simulate_stops_on_time_budget():
+    result = simulate(seed=1, time_budget=0, chunk=100)
+    assert result.chunks == 1
+    assert result.stopped_by == "time_budget"
+
+
+def test_simulate_same_result_with_workers():
+    single = simulate(seed=1, target_se=0.05, chunk=50)
+    pooled = simulate(seed=1, target_se=0.05, chunk=50, workers=2)
+    assert single.stopped_by == pooled.stopped_by == "target_se"
+    assert single.chunks == pooled.chunks > 1
+    assert single.stats == pooled.stats
+
+
+def test_simulate_reports_progress_after_every_chunk():
+    rounds = []
+    simulate(
+        seed=1, max_rounds=250, chunk=100, progress=lambda r: rounds.append(r.rounds)
+    )
+    assert rounds == [100, 200, 250]
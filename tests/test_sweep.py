@@ -0,0 +1,77 @@
+import csv
+import hashlib
+import json
+from dataclasses import replace
+
+from blackjack import sweep as sweep_module
+from blackjack.sweep import SweepSettings, cell_key, cells, sweep, write_table
+
+SETTINGS = SweepSettings(max_rounds=200, chunk=100)
+
+
+def test_cells_product():
+    grid = {"number_of_decks": [1, 2], "blackjack_payout": ["3/2", "6/5"]}
+    result = list(cells(grid))
+    assert len(result) == 4
+    assert {"number_of_decks": 2, "blackjack_payout": 1.2} in result
+
+
+def test_cells_convert_tuples():
+    assert list(cells({"table_limits": [[5, 100]]})) == [{"table_limits": (5, 100)}]
+
+
+def test_sweep_reuses_cache_when_grid_extended(tmp_path):
+    cache = tmp_path / "cache.json"
+    first = sweep({"number_of_decks": [1]}, SETTINGS, workers=1, cache_path=cache)
+    assert [row["cached"] for row in first] == [False]
+
+    second = sweep({"number_of_decks": [1, 2]}, SETTINGS, workers=1, cache_path=cache)
+    assert [row["cached"] for row in second] == [True, False]
+    assert second[0]["ev"] == first[0]["ev"]
+
+
+def test_blackjack_payout_changes_edge():
+    rows = sweep({"blackjack_payout": ["3/2", "6/5"]}, SETTINGS, workers=1)
+    assert rows[0]["ev"] > rows[1]["ev"]
+
+
+def test_cache_key_depends_on_version(monkeypatch):
+    cell = {"number_of_decks": 1}
+    key = cell_key(cell, SETTINGS)
+    monkeypatch.setattr(sweep_module, "CACHE_VERSION", sweep_module.CACHE_VERSION + 1)
+    assert cell_key(cell, SETTINGS) != key
+
+
+def test_cache_key_leaves_out_unset_settings():
+    cell = {"number_of_decks": 1}
+    payload = {
+        "rules": cell,
+        "settings": {
+            "strategy": "MimickDealer",
+            "bet": 10,
+            "seed": 0,
+            "max_rounds": 200,
+            "chunk": 100,
+        },
+        "version": sweep_module.CACHE_VERSION,
+    }
+    expected = hashlib.sha1(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+    assert cell_key(cell, SETTINGS) == expected
+    assert cell_key(cell, replace(SETTINGS, time_budget=60)) != expected
+
+
+def test_sweep_process_pool_matches_single_process():
+    grid = {"dealer_h17": [False, True]}
+    single = sweep(grid, SETTINGS, workers=1)
+    pooled = sweep(grid, SETTINGS, workers=2)
+    assert [row["ev"] for row in single] == [row["ev"] for row in pooled]
+
+
+def test_write_table(tmp_path):
+    rows = sweep({"number_of_decks": [1]}, SETTINGS, workers=1)
+    path = tmp_path / "out.csv"
+    write_table(rows, path)
+    with open(path) as f:
+        table = list(csv.DictReader(f))
+    assert table[0]["number_of_decks"] == "1"
+    assert float(table[0]["house_edge"]) == -rows[0]["ev"]
@@ -0,0 +1,57 @@
+import sys
+
+import pytest
+
+from blackjack.tournament import discover, main, tournament
+
+
+def test_discover_builtin_strategies():
+    assert {"RandomStrategy", "StayOnEleven", "MimickDealer"} <= set(discover())
+
+
+@pytest.fixture
+def user_module(tmp_path, monkeypatch):
+    (tmp_path / "my_strategies.py").write_text(
+        "from blackjack.strategies import MimickDealer\n"
+        "\n"
+        "class AlwaysStand(MimickDealer):\n"
+        "    def play(self, dealer_hand, player_hand, choices):\n"
+        "        return choices.STAND\n"
+    )
+    monkeypatch.syspath_prepend(tmp_path)
+    yield "my_strategies"
+    sys.modules.pop("my_strategies", None)
+
+
+def test_discover_user_module(user_module):
+    names = discover((user_module,))
+    assert "my_strategies:AlwaysStand" in names
+    # imported, not defined there
+    assert "my_strategies:MimickDealer" not in names
+
+
+def test_tournament_ranked_by_ev():
+    standings = tournament(
+        ["RandomStrategy", "MimickDealer"], 300, chunk=100, workers=1
+    )
+    assert [standing.stats.n for standing in standings] == [300, 300]
+    assert standings[0].stats.mean >= standings[1].stats.mean
+
+
+def test_tournament_rates():
+    (standing,) = tournament(["StayOnEleven"], 500, chunk=100, workers=1)
+    assert standing.tally["hands"] >= 500
+    assert standing.rate("busts") == 0
+    assert 0 < standing.rate("blackjacks") < 0.1
+
+
+def test_tournament_same_result_with_workers():
+    single = tournament(["MimickDealer"], 200, chunk=50, workers=1)
+    pooled = tournament(["MimickDealer"], 200, chunk=50, workers=2)
+    assert single[0].stats == pooled[0].stats
+    assert single[0].tally == pooled[0].tally
+
+
+def test_main(capsys):
+    main(["--rounds", "100", "--workers", "1"])
+    assert "MimickDealer" in capsys.readouterr().out